@@ -1,15 +1,19 @@
 import asyncio
 import logging
 from dataclasses import field, dataclass
-from typing import Any
+from typing import Any, Optional
 
 import pyaudio
 
 from aiovban import VBANSampleRate
-from aiovban.asyncio.streams import VBANIncomingStream
+from aiovban.asyncio.streams import VBANFrameGap, VBANIncomingStream
+from aiovban.asyncio.util import StreamStatistics
 from aiovban.packet import VBANPacket, VBANHeader
 from aiovban.packet.headers.audio import VBANAudioHeader, BitResolution
+from aiovban.util.clock import WALL_CLOCK, PacketClock
 from .enums import VBANPyAudioFormatMapping
+from .playout import DriftEstimator, PlayoutController, remove_frames, repeat_frames
+from .resample import FormatConverter, FractionalResampler
 from .scripts.util import ProbabilityFilter
 from .util import FrameBuffer
 
@@ -30,18 +34,44 @@ class VBANAudioPlayer:
     format: BitResolution = BitResolution.INT16
     framebuffer_size: int = 512
     max_framebuffer_size: int = 8192
+    # Keep the buffered audio near this many milliseconds, see PlayoutController
+    target_latency_ms: Optional[float] = None
+    # Resample incoming audio to follow the sender's clock, see DriftEstimator
+    drift_correction: bool = False
+    # Keep the device open in this format and convert incoming audio, see FormatConverter
+    fixed_format: bool = False
 
     pyaudio: Any = None
     _stream: Any = field(
         init=False
     )  # The audio stream should be accessed from the background thread
     _framebuffer: FrameBuffer = field(default=None, init=False, repr=False)
+    _playout: Optional[PlayoutController] = field(default=None, init=False, repr=False)
+    _drift: Optional[DriftEstimator] = field(default=None, init=False, repr=False)
+    _sequence: Optional[StreamStatistics] = field(default=None, init=False, repr=False)
+    _resampler: Optional[FractionalResampler] = field(default=None, init=False, repr=False)
+    _converter: Optional[FormatConverter] = field(default=None, init=False, repr=False)
+    # The clock received packets are stamped on
+    _clock: PacketClock = field(default=WALL_CLOCK, init=False, repr=False)
 
     def __post_init__(self):
         self._synced = False
         self._framebuffer = FrameBuffer(
             self.max_framebuffer_size, self.format.byte_width * self.channels
         )
+        if self.target_latency_ms is not None:
+            self._playout = PlayoutController(
+                self.target_latency_ms, sample_rate=self.sample_rate.rate
+            )
+        if self.fixed_format:
+            self._converter = FormatConverter(
+                self.format, self.channels, self.sample_rate.rate
+            )
+        if self.drift_correction:
+            self._drift = DriftEstimator()
+            self._sequence = StreamStatistics()
+            if self._converter is None:
+                self._resampler = FractionalResampler(self.format, self.channels)
 
         if not self.pyaudio:
             self.pyaudio = pyaudio.PyAudio()
@@ -62,6 +92,13 @@ class VBANAudioPlayer:
         if not isinstance(header, VBANAudioHeader):
             return False
 
+        if self._converter is not None:
+            if self._converter.configure(header) and logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    f"Converting {header.channels} channels, {header.sample_rate.rate} Hz, {header.bit_resolution.name} for stream {header.streamname} to {self.channels} channels, {self.sample_rate.rate} Hz, {self.format.name}"
+                )
+            return False
+
         if (
             header.sample_rate != self.sample_rate
             or header.channels != self.channels
@@ -97,11 +134,20 @@ class VBANAudioPlayer:
         return b"\x00" * num_frames * self.format.byte_width * self.channels
 
     def data_callback_in_thread(self, in_data, frame_count, time_info, status):
+        if self._drift is not None:
+            # Same clock as the packet timestamps the received side is measured on
+            self._drift.consumed(frame_count, self._clock.now_ns())
         (buffer_size, available_frame_count) = self._framebuffer.size()
+        playout = self._playout
+        if playout is not None:
+            playout.observe(available_frame_count)
 
         # Wait for a cushion of data before starting to avoid immediate underflow
         if not self._synced:
-            if available_frame_count < frame_count * 2:  # Wait for 2 buffers worth
+            cushion = frame_count * 2  # Wait for 2 buffers worth
+            if playout is not None:
+                cushion = max(frame_count, playout.target_frames)
+            if available_frame_count < cushion:
                 return self.silence(num_frames=frame_count), pyaudio.paContinue
             if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
@@ -109,7 +155,29 @@ class VBANAudioPlayer:
                 )
             self._synced = True
 
-        (buffer_data, available_frames) = self.commit_data(frame_count)
+        correction = playout.correction(frame_count) if playout is not None else 0
+        (buffer_data, available_frames) = self.commit_data(frame_count + correction)
+        if available_frames > frame_count:
+            # Ahead of target, slip a few frames to bring latency down
+            playout.applied(available_frames - frame_count)
+            return (
+                remove_frames(
+                    buffer_data,
+                    available_frames,
+                    self._frames_to_byte_count(1),
+                    available_frames - frame_count,
+                ),
+                pyaudio.paContinue,
+            )
+        if correction < 0 and available_frames == frame_count + correction:
+            # Behind target, stretch the block by repeating a few frames
+            playout.applied(correction)
+            return (
+                repeat_frames(
+                    buffer_data, available_frames, self._frames_to_byte_count(1), -correction
+                ),
+                pyaudio.paContinue,
+            )
         if available_frames < frame_count:
             # Only log underflow occasionally to avoid flooding
             if probability_filter.filter(None):
@@ -120,7 +188,8 @@ class VBANAudioPlayer:
                 self.silence(num_frames=frame_count - available_frames) + buffer_data,
                 pyaudio.paContinue,
             )
-        return buffer_data, pyaudio.paContinue
+        # PortAudio takes bytes, the view is only valid until the next read anyway
+        return bytes(buffer_data), pyaudio.paContinue
 
     def _frames_to_byte_count(self, frames):
         return frames * self.channels * self.format.byte_width
@@ -152,30 +221,70 @@ class VBANAudioPlayer:
         )
         # packet.body.pack() already returns a memoryview or bytes
         data = packet.body.pack()[:byte_count]
-        self._framebuffer.write(data, header.samples_per_frame)
+        frames = header.samples_per_frame
+        converter = self._converter
+        ratio = 1.0
+        if self._drift is not None:
+            # Count what the sender produced by the framecount advance, lost and
+            # dropped packets would otherwise read as a slower sender clock
+            self._clock = packet.clock
+            produced = self._sequence.record(packet.framecount, packet.timestamp) * frames
+            if converter is not None:
+                # Measured in device frames, so a sender changing rate keeps its history
+                converter.configure(header)
+                produced = converter.output_frames(produced)
+            self._drift.received(produced, packet.timestamp)
+            ratio = self._drift.ratio
+        if converter is not None:
+            data, frames = converter.process(data, header, ratio)
+        elif self._drift is not None:
+            data, frames = self._resampler.process(data, frames, ratio)
+        self._framebuffer.write(data, frames)
+
+    def write_gap(self, gap: VBANFrameGap):
+        # Conceal frames the jitter buffer gave up on with silence to keep timing. The
+        # drift estimator counts them from the framecount advance of the next packet
+        if isinstance(gap.header, VBANAudioHeader):
+            samples = gap.samples
+            if self._converter is not None:
+                self._converter.configure(gap.header)
+                samples = round(self._converter.output_frames(samples))
+            self._framebuffer.write(self.silence(samples), samples)
 
     def sync_buffers(self):
         self._framebuffer.synchronize(self.format.byte_width * self.channels)
+        if self._playout is not None:
+            self._playout.reset(self.sample_rate.rate)
+        if self._drift is not None:
+            self._drift.reset()
+        if self._resampler is not None:
+            self._resampler.reset(self.format, self.channels)
+
+    def statistics(self) -> dict:
+        """Buffered latency plus the playout controller and drift estimator figures, when enabled."""
+        (_, available) = self._framebuffer.size()
+        stats = {"buffered_latency_ms": self._estimated_latency(available)}
+        if self._playout is not None:
+            stats.update(self._playout.statistics())
+        if self._drift is not None:
+            stats.update(self._drift.statistics())
+        return stats
 
     async def listen(self):
         self._stream: pyaudio.Stream = self.setup_stream()
         self._stream.start_stream()
 
         try:
-            while True:
-                # Wait for at least one packet
-                packet = await self.stream.get_packet()
-                resync = self.check_pyaudio(packet)
-                if resync:
-                    self.sync_buffers()
-                self.write_data(packet)
-
-                # Now drain any other packets that arrived while we were processing
-                while (next_packet := self.stream.get_packet_nowait()) is not None:
-                    resync = self.check_pyaudio(next_packet)
+            # Each batch is everything that arrived while we were processing the last
+            async for packets in self.stream.batches():
+                for packet in packets:
+                    if isinstance(packet, VBANFrameGap):
+                        self.write_gap(packet)
+                        continue
+                    resync = self.check_pyaudio(packet)
                     if resync:
                         self.sync_buffers()
-                    self.write_data(next_packet)
+                    self.write_data(packet)
         except asyncio.CancelledError as _:
             self.stop()
 
@@ -0,0 +1,203 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+def _spread(frames: int, count: int):
+    """``count`` frame positions spread evenly over ``frames``."""
+    return [(i + 1) * frames // (count + 1) for i in range(count)]
+
+
+def remove_frames(data, frames: int, bytes_per_frame: int, count: int) -> bytes:
+    """Shorten ``data`` by ``count`` single frames taken from evenly spaced positions."""
+    view = memoryview(data)
+    parts = []
+    previous = 0
+    for position in _spread(frames, count):
+        parts.append(view[previous * bytes_per_frame : position * bytes_per_frame])
+        previous = position + 1
+    parts.append(view[previous * bytes_per_frame : frames * bytes_per_frame])
+    return b"".join(parts)
+
+
+def repeat_frames(data, frames: int, bytes_per_frame: int, count: int) -> bytes:
+    """Lengthen ``data`` by ``count`` frames, repeating single frames at evenly spaced positions."""
+    view = memoryview(data)
+    parts = []
+    previous = 0
+    for position in _spread(frames, count):
+        parts.append(view[previous * bytes_per_frame : (position + 1) * bytes_per_frame])
+        previous = position
+    parts.append(view[previous * bytes_per_frame : frames * bytes_per_frame])
+    return b"".join(parts)
+
+
+@dataclass
+class PlayoutController:
+    """
+    Keeps the playout buffer near ``target_latency_ms``.
+
+    Every audio callback reports how many frames are buffered; the controller keeps
+    an exponentially smoothed fill level and, while it is more than ``tolerance_ms``
+    off target, asks for a few frames to be dropped or repeated in the next block.
+    Corrections are capped at ``max_correction`` of each block (1% is roughly
+    inaudible when spread as single frames) so latency glides to the target instead
+    of jumping.
+    """
+
+    target_latency_ms: float
+    sample_rate: int = 48000
+    tolerance_ms: float = 5.0
+    max_correction: float = 0.01
+    smoothing: float = 0.05
+    fill_frames: float = field(default=0.0, init=False)
+    frames_dropped: int = field(default=0, init=False)
+    frames_inserted: int = field(default=0, init=False)
+    _primed: bool = field(default=False, init=False, repr=False)
+
+    def _frames(self, ms: float) -> float:
+        return ms * self.sample_rate / 1000
+
+    @property
+    def target_frames(self) -> int:
+        return round(self._frames(self.target_latency_ms))
+
+    @property
+    def current_latency_ms(self) -> float:
+        return self.fill_frames * 1000 / self.sample_rate
+
+    def observe(self, available_frames: int):
+        if not self._primed:
+            self.fill_frames = available_frames
+            self._primed = True
+        else:
+            self.fill_frames += (available_frames - self.fill_frames) * self.smoothing
+
+    def correction(self, frame_count: int) -> int:
+        """Frames to drop (positive) or insert (negative) in a block of ``frame_count``."""
+        error = self.fill_frames - self._frames(self.target_latency_ms)
+        if abs(error) <= self._frames(self.tolerance_ms):
+            return 0
+        limit = max(1, math.floor(frame_count * self.max_correction))
+        return int(math.copysign(min(limit, math.ceil(abs(error))), error))
+
+    def applied(self, correction: int):
+        if correction > 0:
+            self.frames_dropped += correction
+        else:
+            self.frames_inserted -= correction
+
+    def reset(self, sample_rate: int = None):
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        self.fill_frames = 0.0
+        self._primed = False
+
+    def statistics(self) -> dict:
+        return {
+            "current_latency_ms": self.current_latency_ms,
+            "target_latency_ms": self.target_latency_ms,
+            "frames_dropped": self.frames_dropped,
+            "frames_inserted": self.frames_inserted,
+        }
+
+
+@dataclass
+class RateEstimator:
+    """
+    Long-term sample rate of a stream of timestamped blocks.
+
+    A running sample total is checkpointed at most every ``checkpoint_s`` seconds;
+    the rate is the slope between the oldest and newest checkpoint of the last
+    ``window_s`` seconds, so per block timing jitter averages out.
+    """
+
+    window_s: float = 60.0
+    checkpoint_s: float = 1.0
+    total: int = field(default=0, init=False)
+    _checkpoints: deque = field(default_factory=deque, init=False, repr=False)
+
+    def add(self, samples: int, timestamp_ns: int):
+        self.total += samples
+        checkpoints = self._checkpoints
+        if not checkpoints or timestamp_ns - checkpoints[-1][0] >= self.checkpoint_s * 1e9:
+            checkpoints.append((timestamp_ns, self.total))
+            while (
+                len(checkpoints) > 2
+                and checkpoints[-1][0] - checkpoints[1][0] >= self.window_s * 1e9
+            ):
+                checkpoints.popleft()
+
+    @property
+    def span_s(self) -> float:
+        checkpoints = self._checkpoints
+        if len(checkpoints) < 2:
+            return 0.0
+        return (checkpoints[-1][0] - checkpoints[0][0]) / 1e9
+
+    @property
+    def rate(self) -> Optional[float]:
+        checkpoints = self._checkpoints
+        if len(checkpoints) < 2:
+            return None
+        (start, first), (end, last) = checkpoints[0], checkpoints[-1]
+        return (last - first) * 1e9 / (end - start)
+
+    def reset(self):
+        self.total = 0
+        self._checkpoints.clear()
+
+
+@dataclass
+class DriftEstimator:
+    """
+    Ratio between the rate a sender produces samples at and the rate the local
+    device consumes them.
+
+    ``received`` is fed the samples the sender produced up to each packet (from its
+    framecount advance, so losses don't look like a slower clock) with the packet's
+    arrival time (kernel timestamps make this much steadier), ``consumed`` the
+    frames of every device callback. ``ratio`` stays 1.0 until both rates span
+    ``min_span_s`` seconds and is clamped to ``max_drift_ppm``, real sound card
+    clocks are well within that.
+    """
+
+    window_s: float = 60.0
+    min_span_s: float = 10.0
+    max_drift_ppm: float = 2000.0
+    _received: RateEstimator = field(default=None, init=False, repr=False)
+    _consumed: RateEstimator = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._received = RateEstimator(self.window_s)
+        self._consumed = RateEstimator(self.window_s)
+
+    def received(self, samples: int, timestamp_ns: int):
+        self._received.add(samples, timestamp_ns)
+
+    def consumed(self, frames: int, timestamp_ns: int):
+        self._consumed.add(frames, timestamp_ns)
+
+    @property
+    def ratio(self) -> float:
+        received, consumed = self._received, self._consumed
+        if min(received.span_s, consumed.span_s) < self.min_span_s:
+            return 1.0
+        limit = self.max_drift_ppm / 1e6
+        return min(1 + limit, max(1 - limit, received.rate / consumed.rate))
+
+    @property
+    def drift_ppm(self) -> float:
+        return (self.ratio - 1) * 1e6
+
+    def reset(self):
+        self._received.reset()
+        self._consumed.reset()
+
+    def statistics(self) -> dict:
+        return {
+            "received_rate": self._received.rate,
+            "consumed_rate": self._consumed.rate,
+            "drift_ppm": self.drift_ppm,
+        }
@@ -0,0 +1,160 @@
+import math
+
+from aiovban import audio
+from aiovban.packet.headers.audio import BitResolution, VBANAudioHeader
+
+from .playout import remove_frames, repeat_frames
+
+try:
+    import numpy
+except ImportError:  # Optional, frames are slipped whole without it
+    numpy = None
+
+_DTYPES = {
+    BitResolution.BYTE8: "u1",
+    BitResolution.INT16: "<i2",
+    BitResolution.INT32: "<i4",
+    BitResolution.FLOAT32: "<f4",
+    BitResolution.FLOAT64: "<f8",
+}
+
+
+class FractionalResampler:
+    """
+    Streams interleaved PCM blocks through a continuously variable rate change.
+
+    ``process`` consumes ``ratio`` input frames per output frame, so a ratio above 1
+    shortens the audio and below 1 stretches it. With NumPy the blocks are linearly
+    interpolated as one vectorized operation, carrying the fractional read position
+    and the last input frame over to the next block so there is no seam. Without
+    NumPy, or for formats it can't view as an array (packed 24 bit), the same
+    correction is applied by dropping or repeating single whole frames whenever the
+    accumulated difference reaches one frame.
+    """
+
+    def __init__(self, format: BitResolution, channels: int):
+        self.reset(format, channels)
+
+    def reset(self, format: BitResolution = None, channels: int = None):
+        if format is not None:
+            self.format = format
+        if channels is not None:
+            self.channels = channels
+        self.bytes_per_frame = self.format.byte_width * self.channels
+        self._dtype = _DTYPES.get(self.format) if numpy is not None else None
+        # Read position in [previous last frame] + block coordinates, 1.0 is the block start
+        self._position = 1.0
+        self._last = None
+        self._slip = 0.0
+
+    @property
+    def vectorized(self) -> bool:
+        return self._dtype is not None
+
+    def process(self, data, frames: int, ratio: float) -> tuple:
+        """Resample ``frames`` frames of ``data``, returning ``(data, frames)``."""
+        if frames == 0:
+            return data, 0
+        if self._dtype is None:
+            return self._slip_frames(data, frames, ratio)
+        return self._interpolate(data, frames, ratio)
+
+    def _interpolate(self, data, frames: int, ratio: float) -> tuple:
+        block = numpy.frombuffer(data, self._dtype, frames * self.channels)
+        block = block.reshape(frames, self.channels)
+        if ratio == 1.0 and self._position == 1.0:
+            self._last = block[-1].copy()
+            return data, frames
+
+        extended = numpy.empty((frames + 1, self.channels), numpy.float64)
+        extended[0] = self._last if self._last is not None else block[0]
+        extended[1:] = block
+        count = max(0, math.ceil((frames - self._position) / ratio))
+        positions = self._position + ratio * numpy.arange(count)
+        indices = positions.astype(numpy.intp)
+        fractions = (positions - indices)[:, None]
+        before = extended[indices]
+        out = before + (extended[indices + 1] - before) * fractions
+
+        self._position += ratio * count - frames
+        self._last = block[-1].copy()
+
+        dtype = numpy.dtype(self._dtype)
+        if dtype.kind in "iu":
+            # Interpolating between two valid samples can't overflow, only round
+            numpy.rint(out, out=out)
+        return out.astype(dtype).tobytes(), count
+
+    def _slip_frames(self, data, frames: int, ratio: float) -> tuple:
+        self._slip += frames * (1 - 1 / ratio)
+        slip = int(self._slip)
+        if slip == 0:
+            return data, frames
+        if slip > 0:
+            slip = min(slip, frames - 1)
+            data = remove_frames(data, frames, self.bytes_per_frame, slip)
+        else:
+            data = repeat_frames(data, frames, self.bytes_per_frame, -slip)
+        self._slip -= slip
+        return data, frames - slip
+
+
+class FormatConverter:
+    """
+    Converts audio blocks of any format, channel count and sample rate to one fixed
+    output format, so the output device never has to be reopened.
+
+    Blocks are decoded to float32, remixed with ``aiovban.audio.remix`` and run
+    through a float32 ``FractionalResampler`` at ``source rate / output rate``
+    (times any extra ``ratio``, e.g. for drift) before being encoded in the output
+    format. Blocks already in the output format pass through untouched while no
+    rate change is needed. Needs NumPy.
+    """
+
+    def __init__(self, format: BitResolution, channels: int, sample_rate: int):
+        if numpy is None:
+            raise ImportError("Format conversion needs NumPy, install aiovban-pyaudio[resample]")
+        self.format = format
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.source = None
+        self._resampler = FractionalResampler(BitResolution.FLOAT32, channels)
+
+    def configure(self, header: VBANAudioHeader) -> bool:
+        """Follow the format of ``header``, True if it changed."""
+        source = (header.bit_resolution, header.channels, header.sample_rate.rate)
+        if source == self.source:
+            return False
+        # Interpolating across the change would blend two unrelated formats
+        self._resampler.reset()
+        self.source = source
+        return True
+
+    def output_frames(self, frames: int) -> float:
+        """How many output frames ``frames`` frames of the current source last for."""
+        if self.source is None:
+            return frames
+        return frames * self.sample_rate / self.source[2]
+
+    def process(self, data, header: VBANAudioHeader, ratio: float = 1.0) -> tuple:
+        """Convert the ``samples_per_frame`` frames in ``data``, returning ``(data, frames)``."""
+        self.configure(header)
+        (bit_resolution, channels, sample_rate) = self.source
+        frames = header.samples_per_frame
+        ratio *= sample_rate / self.sample_rate
+        if (
+            ratio == 1.0
+            and bit_resolution == self.format
+            and channels == self.channels
+        ):
+            # Start the next resampled block fresh rather than from a stale frame
+            self._resampler.reset()
+            return data, frames
+
+        values = audio.to_float(data, bit_resolution)[: frames * channels]
+        values = audio.remix(values.reshape(-1, channels), self.channels)
+        data, frames = self._resampler.process(
+            numpy.ascontiguousarray(values, numpy.float32), frames, ratio
+        )
+        converted = audio.convert(data, BitResolution.FLOAT32, self.format)
+        return memoryview(converted).cast("B"), frames
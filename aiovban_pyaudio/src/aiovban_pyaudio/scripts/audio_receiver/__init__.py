@@ -46,7 +46,9 @@ async def run_loop(config):
         version=__version__,
     )
     client = AsyncVBANClient(application_data=application_data)
-    listen_future = await client.listen(config.host_address, config.host_port)
+    listen_future = await client.listen(
+        config.host_address, config.host_port, kernel_timestamps=config.kernel_timestamps
+    )
 
     pyaudio_instance = pyaudio.PyAudio()
 
@@ -64,7 +66,9 @@ async def run_loop(config):
 
         host = await client.register_device(address, port)
         receiver = host.receive_stream(
-            stream_name, back_pressure_strategy=BackPressureStrategy.DRAIN_OLDEST
+            stream_name,
+            back_pressure_strategy=BackPressureStrategy.DRAIN_OLDEST,
+            jitter_buffer_ms=config.jitter_buffer,
         )
         players.append(
             VBANAudioPlayer(
@@ -73,6 +77,9 @@ async def run_loop(config):
                 device_index=output_device,
                 channels=config.channels,
                 sample_rate=VBANSampleRate.find(config.sample_rate),
+                target_latency_ms=config.target_latency,
+                drift_correction=config.drift_correction,
+                fixed_format=config.fixed_format,
             )
         )
 
@@ -120,6 +127,35 @@ def main():
         default=48000,
         help="Initial sample rate to use",
     )
+    parser.add_argument(
+        "--jitter-buffer",
+        type=float,
+        default=None,
+        metavar="MS",
+        help="Reorder packets by framecount, waiting at most MS milliseconds for late ones",
+    )
+    parser.add_argument(
+        "--target-latency",
+        type=float,
+        default=None,
+        metavar="MS",
+        help="Keep playback latency near MS milliseconds by slipping or repeating frames",
+    )
+    parser.add_argument(
+        "--drift-correction",
+        action="store_true",
+        help="Resample to follow the sender's clock (more precise with --kernel-timestamps)",
+    )
+    parser.add_argument(
+        "--fixed-format",
+        action="store_true",
+        help="Keep the output device at --channels/--sample-rate and convert incoming audio instead of reopening it",
+    )
+    parser.add_argument(
+        "--kernel-timestamps",
+        action="store_true",
+        help="Stamp packets with kernel arrival times (Linux)",
+    )
 
     config = parser.parse_args()
     setup_logging(config.debug)
@@ -35,6 +35,16 @@ class VBANAudioSender:
 
     def __post_init__(self):
         self._stream = self.setup_stream()
+        self.stream.set_header_template(
+            VBANAudioHeader(
+                streamname=self.stream.name,
+                sample_rate=self.sample_rate,
+                codec=Codec.PCM,
+                channels=self.channels,
+                bit_resolution=self.format,
+                samples_per_frame=self.framebuffer_size,
+            )
+        )
 
     @property
     def bytes_per_frame(self):
@@ -51,40 +61,42 @@ class VBANAudioSender:
         )
 
     def split_bytes_into_chunks(self, data, chunk_size):
-        """Splits bytes into chunks of a given size."""
-        return [data[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
+        """Splits bytes into chunks of a given size without copying them."""
+        view = memoryview(data)
+        return [view[i : i + chunk_size] for i in range(0, len(data), chunk_size)]
 
-    def pack_audio_data(self, audio_data):
+    def build_packet(self, audio_data):
         samples_per_frame = len(audio_data) // self.bytes_per_frame
-        packet = VBANPacket(
-            header=VBANAudioHeader(
-                streamname=self.stream.name,
-                sample_rate=self.sample_rate,
-                codec=Codec.PCM,
-                channels=self.channels,
-                bit_resolution=self.format,
-                samples_per_frame=samples_per_frame,
-            ),
-            body=BytesBody(audio_data),
-        )
+        if samples_per_frame == self.framebuffer_size:
+            header = self.stream.header_template()
+        else:
+            header = self.stream.header_template(samples_per_frame=samples_per_frame)
+        return VBANPacket(header=header, body=BytesBody(audio_data))
+
+    def pack_audio_data(self, audio_data):
+        self.send_packets([self.build_packet(audio_data)])
+
+    def send_packets(self, packets):
         if isinstance(self.stream, BufferedVBANOutgoingStream):
-            # Safe cross-thread async scheduling
-            self.stream.send_packet_threadsafe(packet, loop=self._loop)
-            self._sent_packet_count += 1
+            # Safe cross-thread scheduling, one loop wakeup for the whole read
+            self.stream.send_packets_threadsafe(packets, loop=self._loop)
         elif self._loop:
             # Fallback for non-buffered streams
-            asyncio.run_coroutine_threadsafe(self.stream.send_packet(packet), self._loop)
-            self._sent_packet_count += 1
-
-        if self._sent_packet_count % 100 == 0:
+            for packet in packets:
+                asyncio.run_coroutine_threadsafe(self.stream.send_packet(packet), self._loop)
+        else:
+            return
+
+        previous = self._sent_packet_count
+        self._sent_packet_count += len(packets)
+        if self._sent_packet_count // 100 != previous // 100:
             if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Sent {self._sent_packet_count} packets")
 
     def send_all_audio_data(self, audio_data):
         chunk_size = self.framebuffer_size * self.bytes_per_frame
         chunks = self.split_bytes_into_chunks(audio_data, chunk_size)
-        for chunk in chunks:
-            self.pack_audio_data(chunk)
+        self.send_packets([self.build_packet(chunk) for chunk in chunks])
 
     def read_stream(self, amount):
         return self._stream.read(amount, exception_on_overflow=False)
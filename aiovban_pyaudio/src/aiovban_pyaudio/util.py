@@ -36,27 +36,57 @@ def run_on_background_thread(func):
     return wrapper
 
 
+class _FrameRing:
+    """
+    Storage of a FrameBuffer for one frame size, swapped as a whole by ``synchronize``.
+    ``start`` is the write position it was published at, nothing before it is in it.
+    """
+
+    __slots__ = ("bytes_per_frame", "capacity", "size", "ring", "out", "start")
+
+    def __init__(self, capacity: int, bytes_per_frame: int, start: int = 0):
+        self.start = start
+        self.bytes_per_frame = bytes_per_frame
+        self.capacity = capacity
+        self.size = capacity * bytes_per_frame
+        self.ring = memoryview(bytearray(self.size))
+        self.out = memoryview(bytearray(self.size))
+
+
 class FrameBuffer:
     """
-    A utility class to manage a buffer of audio frames. This class is used to store audio frames
-    with a maximum frame count. When the buffer is full, the oldest frames are dropped to make
-    room for new frames and keep latency low.
+    A fixed-capacity ring buffer of audio frames. When more than ``max_frame_count``
+    frames are waiting, the oldest are dropped on the next read to keep latency low.
+
+    The buffer is single-producer/single-consumer and lock free: only ``write``
+    advances the write position and only ``read`` advances the read position, each
+    published after its copy, so the PortAudio callback never waits on a mutex. The
+    ring holds twice ``max_frame_count`` frames. While reads keep up and drop down
+    to ``max_frame_count`` frames, writes of up to ``max_frame_count`` frames only
+    overwrite frames the next read would drop anyway. Larger writes, or reads with
+    ``drop_frames=False`` that let more than the ring's capacity pile up, overwrite
+    the oldest unread frames instead, possibly while ``read`` is copying them: the
+    writer announces how far it is about to write before copying, and ``read``
+    drops (and counts as dropped) any frames it copied from that range, so it never
+    returns torn audio. ``synchronize`` publishes a new ring that starts at the
+    current write position and ``read`` skips ahead to it, so the producer never
+    touches the read position either.
 
     Methods:
         __init__(max_frame_count: int, bytes_per_frame: int = 4):
             Initializes the FrameBuffer with a maximum frame count and bytes per frame.
 
         write(data: bytes, frames: int):
-            Writes data to the buffer and updates the frame count. Thread-safe.
+            Copies frames into the ring. Producer thread only.
 
         size():
-            Returns the current size of the buffer in bytes and the frame count. Thread-safe.
+            Returns the current size of the buffer in bytes and the frame count.
 
         read(num_frames: int):
-            Reads a specified number of frames from the buffer, dropping the oldest frames if necessary. Thread-safe.
+            Reads frames into a reusable output buffer, dropping the oldest frames if necessary. Consumer thread only.
 
         synchronize(bytes_per_frame: int):
-            Resets the buffer and updates the bytes per frame. Thread-safe.
+            Empties the buffer and updates the bytes per frame. Producer thread only.
     """
 
     def __init__(self, max_frame_count: int, bytes_per_frame: int = 1):
@@ -65,25 +95,52 @@ class FrameBuffer:
 
         Args:
             max_frame_count (int): The maximum number of frames the buffer can hold.
-            bytes_per_frame (int): The number of bytes per frame. Default is 4.
+            bytes_per_frame (int): The number of bytes per frame. Default is 1.
         """
-        self._buffer = bytearray()
-        self._frame_count = 0
         self._max_frame_count = max_frame_count
-        self._bytes_per_frame = bytes_per_frame
-        self._mutex = threading.Lock()
+        self._layout = _FrameRing(2 * max_frame_count, bytes_per_frame)
+        # Total frames written and read, positions in the ring are taken modulo its capacity
+        self._write = 0
+        self._read = 0
+        # Where the write in progress ends, published before it copies
+        self._writing = 0
 
     def write(self, data: bytes, frames: int):
         """
-        Writes data to the buffer and updates the frame count.
+        Copies frames into the ring, overwriting the oldest frames once it is full.
 
         Args:
-            data (bytes): The audio data to write to the buffer.
+            data (bytes): The audio data to write, at least ``frames`` frames long.
             frames (int): The number of frames in the data.
         """
-        with self._mutex:
-            self._buffer.extend(data)
-            self._frame_count += frames
+        layout = self._layout
+        bytes_per_frame = layout.bytes_per_frame
+        size = layout.size
+        nbytes = frames * bytes_per_frame
+        write = self._write
+
+        if nbytes > size:
+            # Only the newest frames fit
+            skipped = frames - layout.capacity
+            data = memoryview(data)[skipped * bytes_per_frame : nbytes]
+            write += skipped
+            frames = layout.capacity
+            nbytes = size
+        elif len(data) != nbytes:
+            data = memoryview(data)[:nbytes]
+
+        self._writing = write + frames
+        start = write % layout.capacity * bytes_per_frame
+        end = start + nbytes
+        ring = layout.ring
+        if end <= size:
+            ring[start:end] = data
+        else:
+            first = size - start
+            data = memoryview(data)
+            ring[start:] = data[:first]
+            ring[: end - size] = data[first:]
+        self._write = write + frames
 
     def size(self):
         """
@@ -92,8 +149,10 @@ class FrameBuffer:
         Returns:
             tuple: A tuple containing the size of the buffer in bytes and the frame count.
         """
-        with self._mutex:
-            return len(self._buffer), self._frame_count
+        write = self._write
+        layout = self._layout
+        frames = max(0, min(write - max(self._read, layout.start), layout.capacity))
+        return frames * layout.bytes_per_frame, frames
 
     def read(self, num_frames: int, drop_frames=True):
         """
@@ -101,38 +160,65 @@ class FrameBuffer:
 
         Args:
             num_frames (int): The number of frames to read from the buffer.
-            drop_frames (bool): Whether to drop frames if the buffer is full. Default is True.
+            drop_frames (bool): Whether to drop frames beyond the maximum frame count. Default is True.
 
         Returns:
-            tuple: A tuple containing the read data, the number of frames read, and the number of frames dropped.
+            tuple: A tuple containing a memoryview of the read data, the number of frames read, and
+            the number of frames dropped. The memoryview is only valid until the next read.
         """
-        with self._mutex:
-            if drop_frames:
-                excess_frames = max(0, self._frame_count - self._max_frame_count)
-                if excess_frames > 0:
-                    bytes_to_drop = self._bytes_per_frame * excess_frames
-                    del self._buffer[:bytes_to_drop]
-                    self._frame_count -= excess_frames
-            else:
-                excess_frames = 0
-
-            maximum_available_frames = min(num_frames, self._frame_count)
-            bytes_for_frames = self._bytes_per_frame * maximum_available_frames
-
-            buffer_data = bytes(self._buffer[:bytes_for_frames])
-            del self._buffer[:bytes_for_frames]
-            self._frame_count -= maximum_available_frames
-
-            return buffer_data, maximum_available_frames, excess_frames
+        # Write position before layout: frames written to a new layout are only ever
+        # published after the layout itself
+        write = self._write
+        layout = self._layout
+        read = self._read
+        if read < layout.start:
+            # synchronize emptied the buffer, skip everything written before it
+            read = layout.start
+
+        excess_frames = 0
+        if drop_frames and write - read > self._max_frame_count:
+            excess_frames = write - read - self._max_frame_count
+        if write - read - excess_frames > layout.capacity:
+            # Overwritten before we got to them
+            excess_frames = write - read - layout.capacity
+        read += excess_frames
+
+        count = write - read
+        if num_frames < count:
+            count = num_frames
+        if count < 0:
+            count = 0
+        bytes_per_frame = layout.bytes_per_frame
+        size = layout.size
+        nbytes = count * bytes_per_frame
+        start = read % layout.capacity * bytes_per_frame
+        end = start + nbytes
+        out, ring = layout.out, layout.ring
+        if end <= size:
+            out[:nbytes] = ring[start:end]
+        else:
+            first = size - start
+            out[:first] = ring[start:]
+            out[first:nbytes] = ring[: end - size]
+
+        # Frames the writer went around the ring to while we copied are torn
+        torn = min(self._writing - layout.capacity - read, count)
+        if torn > 0:
+            read += torn
+            count -= torn
+            excess_frames += torn
+            self._read = read + count
+            return out[torn * bytes_per_frame : nbytes], count, excess_frames
+
+        self._read = read + count
+        return out[:nbytes], count, excess_frames
 
     def synchronize(self, bytes_per_frame: int):
         """
-        Resets the buffer and updates the bytes per frame.
+        Empties the buffer and updates the bytes per frame. The reader notices the new
+        layout on its next read, ``read`` may still return old frames while it runs.
 
         Args:
             bytes_per_frame (int): The new number of bytes per frame.
         """
-        with self._mutex:
-            self._buffer.clear()
-            self._frame_count = 0
-            self._bytes_per_frame = bytes_per_frame
+        self._layout = _FrameRing(2 * self._max_frame_count, bytes_per_frame, self._write)
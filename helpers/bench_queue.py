@@ -0,0 +1,181 @@
+"""
+Benchmark BackPressureQueue against the asyncio.Queue based implementation it
+replaced (kept below as LegacyBackPressureQueue).
+
+Usage:
+    uv run python helpers/bench_queue.py [iterations]
+"""
+
+import asyncio
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiovban.asyncio.util import BackPressureQueue, BackPressureStrategy
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+
+@dataclass
+class LegacyBackPressureQueue:
+    queue_size: int
+    queue_name: str = "Queue"
+    back_pressure_strategy: BackPressureStrategy = field(
+        default=BackPressureStrategy.DROP
+    )
+    _mutex: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    _queue: asyncio.Queue = field(default_factory=asyncio.Queue, init=False)
+
+    def __post_init__(self):
+        self._queue = asyncio.Queue(self.queue_size)
+
+    async def put(self, packet: Any):
+        if self.back_pressure_strategy in [
+            BackPressureStrategy.DROP,
+            BackPressureStrategy.RAISE,
+        ]:
+            if self.put_nowait(packet):
+                return
+
+        if self._queue.full():
+            if self.back_pressure_strategy == BackPressureStrategy.DRAIN_OLDEST:
+                await self._drain_queue()
+            elif self.back_pressure_strategy == BackPressureStrategy.POP:
+                # logger.debug(f"{self.queue_name} full. Dropping item")
+                self._queue.get_nowait()
+
+        await self._queue.put(packet)
+
+    def put_threadsafe(self, packet: Any, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Thread-safe method to put an item in the queue from a background thread.
+        This correctly utilizes asyncio.run_coroutine_threadsafe.
+        """
+        asyncio.run_coroutine_threadsafe(self.put(packet), loop)
+
+    def put_nowait(self, packet: Any) -> bool:
+        """
+        Attempt to put an item in the queue without blocking.
+        Returns True if successful, False if the queue is full or strategy requires blocking/draining.
+        This method is strictly for same-thread operations.
+        """
+        if self.back_pressure_strategy in [
+            BackPressureStrategy.DROP,
+            BackPressureStrategy.RAISE,
+        ]:
+            try:
+                self._queue.put_nowait(packet)
+                return True
+            except asyncio.QueueFull:
+                if self.back_pressure_strategy == BackPressureStrategy.RAISE:
+                    raise asyncio.QueueFull
+                else:
+                    return True
+
+        if not self._queue.full():
+            self._queue.put_nowait(packet)
+            return True
+
+        if self.back_pressure_strategy == BackPressureStrategy.POP:
+            try:
+                self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self._queue.put_nowait(packet)
+            return True
+
+        return False
+
+    async def _drain_queue(self):
+        # Leveraging the mutex to ensure that we don't have multiple drain operations happening at the same time
+        async with self._mutex:
+            for i in range(int(self.queue_size / 2)):
+                try:
+                    self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+        # logger.debug(f"Drained {int(self.queue_size / 2)} items from {self.queue_name}")
+
+    async def get(self):
+        return await self._queue.get()
+
+    def get_nowait(self):
+        return self._queue.get_nowait()
+
+
+def bench(label, fn, iterations=ITERATIONS):
+    start = time.perf_counter()
+    fn(iterations)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<14} {elapsed / iterations * 1e9:8.1f} ns/op")
+
+
+def put_get(queue_cls, strategy):
+    def run(n):
+        queue = queue_cls(100, back_pressure_strategy=strategy)
+        put, get = queue.put_nowait, queue.get_nowait
+        for i in range(n):
+            put(i)
+            get()
+
+    return run
+
+
+def overflow(queue_cls, strategy):
+    def run(n):
+        queue = queue_cls(100, back_pressure_strategy=strategy)
+        put = queue.put_nowait
+        for i in range(n):
+            put(i)
+
+    return run
+
+
+def batches(queue_cls, size=64):
+    def run(n):
+        queue = queue_cls(256, back_pressure_strategy=BackPressureStrategy.DROP)
+        packets = list(range(size))
+        for i in range(n // size):
+            if hasattr(queue, "put_many_nowait"):
+                queue.put_many_nowait(packets)
+                queue.get_many_nowait(size)
+            else:
+                for packet in packets:
+                    queue.put_nowait(packet)
+                for j in range(size):
+                    queue.get_nowait()
+
+    return run
+
+
+def handoff(queue_cls):
+    async def main(n):
+        queue = queue_cls(100, back_pressure_strategy=BackPressureStrategy.DROP)
+
+        async def consumer():
+            for i in range(n):
+                await queue.get()
+
+        task = asyncio.create_task(consumer())
+        for i in range(n):
+            queue.put_nowait(i)
+            await asyncio.sleep(0)
+        await task
+
+    return lambda n: asyncio.run(main(n))
+
+
+def main():
+    for name, queue_cls in (("legacy", LegacyBackPressureQueue), ("ring", BackPressureQueue)):
+        print(name)
+        for strategy in (BackPressureStrategy.DROP, BackPressureStrategy.POP):
+            bench(f"put/get {strategy.name}", put_get(queue_cls, strategy))
+        for strategy in (BackPressureStrategy.DROP, BackPressureStrategy.POP):
+            bench(f"full {strategy.name}", overflow(queue_cls, strategy))
+        bench("batch 64", batches(queue_cls))
+        bench("handoff", handoff(queue_cls), ITERATIONS // 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -117,16 +117,13 @@ async def main():
         print(f"Waiting up to {args.timeout}s for packets...")
         while asyncio.get_event_loop().time() < deadline:
             remaining = deadline - asyncio.get_event_loop().time()
-            try:
-                packet = await asyncio.wait_for(rt_stream.get_packet(), timeout=min(1.0, remaining))
-            except asyncio.TimeoutError:
-                continue
-            packet_count += 1
-            if isinstance(packet.body, RTPacketBodyType1):
-                type1_count += 1
-            # Print Type 1 always; suppress repeated Type 0 after the first few
-            if isinstance(packet.body, RTPacketBodyType1) or packet_count <= 3:
-                _print_packet(packet_count, args.address, args.remote_port, packet)
+            for packet in await rt_stream.get_packets(timeout=min(1.0, remaining)):
+                packet_count += 1
+                if isinstance(packet.body, RTPacketBodyType1):
+                    type1_count += 1
+                # Print Type 1 always; suppress repeated Type 0 after the first few
+                if isinstance(packet.body, RTPacketBodyType1) or packet_count <= 3:
+                    _print_packet(packet_count, args.address, args.remote_port, packet)
 
         print(f"\nDone. Type 0: {packet_count - type1_count}  Type 1: {type1_count}  Raw UDP: {client.raw_packets_received}")
             
@@ -4,15 +4,19 @@ import logging
 import platform
 import socket
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Optional
 
 from .device import VBANDevice
-from .streams import VBANOutgoingStream
+from .pool import VBANTransportPool
+from .streams import VBANIncomingStream
+from .util import SendBuffer
 from .voicemeeter import VoicemeeterRemote
 from .. import VBANApplicationData
 from ..packet import ServiceType, VBANPacket
 from ..packet.body.service import DeviceType, Features
 from ..packet.headers.service import PingFunctions, VBANServiceHeader
+from ..packet.headers.subprotocol import VBANSubProtocolTypes
+from ..util.clock import WALL_CLOCK, PacketClock
 
 logger = logging.getLogger(__name__)
 
@@ -37,30 +41,171 @@ class AsyncVBANClient(asyncio.DatagramProtocol):
     _registered_devices: dict = field(default_factory=dict, repr=False)
 
     _transport: Any = field(default=None, init=False, repr=False)
+    _send_buffer: SendBuffer = field(default_factory=SendBuffer, init=False, repr=False)
+    transport_pool: VBANTransportPool = field(default=None, init=False, repr=False)
     raw_packets_received: int = field(default=0, init=False, repr=False)
+    slow_path_packets: int = field(default=0, init=False, repr=False)
+    slow_path_dropped: int = field(default=0, init=False, repr=False)
+    _source_filter: bool = field(default=False, init=False, repr=False)
+    # Received packets are stamped on this clock, see monotonic_timestamps
+    clock: PacketClock = field(default=WALL_CLOCK, init=False, repr=False)
 
-    async def listen(self, address="0.0.0.0", port=6980, loop=None):
+    def __post_init__(self):
+        self.transport_pool = VBANTransportPool(self)
+
+    async def listen(
+        self,
+        address="0.0.0.0",
+        port=6980,
+        loop=None,
+        batch_receive: bool = False,
+        batch_size: int = 64,
+        receive_buffer_size: Optional[int] = None,
+        reuse_port: bool = False,
+        source_filter: bool = False,
+        receive_thread: bool = False,
+        ring_size: int = 256,
+        kernel_timestamps: bool = False,
+        monotonic_timestamps: bool = False,
+    ):
+        """
+        Start listening for VBAN datagrams and return a future that completes when
+        the listener closes.
+
+        ``receive_buffer_size`` sets SO_RCVBUF to absorb bursts. With
+        ``batch_receive`` the socket is drained up to ``batch_size`` datagrams
+        per event loop wakeup (see VBANBatchDatagramTransport) instead of one
+        callback per datagram. It falls back to the default transport on loops
+        without ``add_reader`` support (e.g. the Windows proactor loop).
+
+        ``reuse_port`` sets SO_REUSEPORT so several processes can bind the same
+        port, see VBANShardedListener.
+
+        ``source_filter`` attaches a BPF socket filter (Linux, IPv4) built from the
+        registered devices and kept in sync as they change, so datagrams from other
+        hosts are dropped by the kernel before they reach ``quick_reject``. Those
+        datagrams are then no longer counted in ``raw_packets_received``.
+
+        ``receive_thread`` moves the socket reads to a dedicated OS thread that
+        fills a ring of ``ring_size`` preallocated slots and stamps every datagram
+        on arrival, so receiving keeps pace while the loop is busy elsewhere (see
+        VBANThreadedDatagramTransport). It takes precedence over ``batch_receive``.
+
+        ``kernel_timestamps`` stamps packets with the time the kernel received them
+        (SO_TIMESTAMPNS, Linux) instead of when Python unpacks them, so
+        ``VBANPacket.latency`` and jitter figures exclude event loop delay. It needs
+        one of the receivers above and turns on ``batch_receive`` if neither is
+        chosen; elsewhere packets are stamped as before. ``monotonic_timestamps``
+        stamps this client's packets on a monotonic ``PacketClock`` (see
+        ``aiovban.util.clock``), anchored to the wall clock when listening starts,
+        so timestamps and everything that ages packets by them don't jump when the
+        system clock is adjusted. It applies to every receiver; other clients keep
+        their own clock.
+        """
         loop = loop or asyncio.get_running_loop()
+        self._source_filter = source_filter
+        if monotonic_timestamps:
+            self.clock = PacketClock(monotonic=True)
+        if kernel_timestamps and not receive_thread:
+            batch_receive = True
 
         from .protocol import VBANListenerProtocol
 
+        if receive_thread:
+            from .receiver import VBANThreadedDatagramTransport
+
+            self._transport, proto = await VBANThreadedDatagramTransport.create(
+                lambda: VBANListenerProtocol(self),
+                self,
+                local_addr=(address, port),
+                loop=loop,
+                receive_buffer_size=receive_buffer_size,
+                batch_size=batch_size,
+                reuse_port=reuse_port,
+                ring_size=ring_size,
+                kernel_timestamps=kernel_timestamps,
+            )
+            self._update_source_filter()
+            return proto.done
+
+        if batch_receive:
+            from .receiver import VBANBatchDatagramTransport
+
+            try:
+                self._transport, proto = await VBANBatchDatagramTransport.create(
+                    lambda: VBANListenerProtocol(self),
+                    self,
+                    local_addr=(address, port),
+                    loop=loop,
+                    receive_buffer_size=receive_buffer_size,
+                    batch_size=batch_size,
+                    reuse_port=reuse_port,
+                    kernel_timestamps=kernel_timestamps,
+                )
+                self._update_source_filter()
+                return proto.done
+            except NotImplementedError:
+                logger.warning(
+                    "Event loop does not support add_reader, using the default receiver"
+                    + (" without kernel timestamps" if kernel_timestamps else "")
+                )
+
         self._transport, proto = await loop.create_datagram_endpoint(
             lambda: VBANListenerProtocol(self),
             local_addr=(address, port),
             allow_broadcast=True,
+            reuse_port=reuse_port or None,
         )
+        if receive_buffer_size:
+            sock = self._transport.get_extra_info("socket")
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer_size)
 
+        self._update_source_filter()
         return proto.done
 
-    def send_datagram(self, data: bytes, addr: tuple) -> None:
-        """Send raw bytes via the listener socket so the source port matches the listening port."""
-        if self._transport:
+    def send_datagram(
+        self, data, addr: tuple, send_buffer: Optional[SendBuffer] = None
+    ) -> None:
+        """
+        Send via the listener socket so the source port matches the listening port.
+
+        ``data`` may be raw bytes or a VBANPacket. Packets are packed in place into
+        ``send_buffer`` (or the client's own buffer) rather than a new bytes object.
+        """
+        if not self._transport:
+            return
+        if isinstance(data, (bytes, bytearray, memoryview)):
             self._transport.sendto(data, addr)
+        else:
+            send_buffer = send_buffer or self._send_buffer
+            self._transport.sendto(send_buffer.pack(data), addr)
+            send_buffer.recycle(self._transport)
 
     def close(self):
         if self._transport:
             self._transport.close()
             self._transport = None
+        self.transport_pool.close()
+
+    def statistics(self) -> dict:
+        """Receive counters, plus the current queue depth of every incoming stream."""
+        stats = {
+            "raw_packets_received": self.raw_packets_received,
+            "slow_path_packets": self.slow_path_packets,
+            "slow_path_dropped": self.slow_path_dropped,
+        }
+        batches_received = getattr(self._transport, "batches_received", None)
+        if batches_received is not None:
+            stats["batches_received"] = batches_received
+        stats["devices"] = {
+            address: {
+                name: stream._queue.qsize()
+                for name, stream in device._streams.items()
+                if isinstance(stream, VBANIncomingStream)
+            }
+            for address, device in self._registered_devices.items()
+        }
+        return stats
 
     @staticmethod
     def _get_device_name():
@@ -80,6 +225,33 @@ class AsyncVBANClient(asyncio.DatagramProtocol):
             host_name=platform.node(),
         )
 
+    def _update_source_filter(self):
+        """Rebuild the kernel source filter from the registered devices."""
+        if not self._source_filter or not self._transport:
+            return
+        from .bpf import (
+            MAX_FILTER_ADDRESSES,
+            SO_ATTACH_FILTER,
+            attach_program,
+            bpf_available,
+            detach_program,
+            source_filter_program,
+        )
+
+        sock = self._transport.get_extra_info("socket")
+        if not bpf_available() or sock is None or sock.family != socket.AF_INET:
+            return
+        if len(self._registered_devices) > MAX_FILTER_ADDRESSES:
+            # Too many for one program, leave it all to quick_reject
+            detach_program(sock)
+            return
+
+        program = source_filter_program(self._registered_devices)
+        try:
+            attach_program(sock, SO_ATTACH_FILTER, program)
+        except OSError as e:
+            logger.warning(f"Could not attach source filter: {e}")
+
     def quick_reject(self, address):
         return address not in self._registered_devices
 
@@ -97,10 +269,26 @@ class AsyncVBANClient(asyncio.DatagramProtocol):
             await device.handle_packet(address, packet)
 
     def process_packet_nowait(self, address, port, packet) -> bool:
+        """
+        Handle ``packet`` without waiting. False only when ``process_packet`` still
+        has something to await for it, see VBANDevice.handle_packet_nowait.
+        """
         device: VBANDevice = self._registered_devices.get(address)
         if device:
             return device.handle_packet_nowait(address, packet)
-        return False
+        return not self.wants_packet(address, packet)
+
+    def wants_packet(self, address, packet) -> bool:
+        """Whether ``process_packet`` would do anything with ``packet``."""
+        device: VBANDevice = self._registered_devices.get(address)
+        if device:
+            return device.wants_packet(packet)
+        # Only a ping request from an unknown sender needs an answer
+        return (
+            packet.subprotocol == VBANSubProtocolTypes.SERVICE
+            and packet.header.service == ServiceType.Identification
+            and packet.header.function == PingFunctions.Request
+        )
 
     async def send_ping(
         self, address, port, type: PingFunctions = PingFunctions.Request
@@ -116,9 +304,9 @@ class AsyncVBANClient(asyncio.DatagramProtocol):
             body=response_body.pack(),
         )
         logger.info(f"Sending ping response {response_body}")
-        out_stream = VBANOutgoingStream(name="VBAN Service", _client=self)
-        await out_stream.connect(address, port)
-        await out_stream.send_packet(packet)
+        # Replies share the pooled sender socket, a ping flood must not open sockets
+        protocol = await self.transport_pool.acquire(address)
+        protocol.send_packet(packet, (address, port))
 
     async def register_device(self, address: str, port: int = 6980):
         # Use async DNS resolution to avoid blocking
@@ -146,7 +334,16 @@ class AsyncVBANClient(asyncio.DatagramProtocol):
             _client=self,
             default_stream_size=self.default_queue_size,
         )
+        self._update_source_filter()
         return self._registered_devices[ip_address]
 
+    def unregister_device(self, address: str) -> Optional[VBANDevice]:
+        """Stop receiving from ``address``. Returns the removed device, if any."""
+        device = self._registered_devices.pop(address, None)
+        if device is not None:
+            logger.info(f"Unregistered device at {address}")
+            self._update_source_filter()
+        return device
+
     def devices(self):
         return list(self._registered_devices.values())
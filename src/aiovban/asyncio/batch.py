@@ -0,0 +1,130 @@
+import ctypes
+import logging
+import socket
+import struct
+import sys
+from typing import Any, Optional
+
+from ..packet import VBAN_PROTOCOL_MAX_SIZE
+
+logger = logging.getLogger(__package__)
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def _load_sendmmsg():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        sendmmsg = ctypes.CDLL(None, use_errno=True).sendmmsg
+    except (OSError, AttributeError):
+        return None
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+    return sendmmsg
+
+
+_sendmmsg = _load_sendmmsg()
+
+
+class DatagramBatch:
+    """
+    Packs outgoing packets into preallocated slots and flushes them together.
+
+    On Linux a flush over a connected socket is a single ``sendmmsg`` call; otherwise,
+    or when the transport already has data queued, each datagram goes through
+    ``transport.sendto`` in order. Packets are packed on ``add``, anything with
+    ``pack_into`` can be added.
+    """
+
+    def __init__(self, capacity: int = 64, slot_size: int = VBAN_PROTOCOL_MAX_SIZE):
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self._datagrams = []
+        self._allocate()
+
+    @property
+    def sendmmsg_available(self) -> bool:
+        return _sendmmsg is not None
+
+    def _allocate(self):
+        self._arena = bytearray(self.capacity * self.slot_size)
+        self._view = memoryview(self._arena)
+        if _sendmmsg is None:
+            return
+
+        base = ctypes.addressof((ctypes.c_char * len(self._arena)).from_buffer(self._arena))
+        self._iovecs = (_IOVec * self.capacity)()
+        self._messages = (_MMsgHdr * self.capacity)()
+        for i in range(self.capacity):
+            self._iovecs[i].iov_base = base + i * self.slot_size
+            self._messages[i].msg_hdr.msg_iov = ctypes.pointer(self._iovecs[i])
+            self._messages[i].msg_hdr.msg_iovlen = 1
+
+    def __len__(self):
+        return len(self._datagrams)
+
+    def full(self) -> bool:
+        return len(self._datagrams) >= self.capacity
+
+    def add(self, packet) -> None:
+        """Pack ``packet`` into the next free slot. The caller flushes when ``full()``."""
+        start = len(self._datagrams) * self.slot_size
+        slot = self._view[start : start + self.slot_size]
+        try:
+            self._datagrams.append(slot[: packet.pack_into(slot)])
+        except (ValueError, struct.error):
+            # Oversized packet, keep a one-off copy
+            self._datagrams.append(packet.pack())
+
+    def flush(self, transport: Any, addr: Optional[tuple] = None) -> int:
+        """Send every pending datagram. ``addr`` must be None for connected transports."""
+        datagrams, self._datagrams = self._datagrams, []
+        if not datagrams or transport is None:
+            return 0
+
+        sent = 0
+        if addr is None and transport.get_write_buffer_size() == 0:
+            sent = self._sendmmsg(transport, datagrams)
+
+        for datagram in datagrams[sent:]:
+            transport.sendto(datagram, addr)
+        if sent < len(datagrams) and transport.get_write_buffer_size() > 0:
+            # The transport may hold on to our slots, don't overwrite them
+            self._allocate()
+        return len(datagrams)
+
+    def _sendmmsg(self, transport: Any, datagrams: list) -> int:
+        if _sendmmsg is None or any(isinstance(d, bytes) for d in datagrams):
+            return 0
+        sock = transport.get_extra_info("socket")
+        if sock is None:
+            return 0
+
+        count = len(datagrams)
+        for i in range(count):
+            self._iovecs[i].iov_len = len(datagrams[i])
+        result = _sendmmsg(sock.fileno(), self._messages, count, socket.MSG_DONTWAIT)
+        if result < 0:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"sendmmsg failed with errno {ctypes.get_errno()}, falling back")
+            return 0
+        return result
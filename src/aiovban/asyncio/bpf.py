@@ -0,0 +1,91 @@
+import ctypes
+import ipaddress
+import socket
+import struct
+import sys
+from typing import Iterable, Mapping
+
+# Classic BPF opcodes, see linux/filter.h
+BPF_LD_W_ABS = 0x20
+BPF_JEQ_K = 0x15
+BPF_ALU_MOD_K = 0x94
+BPF_RET_K = 0x06
+BPF_RET_A = 0x16
+
+# Negative load offsets are relative to the network (IP) header
+SKF_NET_OFF = -0x100000
+IPV4_SOURCE_OFFSET = 12
+
+SO_ATTACH_FILTER = getattr(socket, "SO_ATTACH_FILTER", 26)
+SO_DETACH_FILTER = getattr(socket, "SO_DETACH_FILTER", 27)
+SO_ATTACH_REUSEPORT_CBPF = getattr(socket, "SO_ATTACH_REUSEPORT_CBPF", 51)
+
+
+class _SockFilter(ctypes.Structure):
+    _fields_ = [
+        ("code", ctypes.c_uint16),
+        ("jt", ctypes.c_uint8),
+        ("jf", ctypes.c_uint8),
+        ("k", ctypes.c_uint32),
+    ]
+
+
+def bpf_available() -> bool:
+    return sys.platform.startswith("linux")
+
+
+def bpf_stmt(code: int, k: int) -> tuple:
+    return code, 0, 0, k & 0xFFFFFFFF
+
+
+def bpf_jump(code: int, k: int, jt: int, jf: int) -> tuple:
+    return code, jt, jf, k & 0xFFFFFFFF
+
+
+def _ipv4(address: str) -> int:
+    return int(ipaddress.IPv4Address(address))
+
+
+def reuseport_steering_program(assignments: Mapping[str, int], workers: int) -> list:
+    """
+    Program for a SO_REUSEPORT group that sends each assigned IPv4 source address
+    to a fixed socket index and spreads everything else by source address.
+    """
+    program = [bpf_stmt(BPF_LD_W_ABS, SKF_NET_OFF + IPV4_SOURCE_OFFSET)]
+    for address, index in assignments.items():
+        program.append(bpf_jump(BPF_JEQ_K, _ipv4(address), 0, 1))
+        program.append(bpf_stmt(BPF_RET_K, index))
+    program.append(bpf_stmt(BPF_ALU_MOD_K, workers))
+    program.append(bpf_stmt(BPF_RET_A, 0))
+    return program
+
+
+# Classic BPF programs are capped at 4096 instructions, two per address here
+MAX_FILTER_ADDRESSES = 2000
+
+
+def source_filter_program(addresses: Iterable[str]) -> list:
+    """Socket filter that accepts datagrams only from the given IPv4 source addresses."""
+    program = [bpf_stmt(BPF_LD_W_ABS, SKF_NET_OFF + IPV4_SOURCE_OFFSET)]
+    for address in addresses:
+        program.append(bpf_jump(BPF_JEQ_K, _ipv4(address), 0, 1))
+        program.append(bpf_stmt(BPF_RET_K, 0xFFFFFFFF))
+    program.append(bpf_stmt(BPF_RET_K, 0))
+    return program
+
+
+def detach_program(sock) -> None:
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_DETACH_FILTER, 0)
+    except OSError:
+        # Nothing attached
+        pass
+
+
+def attach_program(sock, option: int, program: Iterable[tuple]) -> None:
+    """Attach a classic BPF ``program`` (a list of instruction tuples) with ``option``."""
+    program = list(program)
+    filters = (_SockFilter * len(program))(*program)
+    # struct sock_fprog { unsigned short len; struct sock_filter *filter; }
+    fprog = struct.pack("HP", len(program), ctypes.addressof(filters))
+    sock.setsockopt(socket.SOL_SOCKET, option, fprog)
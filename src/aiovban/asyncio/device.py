@@ -1,9 +1,10 @@
 import logging
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Optional
 
 from .streams import (
     VBANIncomingStream,
+    VBANJitterBufferStream,
     VBANTextStream,
     VBANRTStream,
     VBANChatStream,
@@ -13,8 +14,10 @@ from .streams import (
 from .util import BackPressureStrategy
 from ..enums import VBANBaudRate
 from ..packet import VBANPacket
+from ..packet.headers import encode_streamname
 from ..packet.body.service import Ping
 from ..packet.headers.service import PingFunctions, ServiceType
+from ..packet.headers.subprotocol import VBANSubProtocolTypes
 
 logger = logging.getLogger(__package__)
 
@@ -28,6 +31,8 @@ class VBANDevice:
 
     _client: Any = None
     _streams: dict = field(default_factory=dict)
+    # Raw 16 byte stream name -> (name, incoming stream), so packets route without decoding
+    _routes: dict = field(default_factory=dict, repr=False)
 
     @staticmethod
     def _validate_port(port: int):
@@ -35,14 +40,31 @@ class VBANDevice:
         if not (0 <= port <= 65535):
             raise ValueError(f"Invalid port {port}: must be between 0 and 65535")
 
+    def _add_stream(self, stream_name: str, stream: VBANStream):
+        self._streams[stream_name] = stream
+        if isinstance(stream, VBANIncomingStream):
+            self._routes[encode_streamname(stream_name)] = (stream_name, stream)
+
+    def _route(self, packet: VBANPacket) -> Optional[VBANIncomingStream]:
+        route = self._routes.get(packet.raw_streamname)
+        if route is not None:
+            packet.streamname_hint, stream = route
+            return stream
+
+        # Unrouted (or oddly padded) names fall back to the decoded stream name
+        stream = self._streams.get(packet.header.streamname)
+        if isinstance(stream, VBANIncomingStream):
+            return stream
+        return None
+
     async def handle_packet(self, address, packet: VBANPacket):
         if self.handle_packet_nowait(address, packet):
             return
 
-        stream: VBANStream = self._streams.get(packet.header.streamname)
+        stream = self._route(packet)
         from ..packet.headers.service import VBANServiceHeader
 
-        if stream and isinstance(stream, VBANIncomingStream):
+        if stream:
             await stream.handle_packet(packet)
         elif isinstance(packet.header, VBANServiceHeader):
             if (
@@ -64,20 +86,51 @@ class VBANDevice:
                 logger.debug(packet.header)
 
     def handle_packet_nowait(self, address, packet: VBANPacket) -> bool:
-        stream: VBANStream = self._streams.get(packet.header.streamname)
-        if stream and isinstance(stream, VBANIncomingStream):
-            return stream.handle_packet_nowait(packet)
-        return False
+        """
+        Deliver ``packet`` without waiting. False only when ``handle_packet`` has work
+        left that may wait: a stream that refused it (BLOCK) or an identification
+        packet. Packets for streams nobody subscribed to are dropped here.
+        """
+        stream = self._route(packet) or self._unrouted_target(packet)
+        if stream is None:
+            return True
+        if stream is ServiceType.Identification:
+            return False
+        return stream.handle_packet_nowait(packet)
+
+    def wants_packet(self, packet: VBANPacket) -> bool:
+        """Whether ``handle_packet`` would do anything with ``packet``."""
+        return self._route(packet) is not None or self._unrouted_target(packet) is not None
+
+    def _unrouted_target(self, packet: VBANPacket):
+        # The service packets handle_packet acts on without a stream of their own
+        if packet.subprotocol != VBANSubProtocolTypes.SERVICE:
+            return None
+        service = packet.header.service
+        if service == ServiceType.Identification:
+            return service
+        if service == ServiceType.Chat_UTF8:
+            return self._streams.get("VBAN Chat")
+        return None
 
     def receive_stream(
-        self, stream_name: str, back_pressure_strategy=BackPressureStrategy.DROP
+        self,
+        stream_name: str,
+        back_pressure_strategy=BackPressureStrategy.DROP,
+        latency_ms: Optional[float] = None,
+        jitter_buffer_ms: Optional[float] = None,
     ):
-        stream = VBANIncomingStream(
-            stream_name,
+        options = dict(
             queue_size=self.default_stream_size,
             back_pressure_strategy=back_pressure_strategy,
+            latency_ms=latency_ms,
         )
-        self._streams[stream_name] = stream
+        if jitter_buffer_ms is not None:
+            # Reorder by framecount, waiting at most jitter_buffer_ms for missing frames
+            stream = VBANJitterBufferStream(stream_name, window_ms=jitter_buffer_ms, **options)
+        else:
+            stream = VBANIncomingStream(stream_name, **options)
+        self._add_stream(stream_name, stream)
         return stream
 
     async def send_stream(
@@ -85,6 +138,8 @@ class VBANDevice:
         stream_name: str,
         port: int = None,
         back_pressure_strategy=BackPressureStrategy.DROP,
+        batch_flush: bool = False,
+        dedicated_socket: bool = False,
     ):
         port = port or self.default_port
         self._validate_port(port)
@@ -92,9 +147,12 @@ class VBANDevice:
             stream_name,
             _client=self._client,
             back_pressure_strategy=back_pressure_strategy,
+            batch_flush=batch_flush,
+            # sendmmsg flushes need a connected socket
+            dedicated_socket=dedicated_socket or batch_flush,
         )
         await stream.connect(self.address, port)
-        self._streams[stream_name] = stream
+        self._add_stream(stream_name, stream)
         return stream
 
     async def text_stream(
@@ -107,7 +165,7 @@ class VBANDevice:
         self._validate_port(port)
         stream = VBANTextStream(stream_name, _client=self._client, baud_rate=baud_rate)
         await stream.connect(self.address, port)
-        self._streams[stream_name] = stream
+        self._add_stream(stream_name, stream)
         return stream
 
     async def rt_stream(
@@ -128,8 +186,8 @@ class VBANDevice:
 
         await stream.connect(self.address, self.default_port)
 
-        self._streams[stream.name] = stream
-        self._streams["Voicemeeter-RTP"] = stream  # Responses come to this stream
+        self._add_stream(stream.name, stream)
+        self._add_stream("Voicemeeter-RTP", stream)  # Responses come to this stream
         return stream
 
     async def chat_stream(
@@ -141,5 +199,5 @@ class VBANDevice:
         self._validate_port(port)
         stream = VBANChatStream(stream_name, _client=self._client)
         await stream.connect(self.address, port)
-        self._streams[stream_name] = stream
+        self._add_stream(stream_name, stream)
         return stream
@@ -0,0 +1,81 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger(__package__)
+
+
+@dataclass
+class VBANTransportPool:
+    """
+    Unconnected UDP sender sockets shared by every outgoing stream of a client.
+
+    One socket is opened per ``(family, local address)`` the first time it is needed
+    and every stream sending from there reuses it, passing the destination to
+    ``sendto``. Streams that want a connected socket of their own (e.g. for batched
+    ``sendmmsg`` flushes) opt out with ``dedicated_socket``.
+    """
+
+    _client: Any = None
+    _protocols: dict = field(default_factory=dict, repr=False)
+    _pending: dict = field(default_factory=dict, repr=False)
+
+    @staticmethod
+    async def _address_family(address: str, loop: asyncio.AbstractEventLoop) -> int:
+        try:
+            version = ipaddress.ip_address(address).version
+            return socket.AF_INET6 if version == 6 else socket.AF_INET
+        except ValueError:
+            # A host name, let the resolver decide
+            infos = await loop.getaddrinfo(address, None, type=socket.SOCK_DGRAM)
+            return infos[0][0]
+
+    async def acquire(
+        self, address: str, local_addr: Optional[tuple] = None, loop=None
+    ):
+        """Return the shared sender protocol able to reach ``address``, opening it if needed."""
+        loop = loop or asyncio.get_running_loop()
+        family = await self._address_family(address, loop)
+        key = (family, local_addr)
+
+        protocol = self._protocols.get(key)
+        if protocol is not None and protocol._transport is not None:
+            return protocol
+
+        # Concurrent first senders share one socket instead of racing to open several
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = loop.create_task(self._open(key, loop))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def _open(self, key: tuple, loop):
+        from .protocol import VBANSenderProtocol
+
+        family, local_addr = key
+        if local_addr is None:
+            local_addr = ("::", 0) if family == socket.AF_INET6 else ("0.0.0.0", 0)
+
+        _, protocol = await loop.create_datagram_endpoint(
+            lambda: VBANSenderProtocol(self._client),
+            local_addr=local_addr,
+            family=family,
+            allow_broadcast=True,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Opened shared sender socket for {key}")
+        self._protocols[key] = protocol
+        return protocol
+
+    def __len__(self):
+        return len(self._protocols)
+
+    def close(self):
+        for protocol in self._protocols.values():
+            if protocol._transport is not None:
+                protocol._transport.close()
+        self._protocols.clear()
@@ -5,6 +5,8 @@ from dataclasses import dataclass, field
 from typing import Any
 
 from . import AsyncVBANClient
+from .batch import DatagramBatch
+from .util import BackPressureQueue, BackPressureStrategy, SendBuffer
 from ..packet import VBANPacket
 from ..packet.headers import VBANHeaderException
 
@@ -40,15 +42,76 @@ class VBANBaseProtocol(asyncio.DatagramProtocol):
             self.done.set_result(exc)
 
 
+@dataclass
+class VBANSlowPath:
+    """
+    Ordered fallback for packets of one device that could not be handed off synchronously.
+
+    Packets wait in a bounded queue and a single worker task feeds them to
+    ``client.process_packet`` one at a time, so a stalled stream costs one task per
+    device instead of one per packet and packets are delivered in arrival order.
+    Once the queue is full further packets are dropped.
+    """
+
+    client: AsyncVBANClient
+    address: str
+    queue_size: int = 256
+    batch_size: int = 64
+    pending: int = field(default=0, init=False)
+    _queue: BackPressureQueue = field(default=None, init=False, repr=False)
+    _task: asyncio.Task = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._queue = BackPressureQueue(
+            self.queue_size,
+            queue_name=f"Slow path {self.address}",
+            back_pressure_strategy=BackPressureStrategy.DROP,
+        )
+
+    def submit(self, port: int, packet: VBANPacket) -> bool:
+        """Queue ``packet`` behind any earlier ones, False when it had to be dropped."""
+        if self._queue.full():
+            return False
+        self._queue.put_nowait((port, packet))
+        self.pending += 1
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return True
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            for port, packet in await queue.get_many(self.batch_size):
+                try:
+                    await self.client.process_packet(self.address, port, packet)
+                except Exception as e:
+                    if logger.isEnabledFor(logging.ERROR):
+                        logger.error(f"Unexpected error processing packet: {e}")
+                finally:
+                    self.pending -= 1
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
 @dataclass
 class VBANListenerProtocol(VBANBaseProtocol):
-    pending_tasks: set = field(default_factory=set, init=False)
+    slow_path_queue_size: int = 256
+    _slow_paths: dict = field(default_factory=dict, init=False, repr=False)
 
     def connection_made(self, transport):
         super().connection_made(transport)
         logger.info(f"Connection made to {transport}")
 
-    def datagram_received(self, data, addr):
+    def connection_lost(self, exc):
+        for slow_path in self._slow_paths.values():
+            slow_path.cancel()
+        self._slow_paths.clear()
+        super().connection_lost(exc)
+
+    def datagram_received(self, data, addr, timestamp: int = None):
         self.client.raw_packets_received += 1
         try:
             if self.client.quick_reject(addr[0]):
@@ -57,18 +120,27 @@ class VBANListenerProtocol(VBANBaseProtocol):
                 return
             if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Received packet from {addr[0]}")
-            packet = VBANPacket.unpack(data)
-
-            # Try to process synchronously first to avoid task overhead
-            if self.client.process_packet_nowait(addr[0], addr[1], packet):
+            packet = VBANPacket.unpack(data, timestamp, self.client.clock)
+
+            # Try to process synchronously first to avoid task overhead, unless
+            # earlier packets of this device are still waiting on the slow path.
+            # Only packets with something left to await are queued there
+            slow_path = self._slow_paths.get(addr[0])
+            if slow_path is None or not slow_path.pending:
+                if self.client.process_packet_nowait(addr[0], addr[1], packet):
+                    return
+            elif not self.client.wants_packet(addr[0], packet):
                 return
 
-            task = asyncio.create_task(
-                self.client.process_packet(addr[0], addr[1], packet)
-            )
-            # Track task and add callback to remove it when done
-            self.pending_tasks.add(task)
-            task.add_done_callback(self.pending_tasks.discard)
+            if slow_path is None:
+                slow_path = VBANSlowPath(self.client, addr[0], self.slow_path_queue_size)
+                self._slow_paths[addr[0]] = slow_path
+            if slow_path.submit(addr[1], packet):
+                self.client.slow_path_packets += 1
+            else:
+                self.client.slow_path_dropped += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Slow path for {addr[0]} full. Dropping packet")
         except (VBANHeaderException, ValueError) as e:
             if logger.isEnabledFor(logging.INFO):
                 logger.info(f"Error unpacking packet: {e}")
@@ -76,22 +148,45 @@ class VBANListenerProtocol(VBANBaseProtocol):
             if logger.isEnabledFor(logging.ERROR):
                 logger.error(f"Unexpected error processing packet: {e}")
 
+    def datagrams_received(self, datagrams):
+        """Handle a batch of ``(data, addr)`` pairs drained in a single loop wakeup."""
+        datagram_received = self.datagram_received
+        for data, addr in datagrams:
+            datagram_received(data, addr)
+
+    def timestamped_datagrams_received(self, datagrams):
+        """Like ``datagrams_received``, for ``(data, addr, arrival time_ns)`` triples."""
+        datagram_received = self.datagram_received
+        for data, addr, timestamp in datagrams:
+            datagram_received(data, addr, timestamp)
+
 
 @dataclass
 class VBANSenderProtocol(VBANBaseProtocol):
     _transport: Any = field(default=None, init=False)
+    _is_connected: bool = field(default=False, init=False)
+    _send_buffer: SendBuffer = field(default_factory=SendBuffer, init=False, repr=False)
 
     def connection_made(self, transport):
         super().connection_made(transport)
         self._transport = transport
+        self._is_connected = transport.get_extra_info("peername") is not None
         logger.info(f"Connection made to {transport.get_extra_info('peername')}")
 
     def send_packet(self, data: VBANPacket, addr):
         if self._transport:
             # If transport is connected, addr MUST be None
             # Otherwise we get Errno 56 on some platforms (like macOS)
-            is_connected = self._transport.get_extra_info("peername") is not None
-            self._transport.sendto(data.pack(), None if is_connected else addr)
+            self._transport.sendto(
+                self._send_buffer.pack(data), None if self._is_connected else addr
+            )
+            self._send_buffer.recycle(self._transport)
+
+    def flush_batch(self, batch: DatagramBatch, addr) -> int:
+        """Send every datagram packed into ``batch``, with one sendmmsg where possible."""
+        if not self._transport:
+            return 0
+        return batch.flush(self._transport, None if self._is_connected else addr)
 
     def connection_lost(self, exc):
         self._transport = None
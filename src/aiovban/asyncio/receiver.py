@@ -0,0 +1,384 @@
+import asyncio
+import errno
+import logging
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+
+logger = logging.getLogger(__package__)
+
+SO_TIMESTAMPNS = getattr(socket, "SO_TIMESTAMPNS", 35)
+# struct timespec { time_t tv_sec; long tv_nsec; }
+_TIMESPEC = struct.Struct("@qq")
+
+
+def kernel_timestamps_available() -> bool:
+    return sys.platform.startswith("linux") and hasattr(socket, "CMSG_SPACE")
+
+
+def enable_kernel_timestamps(sock: socket.socket) -> bool:
+    """Ask the kernel to attach an arrival time to every datagram, False if it won't."""
+    if not kernel_timestamps_available():
+        return False
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPNS, 1)
+    except OSError as e:
+        logger.warning(f"Could not enable kernel receive timestamps: {e}")
+        return False
+    return True
+
+
+class VBANBatchDatagramTransport(asyncio.DatagramTransport):
+    """
+    Receive engine that drains every queued datagram on each readiness wakeup.
+
+    The default asyncio transport calls ``datagram_received`` once per packet, one
+    event loop iteration each. This transport registers the non-blocking socket with
+    ``loop.add_reader`` and pulls up to ``batch_size`` datagrams per wakeup with
+    ``recvfrom_into`` over a preallocated buffer. Packets from rejected addresses are
+    discarded before being copied out of that buffer; the rest are handed to the
+    protocol's ``datagrams_received`` as one batch.
+
+    With ``kernel_timestamps`` (Linux, SO_TIMESTAMPNS) datagrams are read with
+    ``recvmsg_into`` and handed to ``timestamped_datagrams_received`` stamped with
+    the time the kernel received them, excluding any event loop delay.
+
+    Requires an event loop with ``add_reader`` support (selector loops and uvloop).
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        sock: socket.socket,
+        protocol: Any,
+        client: Any,
+        batch_size: int = 64,
+        buffer_size: int = 65535,
+        kernel_timestamps: bool = False,
+    ):
+        super().__init__(extra={"socket": sock, "sockname": sock.getsockname()})
+        self._loop = loop
+        self._sock = sock
+        self._protocol = protocol
+        self._client = client
+        self.batch_size = batch_size
+        self._view = memoryview(bytearray(buffer_size))
+        self._closing = False
+
+        self.kernel_timestamps = kernel_timestamps
+        self._ancillary_size = socket.CMSG_SPACE(_TIMESPEC.size) if kernel_timestamps else 0
+
+        self.batches_received = 0
+        self.max_batch_size = 0
+
+    @classmethod
+    async def create(
+        cls,
+        protocol_factory,
+        client: Any,
+        local_addr: tuple,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        receive_buffer_size: Optional[int] = None,
+        reuse_port: bool = False,
+        kernel_timestamps: bool = False,
+        **kwargs,
+    ):
+        """Bind a broadcast-capable UDP socket and start draining it, like ``create_datagram_endpoint``."""
+        loop = loop or asyncio.get_running_loop()
+        host, port = local_addr
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+        family, _, proto, _, sockaddr = infos[0]
+
+        sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            if reuse_port:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            if receive_buffer_size:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer_size)
+            sock.setblocking(False)
+            sock.bind(sockaddr)
+            kernel_timestamps = kernel_timestamps and enable_kernel_timestamps(sock)
+
+            protocol = protocol_factory()
+            transport = cls(
+                loop, sock, protocol, client, kernel_timestamps=kernel_timestamps, **kwargs
+            )
+            transport._start()
+        except BaseException:
+            sock.close()
+            raise
+
+        protocol.connection_made(transport)
+        return transport, protocol
+
+    def _start(self):
+        read_ready = self._read_ready_timestamped if self.kernel_timestamps else self._read_ready
+        self._loop.add_reader(self._sock.fileno(), read_ready)
+
+    def _recv_timestamped(self, buffer, shift: int) -> tuple:
+        """
+        ``recvmsg_into`` one datagram, returning ``(nbytes, addr, arrival time_ns)``.
+        The kernel stamps on the wall clock, ``shift`` (the client clock's
+        ``wall_clock_shift()``) moves that onto the packet clock.
+        """
+        nbytes, ancdata, _, addr = self._sock.recvmsg_into([buffer], self._ancillary_size)
+        for level, kind, data in ancdata:
+            if level == socket.SOL_SOCKET and kind == SO_TIMESTAMPNS:
+                seconds, nanoseconds = _TIMESPEC.unpack_from(data)
+                return nbytes, addr, seconds * 1_000_000_000 + nanoseconds + shift
+        return nbytes, addr, time.time_ns() + shift
+
+    def _read_ready_timestamped(self):
+        recv = self._recv_timestamped
+        client = self._client
+        shift = client.clock.wall_clock_shift()
+        view = self._view
+        quick_reject = client.quick_reject
+        batch = []
+
+        for _ in range(self.batch_size):
+            try:
+                nbytes, addr, timestamp = recv(view, shift)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                self._protocol.error_received(exc)
+                break
+
+            if quick_reject(addr[0]):
+                client.raw_packets_received += 1
+                continue
+            batch.append((view[:nbytes].tobytes(), addr, timestamp))
+
+        if batch:
+            self.batches_received += 1
+            if len(batch) > self.max_batch_size:
+                self.max_batch_size = len(batch)
+            self._protocol.timestamped_datagrams_received(batch)
+
+    def _read_ready(self):
+        recvfrom_into = self._sock.recvfrom_into
+        view = self._view
+        client = self._client
+        quick_reject = client.quick_reject
+        batch = []
+
+        for _ in range(self.batch_size):
+            try:
+                nbytes, addr = recvfrom_into(view)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                self._protocol.error_received(exc)
+                break
+
+            if quick_reject(addr[0]):
+                client.raw_packets_received += 1
+                continue
+            batch.append((view[:nbytes].tobytes(), addr))
+
+        if batch:
+            self.batches_received += 1
+            if len(batch) > self.max_batch_size:
+                self.max_batch_size = len(batch)
+            self._protocol.datagrams_received(batch)
+
+    def sendto(self, data, addr=None):
+        if self._closing:
+            return
+        try:
+            self._sock.sendto(data, addr)
+        except (BlockingIOError, InterruptedError):
+            # The send buffer is full, UDP would drop it further down anyway
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Send buffer full, dropping datagram to {addr}")
+        except OSError as exc:
+            self._protocol.error_received(exc)
+
+    def get_write_buffer_size(self):
+        # Datagrams are never queued, callers may reuse their buffers immediately
+        return 0
+
+    def is_closing(self):
+        return self._closing
+
+    def close(self):
+        if self._closing:
+            return
+        self._closing = True
+        self._stop()
+        self._sock.close()
+        self._loop.call_soon(self._protocol.connection_lost, None)
+
+    def _stop(self):
+        self._loop.remove_reader(self._sock.fileno())
+
+    def abort(self):
+        self.close()
+
+
+class VBANThreadedDatagramTransport(VBANBatchDatagramTransport):
+    """
+    Receive engine that reads the socket on a dedicated OS thread.
+
+    The thread waits for readiness itself and ``recvfrom_into``s every datagram into
+    the next slot of a preallocated ring, stamping it on the client's clock on
+    arrival (or with the kernel's arrival time, see ``kernel_timestamps``). Only the
+    thread advances the ring head and only the event loop advances the tail, so no
+    lock is needed. The loop is woken with ``call_soon_threadsafe`` once per burst,
+    not once per datagram, and hands everything received since to the protocol's
+    ``timestamped_datagrams_received``.
+
+    When the loop falls a full ring behind, new datagrams are counted in
+    ``packets_dropped`` and discarded. Receive errors (e.g. ECONNREFUSED left by a
+    send on the shared socket) are reported through ``error_received`` and the
+    thread carries on, it only exits once the transport is closed. Works on any
+    event loop, ``add_reader`` is not needed.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        sock: socket.socket,
+        protocol: Any,
+        client: Any,
+        batch_size: int = 64,
+        ring_size: int = 256,
+        slot_size: int = 2048,
+        kernel_timestamps: bool = False,
+    ):
+        super().__init__(
+            loop,
+            sock,
+            protocol,
+            client,
+            batch_size,
+            buffer_size=slot_size,
+            kernel_timestamps=kernel_timestamps,
+        )
+        self.ring_size = ring_size
+        self.slot_size = slot_size
+        self._ring = memoryview(bytearray(ring_size * slot_size))
+        self._entries = [None] * ring_size
+        self._head = 0  # Next slot to fill, receive thread only
+        self._tail = 0  # Next slot to hand off, event loop only
+        self._wakeup_pending = False
+        self._rejected = 0
+        self._rejected_reported = 0
+        self._thread = None
+
+        self.packets_dropped = 0
+
+    def _start(self):
+        self._thread = threading.Thread(
+            target=self._receive_loop, name="aiovban-receiver", daemon=True
+        )
+        self._thread.start()
+
+    def _stop(self):
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(1.0)
+
+    def _receive_loop(self):
+        selector = selectors.DefaultSelector()
+        selector.register(self._sock, selectors.EVENT_READ)
+        try:
+            while not self._closing:
+                if selector.select(0.1):
+                    self._receive_ready()
+        except (OSError, ValueError) as exc:
+            if not self._closing:
+                self._call_soon(self._protocol.error_received, exc)
+        finally:
+            selector.close()
+
+    def _receive_ready(self):
+        recvfrom_into = self._sock.recvfrom_into
+        recv_timestamped = self._recv_timestamped if self.kernel_timestamps else None
+        packet_clock = self._client.clock
+        shift = packet_clock.wall_clock_shift() if recv_timestamped is not None else 0
+        now_ns = packet_clock.now_ns
+        quick_reject = self._client.quick_reject
+        ring = self._ring
+        entries = self._entries
+        ring_size = self.ring_size
+        slot_size = self.slot_size
+        received = 0
+
+        for _ in range(self.batch_size):
+            head = self._head
+            index = head % ring_size
+            if head - self._tail >= ring_size:
+                # The loop is a full ring behind, drop into the scratch buffer
+                target = self._view
+            else:
+                target = ring[index * slot_size : (index + 1) * slot_size]
+
+            try:
+                if recv_timestamped is not None:
+                    nbytes, addr, timestamp = recv_timestamped(target, shift)
+                else:
+                    nbytes, addr = recvfrom_into(target)
+                    timestamp = now_ns()
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                if self._closing or exc.errno == errno.EBADF:
+                    raise
+                # E.g. ECONNREFUSED from an earlier send, report it and keep receiving
+                self._call_soon(self._protocol.error_received, exc)
+                break
+
+            if quick_reject(addr[0]):
+                self._rejected += 1
+                continue
+            if target is self._view:
+                self.packets_dropped += 1
+                continue
+
+            entries[index] = (nbytes, addr, timestamp)
+            self._head = head + 1
+            received += 1
+
+        if (received or self._rejected != self._rejected_reported) and not self._wakeup_pending:
+            self._wakeup_pending = True
+            self._call_soon(self._drain)
+
+    def _call_soon(self, callback, *args):
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Loop closed underneath us
+            self._closing = True
+
+    def _drain(self):
+        # Clear first, anything received from here on schedules another drain
+        self._wakeup_pending = False
+        rejected = self._rejected
+        self._client.raw_packets_received += rejected - self._rejected_reported
+        self._rejected_reported = rejected
+
+        head = self._head
+        ring = self._ring
+        entries = self._entries
+        ring_size = self.ring_size
+        slot_size = self.slot_size
+        batch = []
+        for position in range(self._tail, head):
+            nbytes, addr, timestamp = entries[position % ring_size]
+            start = (position % ring_size) * slot_size
+            # Copy out, the slot is reused as soon as the tail moves past it
+            batch.append((ring[start : start + nbytes].tobytes(), addr, timestamp))
+        self._tail = head
+
+        if batch and not self._closing:
+            self.batches_received += 1
+            if len(batch) > self.max_batch_size:
+                self.max_batch_size = len(batch)
+            self._protocol.timestamped_datagrams_received(batch)
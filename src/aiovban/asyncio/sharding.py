@@ -0,0 +1,277 @@
+import asyncio
+import ipaddress
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from . import AsyncVBANClient
+from .bpf import (
+    SO_ATTACH_REUSEPORT_CBPF,
+    attach_program,
+    bpf_available,
+    reuseport_steering_program,
+)
+
+logger = logging.getLogger(__package__)
+
+
+def merge_statistics(stats: list) -> dict:
+    """Sum numeric counters across workers, merging nested dicts key by key."""
+    merged = {}
+    for entry in stats:
+        for key, value in entry.items():
+            if isinstance(value, dict):
+                merged[key] = merge_statistics([merged.get(key, {}), value])
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+@dataclass(frozen=True)
+class VBANShard:
+    """What a worker process is told about its place in a VBANShardedListener."""
+
+    index: int
+    workers: int
+    assignments: dict = field(default_factory=dict)
+    steered: bool = True
+
+    def owner(self, address: str) -> Optional[int]:
+        """
+        Index of the worker that receives datagrams from ``address``, or None when
+        the kernel decides (no BPF steering, or a non IPv4 source).
+        """
+        if address in self.assignments:
+            return self.assignments[address]
+        if not self.steered:
+            return None
+        try:
+            return int(ipaddress.IPv4Address(address)) % self.workers
+        except ValueError:
+            return None
+
+    def owns(self, address: str) -> bool:
+        owner = self.owner(address)
+        return owner is None or owner == self.index
+
+
+class _ForeignSourceFilter:
+    """
+    ``quick_reject`` of a steered worker, also rejecting sources another worker owns.
+
+    Broadcast and multicast datagrams reach every socket of the reuseport group, the
+    steering program only picks a socket for unicast. Each worker still sees (and
+    counts) its copy; ``dropped`` is taken off its statistics again.
+    """
+
+    def __init__(self, shard: VBANShard, quick_reject: Callable[[str], bool]):
+        self._owner = shard.owner
+        self._index = shard.index
+        self._quick_reject = quick_reject
+        self.dropped = 0
+
+    def __call__(self, address: str) -> bool:
+        owner = self._owner(address)
+        if owner is not None and owner != self._index:
+            self.dropped += 1
+            return True
+        return self._quick_reject(address)
+
+
+def _worker_statistics(client, foreign: Optional[_ForeignSourceFilter]) -> dict:
+    stats = client.statistics()
+    if foreign is not None:
+        stats["raw_packets_received"] -= foreign.dropped
+        stats["foreign_packets_dropped"] = foreign.dropped
+    return stats
+
+
+async def _worker_main(shard, address, port, setup, listen_options, events, stop, interval):
+    client = AsyncVBANClient()
+    done = await client.listen(address, port, reuse_port=True, **listen_options)
+
+    foreign = None
+    if shard.steered:
+        program = reuseport_steering_program(shard.assignments, shard.workers)
+        sock = client._transport.get_extra_info("socket")
+        attach_program(sock, SO_ATTACH_REUSEPORT_CBPF, program)
+        foreign = _ForeignSourceFilter(shard, client.quick_reject)
+        client.quick_reject = foreign
+    events.put(("ready", shard.index, os.getpid()))
+
+    setup_task = asyncio.ensure_future(setup(client, shard))
+    try:
+        while not stop.is_set() and not done.done():
+            if setup_task.done() and setup_task.exception():
+                raise setup_task.exception()
+            await asyncio.sleep(interval)
+            events.put(("stats", shard.index, _worker_statistics(client, foreign)))
+    finally:
+        setup_task.cancel()
+        client.close()
+
+
+def _run_worker(shard, address, port, setup, listen_options, events, stop, interval):
+    try:
+        asyncio.run(
+            _worker_main(shard, address, port, setup, listen_options, events, stop, interval)
+        )
+    except Exception as e:
+        events.put(("error", shard.index, repr(e)))
+        raise
+
+
+@dataclass
+class VBANShardedListener:
+    """
+    Supervisor that spreads the receive load of one port over several processes.
+
+    Every worker runs its own AsyncVBANClient bound to ``port`` with SO_REUSEPORT.
+    Workers are started one at a time so the N-th worker is socket N of the reuseport
+    group; on Linux a classic BPF program then steers datagrams by IPv4 source
+    address, sending ``assignments`` (device address -> worker index) to their
+    worker and every other source to ``address % workers``. Elsewhere the kernel
+    hashes each datagram itself and every worker should register every device.
+
+    Linux delivers broadcast and multicast datagrams to every socket of the group,
+    the steering program is not consulted for them. Steered workers therefore drop
+    datagrams from sources they don't own, and those copies are left out of their
+    ``raw_packets_received`` (they are reported as ``foreign_packets_dropped``).
+    Unsteered workers can't tell, each of them handles and counts its own copy.
+
+    ``setup(client, shard)`` must be a picklable coroutine function. It runs in each
+    worker, registers the devices and streams that worker owns (see
+    ``VBANShard.owns``) and may keep running to consume them. Worker statistics are
+    reported every ``stats_interval`` seconds and merged by ``statistics()``.
+    """
+
+    setup: Callable[[AsyncVBANClient, VBANShard], Awaitable[Any]]
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    address: str = "0.0.0.0"
+    port: int = 6980
+    assignments: dict = field(default_factory=dict)
+    stats_interval: float = 1.0
+    listen_options: dict = field(default_factory=dict)
+    start_method: Optional[str] = None
+    startup_timeout: float = 10.0
+
+    _processes: list = field(default_factory=list, init=False, repr=False)
+    _events: Any = field(default=None, init=False, repr=False)
+    _stop: Any = field(default=None, init=False, repr=False)
+    _worker_stats: dict = field(default_factory=dict, init=False, repr=False)
+
+    def assign(self, address: str, worker: int):
+        if not 0 <= worker < self.workers:
+            raise ValueError(f"Invalid worker {worker}: must be between 0 and {self.workers - 1}")
+        self.assignments[address] = worker
+
+    def shard(self, index: int) -> VBANShard:
+        return VBANShard(
+            index=index,
+            workers=self.workers,
+            assignments=dict(self.assignments),
+            steered=bpf_available() and self._ipv4_listener(),
+        )
+
+    def _ipv4_listener(self) -> bool:
+        # The steering program reads the IPv4 source address
+        try:
+            return ipaddress.ip_address(self.address).version == 4
+        except ValueError:
+            return True
+
+    def start(self):
+        """Start the workers, returning once every one of them has bound the port."""
+        context = multiprocessing.get_context(self.start_method)
+        self._events = context.Queue()
+        self._stop = context.Event()
+
+        for index in range(self.workers):
+            process = context.Process(
+                target=_run_worker,
+                args=(
+                    self.shard(index),
+                    self.address,
+                    self.port,
+                    self.setup,
+                    self.listen_options,
+                    self._events,
+                    self._stop,
+                    self.stats_interval,
+                ),
+                name=f"aiovban-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+            # Bind order decides the socket index, wait before starting the next one
+            self._wait_ready(index)
+
+    def _wait_ready(self, index: int):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            try:
+                event = self._events.get(timeout=0.1)
+            except queue.Empty:
+                if not self._processes[index].is_alive():
+                    break
+                continue
+            if event[0] == "ready" and event[1] == index:
+                logger.info(f"Worker {index} listening in process {event[2]}")
+                return
+            if event[0] == "error" and event[1] == index:
+                self.stop()
+                raise RuntimeError(f"Worker {index} failed to start: {event[2]}")
+            self._handle_event(event)
+
+        self.stop()
+        raise RuntimeError(f"Worker {index} did not start")
+
+    def _handle_event(self, event):
+        kind, index, payload = event
+        if kind == "stats":
+            self._worker_stats[index] = payload
+        elif kind == "error":
+            logger.error(f"Worker {index} failed: {payload}")
+
+    def collect(self):
+        """Drain pending worker reports without blocking."""
+        if self._events is None:
+            return
+        while True:
+            try:
+                self._handle_event(self._events.get_nowait())
+            except queue.Empty:
+                return
+
+    def statistics(self) -> dict:
+        """Merged counters of all workers, with the latest report of each under ``workers``."""
+        self.collect()
+        stats = merge_statistics(list(self._worker_stats.values()))
+        stats["workers"] = dict(self._worker_stats)
+        return stats
+
+    def stop(self, timeout: float = 5.0):
+        if self._stop is not None:
+            self._stop.set()
+        deadline = time.monotonic() + timeout
+        for process in self._processes:
+            # Keep draining, a worker can't exit while its queue feeder is blocked
+            while process.is_alive() and time.monotonic() < deadline:
+                self.collect()
+                process.join(0.05)
+            if process.is_alive():
+                process.terminate()
+        self.collect()
+        self._processes.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
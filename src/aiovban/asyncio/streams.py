@@ -1,44 +1,235 @@
 import asyncio
+import heapq
 import logging
+import copy
+import dataclasses
+import math
+import struct
+import time
 from asyncio import Queue
 from dataclasses import dataclass, field
 from optparse import Option
-from typing import Any, Union, Optional
-
-from .util import BackPressureQueue, BackPressureStrategy
+from typing import Any, AsyncIterator, Callable, List, Union, Optional
+
+from .batch import DatagramBatch
+from .util import (
+    BackPressureQueue,
+    BackPressureStrategy,
+    SendBuffer,
+    BatchStatistics,
+    StreamStatistics,
+    FRAMECOUNT_MODULO,
+)
 from ..enums import VBANBaudRate
-from ..packet import VBANPacket
-from ..packet.body import Utf8StringBody
+from ..packet import VBANPacket, VBANHeader
+from ..packet.body import Utf8StringBody, _write_into
+from ..packet.headers.audio import VBANAudioHeader
 from ..packet.headers.service import VBANServiceHeader, ServiceType
+from ..packet.headers.subprotocol import VBANSubProtocolTypes
 from ..packet.headers.text import VBANTextHeader
+from ..util.clock import WALL_CLOCK, PacketClock
 
 
 logger = logging.getLogger(__package__)
 
+_FRAMECOUNT = struct.Struct("<I")
+_FRAMECOUNT_OFFSET = 24
+
 
 @dataclass
 class VBANStream:
     name: str
 
 
+@dataclass
+class PacketHandler:
+    """
+    A synchronous consumer called straight from the receive path.
+
+    Per-packet handlers run inline in ``datagram_received``; batch handlers get a
+    list of every packet received in one loop iteration. With ``budget_ms`` each call
+    is timed and a per-packet handler that overruns its budget is moved off the
+    receive path: from then on it is called from a ``call_soon`` callback after the
+    burst, so one slow consumer can't delay the datagrams behind it. Exceptions are
+    logged and counted, never propagated into the receiver. A ``consume`` handler
+    takes the packets for itself, they are no longer queued for ``get_packet``.
+    """
+
+    callback: Callable
+    batch: bool = False
+    budget_ms: Optional[float] = None
+    consume: bool = False
+    deferred: bool = False
+
+    calls: int = 0
+    errors: int = 0
+    overruns: int = 0
+    _pending: list = field(default_factory=list, repr=False)
+
+    def __call__(self, arg):
+        self.calls += 1
+        if self.budget_ms is None:
+            try:
+                self.callback(arg)
+            except Exception as e:
+                self._error(e)
+            return
+
+        start = time.perf_counter()
+        try:
+            self.callback(arg)
+        except Exception as e:
+            self._error(e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > self.budget_ms:
+            self.overruns += 1
+            if not self.deferred and not self.batch:
+                self.deferred = True
+                logger.warning(
+                    f"Handler {self.callback!r} took {elapsed_ms:.2f}ms "
+                    f"(budget {self.budget_ms}ms), deferring it off the receive path"
+                )
+
+    def _error(self, e: Exception):
+        self.errors += 1
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error(f"Error in packet handler {self.callback!r}: {e}")
+
+
 @dataclass
 class VBANIncomingStream(VBANStream):
     queue_size: int = 100
     back_pressure_strategy: BackPressureStrategy = BackPressureStrategy.DROP
+    # Latency budget in milliseconds. Audio streams size their queue to hold this
+    # much audio once the first packet shows the format, DEADLINE also drops by age.
+    latency_ms: Optional[float] = None
     _queue: BackPressureQueue = field(default=None, init=False)
+    _sized_for_latency: bool = field(default=True, init=False, repr=False)
+    _handlers: list = field(default_factory=list, init=False, repr=False)
+    # A handler consumes the packets, don't queue them
+    _bypass_queue: bool = field(default=False, init=False, repr=False)
+    _flush_scheduled: bool = field(default=False, init=False, repr=False)
+    stats: StreamStatistics = field(default_factory=StreamStatistics, init=False, repr=False)
 
     def __post_init__(self):
         self._queue = BackPressureQueue(
             queue_size=self.queue_size,
             queue_name=self.name,
             back_pressure_strategy=self.back_pressure_strategy,
+            max_age_ms=self.latency_ms,
         )
+        self._sized_for_latency = self.latency_ms is None
+
+    def size_for_latency(self, header: VBANAudioHeader) -> int:
+        """Resize the queue to hold ``latency_ms`` of audio in ``header``'s format."""
+        size = max(1, math.ceil(self.latency_ms / header.frame_duration_ms))
+        self.queue_size = self._queue.queue_size = size
+        self._sized_for_latency = True
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sized {self.name} to {size} packets for {self.latency_ms}ms")
+        return size
+
+    def _size_from_packet(self, packet: VBANPacket):
+        header = packet.header
+        if isinstance(header, VBANAudioHeader):
+            self.size_for_latency(header)
+        else:
+            # Not audio, the packet count stays the bound
+            self._sized_for_latency = True
+
+    def _track(self, packet: VBANPacket):
+        stats = self.stats
+        if stats.frame_period_ns is None:
+            # Only audio has a fixed frame period, leave other headers undecoded
+            stats.frame_period_ns = (
+                round(packet.header.frame_duration_ms * 1e6)
+                if packet.subprotocol == VBANSubProtocolTypes.AUDIO
+                else 0
+            )
+        stats.record(packet.framecount, packet.timestamp)
+
+    def statistics(self) -> dict:
+        """Sequence and jitter counters plus the queue depth and queue drops."""
+        stats = self.stats.snapshot()
+        stats["queued"] = self._queue.qsize()
+        stats["queue_dropped"] = self._queue.dropped
+        return stats
+
+    def add_handler(
+        self,
+        callback: Callable[[VBANPacket], Any],
+        budget_ms: Optional[float] = None,
+        batch: bool = False,
+        consume: bool = False,
+    ) -> PacketHandler:
+        """
+        Deliver packets to ``callback`` synchronously as they arrive. With ``batch``
+        it is called with a list of the packets of each receive burst. Packets are
+        still queued for ``get_packet`` as well, unless ``consume`` is set: while a
+        consuming handler is registered packets bypass the queue.
+        """
+        handler = PacketHandler(callback, batch=batch, budget_ms=budget_ms, consume=consume)
+        self._handlers.append(handler)
+        self._bypass_queue = self._bypass_queue or consume
+        return handler
+
+    def remove_handler(self, handler: Union[PacketHandler, Callable]):
+        self._handlers = [
+            # Bound methods are recreated on access, compare callbacks by equality
+            h for h in self._handlers if h is not handler and h.callback != handler
+        ]
+        self._bypass_queue = any(h.consume for h in self._handlers)
+
+    def _dispatch(self, packet: VBANPacket):
+        deferred = False
+        for handler in self._handlers:
+            if handler.batch or handler.deferred:
+                handler._pending.append(packet)
+                deferred = True
+            else:
+                handler(packet)
+
+        if deferred and not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_handlers)
+
+    def _flush_handlers(self):
+        self._flush_scheduled = False
+        for handler in self._handlers:
+            pending = handler._pending
+            if not pending:
+                continue
+            handler._pending = []
+            if handler.batch:
+                handler(pending)
+            else:
+                for packet in pending:
+                    handler(packet)
 
     async def handle_packet(self, packet: VBANPacket):
+        self._track(packet)
+        if not self._sized_for_latency:
+            self._size_from_packet(packet)
+        if self._handlers:
+            self._dispatch(packet)
+            if self._bypass_queue:
+                return
         await self._queue.put(packet)
 
     def handle_packet_nowait(self, packet: VBANPacket) -> bool:
-        return self._queue.put_nowait(packet)
+        if not self._sized_for_latency:
+            self._size_from_packet(packet)
+        if self._bypass_queue:
+            self._track(packet)
+            self._dispatch(packet)
+            return True
+        # Refused packets are retried through handle_packet, count and dispatch them there
+        if self._queue.put_nowait(packet):
+            self._track(packet)
+            if self._handlers:
+                self._dispatch(packet)
+            return True
+        return False
 
     async def get_packet(self) -> VBANPacket:
         return await self._queue.get()
@@ -49,21 +240,248 @@ class VBANIncomingStream(VBANStream):
         except asyncio.QueueEmpty:
             return None
 
+    async def get_packets(
+        self, max_count: int = 64, timeout: Optional[float] = None
+    ) -> List[VBANPacket]:
+        """
+        Wait for at least one packet, then return everything queued up to
+        ``max_count``. Returns an empty list if ``timeout`` seconds pass first.
+        """
+        packets = self._queue.get_many_nowait(max_count)
+        if packets:
+            return packets
+        if timeout is None:
+            return await self._queue.get_many(max_count)
+        try:
+            return await asyncio.wait_for(self._queue.get_many(max_count), timeout)
+        except asyncio.TimeoutError:
+            return []
+
+    def get_packets_nowait(self, max_count: int = 64) -> List[VBANPacket]:
+        return self._queue.get_many_nowait(max_count)
+
+    async def batches(self, max_count: int = 64) -> AsyncIterator[List[VBANPacket]]:
+        """
+        Yield every packet queued at each wakeup as one list::
+
+            async for packets in stream.batches():
+                for packet in packets:
+                    ...
+        """
+        get_many = self._queue.get_many
+        while True:
+            yield await get_many(max_count)
+
+
+@dataclass
+class VBANFrameGap:
+    """
+    Stands in for ``count`` consecutive frames, starting at ``framecount``, that a
+    VBANJitterBufferStream gave up waiting for. ``header`` is the header of the next
+    frame that did arrive, so consumers know the format to conceal the gap in.
+    """
+
+    framecount: int
+    count: int
+    header: VBANHeader
+    timestamp: int = 0
+    clock: PacketClock = field(default=WALL_CLOCK, repr=False, compare=False)
+
+    @property
+    def samples(self) -> int:
+        """Samples per channel missing, for audio headers."""
+        return self.count * self.header.samples_per_frame
+
+
+@dataclass
+class VBANJitterBufferStream(VBANIncomingStream):
+    """
+    Incoming stream that releases packets in framecount order.
+
+    Packets that arrive ahead of a missing frame are held until the frame shows up
+    or the first held packet has waited for the current window; the missing frames
+    are then released as a single VBANFrameGap and anything arriving for them later
+    is dropped as late. The window follows ``jitter_multiplier`` times the measured
+    interarrival jitter between ``min_window_ms`` and ``window_ms``, so in order
+    packets on a clean link pass straight through.
+
+    The buffer absorbs back pressure itself: released packets are put with
+    ``put_nowait`` and a full BLOCK queue drops them.
+    """
+
+    window_ms: float = 40.0
+    min_window_ms: float = 5.0
+    jitter_multiplier: float = 3.0
+    gaps: int = field(default=0, init=False)
+    late_dropped: int = field(default=0, init=False)
+    _next: Optional[int] = field(default=None, init=False, repr=False)
+    # Extended (unwrapped) framecounts of held packets
+    _heap: list = field(default_factory=list, init=False, repr=False)
+    _held: dict = field(default_factory=dict, init=False, repr=False)
+    _timer: Any = field(default=None, init=False, repr=False)
+
+    @property
+    def current_window_ms(self) -> float:
+        window = self.jitter_multiplier * self.stats.jitter_ns / 1e6
+        return min(self.window_ms, max(self.min_window_ms, window))
+
+    def statistics(self) -> dict:
+        stats = super().statistics()
+        stats["held"] = len(self._held)
+        stats["gap_frames"] = self.gaps
+        stats["late_dropped"] = self.late_dropped
+        stats["window_ms"] = self.current_window_ms
+        return stats
+
+    async def handle_packet(self, packet: VBANPacket):
+        self.handle_packet_nowait(packet)
+
+    def handle_packet_nowait(self, packet: VBANPacket) -> bool:
+        if not self._sized_for_latency:
+            self._size_from_packet(packet)
+        self._track(packet)
+
+        framecount = packet.framecount
+        if self._next is None:
+            self._next = framecount
+
+        offset = (framecount - self._next) % FRAMECOUNT_MODULO
+        if offset >= FRAMECOUNT_MODULO // 2:
+            self.late_dropped += 1
+            return True
+        if offset > self.stats.max_dropout:
+            # The sender restarted, nothing held can still be played in order
+            self.flush()
+            self._next = framecount
+            offset = 0
+
+        extended = self._next + offset
+        if extended in self._held:
+            return True
+        self._held[extended] = packet
+        heapq.heappush(self._heap, extended)
+        self._release(packet.clock.now_ns())
+        return True
+
+    def _emit(self, item):
+        if self._handlers:
+            self._dispatch(item)
+        if not self._bypass_queue:
+            self._queue.put_nowait(item)
+
+    def _release(self, now: int):
+        heap, held = self._heap, self._held
+        window_ns = self.current_window_ms * 1e6
+        while heap:
+            extended = heap[0]
+            packet = held[extended]
+            if extended != self._next:
+                if packet.timestamp + window_ns > now:
+                    break
+                self._emit_gap(extended, packet)
+            heapq.heappop(heap)
+            del held[extended]
+            self._emit(packet)
+            self._next = extended + 1
+
+        if heap and self._timer is None:
+            delay = (held[heap[0]].timestamp + window_ns - now) / 1e9
+            self._timer = asyncio.get_running_loop().call_later(
+                max(delay, 0), self._on_timer
+            )
+
+    def _emit_gap(self, extended: int, packet: VBANPacket):
+        count = extended - self._next
+        self.gaps += count
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{self.name}: gave up on {count} frames from {self._next}")
+        self._emit(
+            VBANFrameGap(
+                self._next % FRAMECOUNT_MODULO,
+                count,
+                packet.header,
+                packet.timestamp,
+                packet.clock,
+            )
+        )
+
+    def _on_timer(self):
+        self._timer = None
+        if self._heap:
+            # Held packets are aged on the clock they were stamped on
+            self._release(self._held[self._heap[0]].clock.now_ns())
+
+    def flush(self):
+        """Release everything held right away, with gaps for whatever is missing."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._heap:
+            extended = heapq.heappop(self._heap)
+            packet = self._held.pop(extended)
+            if extended != self._next:
+                self._emit_gap(extended, packet)
+            self._emit(packet)
+            self._next = extended + 1
+
 
 @dataclass
 class VBANOutgoingStream(VBANStream):
     _client: Any = None
     _address: str = None
     _port: int = None
+    # Open a connected socket for this stream instead of the client's shared pool
+    dedicated_socket: bool = field(default=False, kw_only=True)
     _framecounter: int = field(default=0, init=False)
     _protocol: Any = field(default=None, init=False)
+    _send_buffer: SendBuffer = field(default_factory=SendBuffer, init=False, repr=False)
+    _header_template: VBANHeader = field(default=None, init=False, repr=False)
+    _header_bytes: bytearray = field(default=None, init=False, repr=False)
+
+    def set_header_template(self, header: VBANHeader) -> VBANHeader:
+        """
+        Pre-encode a copy of ``header`` as this stream's header template and return
+        the copy. Packets built on ``header_template()`` skip header encoding: each
+        send writes its framecount into the cached bytes, the template header itself
+        is never modified (its framecount stays as set). Set a new template to change
+        any other field.
+        """
+        self._header_template = copy.copy(header)
+        self._header_bytes = bytearray(header.pack())
+        return self._header_template
+
+    def header_template(self, **fields) -> VBANHeader:
+        """
+        Return the stream's header template, or a new header with ``fields`` changed
+        (e.g. ``samples_per_frame`` for a short final chunk), which is encoded as usual.
+        """
+        if self._header_template is None:
+            raise ValueError(f"No header template set for stream {self.name}")
+        if fields:
+            return dataclasses.replace(self._header_template, **fields)
+        return self._header_template
+
+    def _next_datagram(self, packet: VBANPacket):
+        """Number ``packet`` with the next framecount and return what to pack for it."""
+        self._framecounter += 1
+        if packet.header is self._header_template:
+            _FRAMECOUNT.pack_into(self._header_bytes, _FRAMECOUNT_OFFSET, self._framecounter)
+            return _TemplateDatagram(self._header_bytes, packet.body)
+        packet.header.framecount = self._framecounter
+        return packet
 
     async def connect(self, address, port, loop=None):
         loop = loop or asyncio.get_running_loop()
         self._address = address
         self._port = port
+        from .pool import VBANTransportPool
         from .protocol import VBANSenderProtocol
 
+        pool = getattr(self._client, "transport_pool", None)
+        if isinstance(pool, VBANTransportPool) and not self.dedicated_socket:
+            self._protocol = await pool.acquire(address, loop=loop)
+            return
+
         _, self._protocol = await loop.create_datagram_endpoint(
             lambda: VBANSenderProtocol(self._client),
             remote_addr=(address, port),
@@ -73,18 +491,43 @@ class VBANOutgoingStream(VBANStream):
         self.send_packet_sync(packet)
 
     def send_packet_sync(self, packet: VBANPacket):
-        self._framecounter += 1
-        packet.header.framecount = self._framecounter
+        datagram = self._next_datagram(packet)
         if self._protocol:
-            self._protocol.send_packet(packet, (self._address, self._port))
+            self._protocol.send_packet(datagram, (self._address, self._port))
+
+
+class _TemplateDatagram:
+    """
+    A packet on its stream's header template as it is sent: the template bytes
+    carrying this send's framecount, then the body. Must be packed right away,
+    the next send patches the same bytes.
+    """
+
+    __slots__ = ("header", "body")
+
+    def __init__(self, header: bytearray, body):
+        self.header = header
+        self.body = body
+
+    def pack(self) -> bytes:
+        return bytes(self.header) + self.body.pack()
+
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        size = _write_into(buffer, offset, self.header)
+        return size + self.body.pack_into(buffer, offset + size)
 
 
 @dataclass
 class BufferedVBANOutgoingStream(VBANOutgoingStream):
     buffer_size: int = 100
     back_pressure_strategy: BackPressureStrategy = BackPressureStrategy.BLOCK
+    # Drain everything queued on each wakeup and send it with one sendmmsg
+    batch_flush: bool = False
+    max_batch_size: int = 64
 
     _buffer: BackPressureQueue = field(default=None, init=False)
+    _batch: DatagramBatch = field(default=None, init=False, repr=False)
+    batch_stats: BatchStatistics = field(default_factory=BatchStatistics, init=False)
     send_task: Any = field(default=None, init=False)
 
     def __post_init__(self):
@@ -93,6 +536,8 @@ class BufferedVBANOutgoingStream(VBANOutgoingStream):
             queue_name=self.name,
             back_pressure_strategy=self.back_pressure_strategy,
         )
+        if self.batch_flush:
+            self._batch = DatagramBatch(capacity=self.max_batch_size)
 
     async def connect(self, address, port, loop=None):
         await super().connect(address, port, loop)
@@ -117,19 +562,56 @@ class BufferedVBANOutgoingStream(VBANOutgoingStream):
         """Thread-safely put a packet into the outgoing buffer."""
         self._buffer.put_threadsafe(packet, loop)
 
+    def send_packets_threadsafe(self, packets: list, loop: asyncio.AbstractEventLoop) -> None:
+        """Thread-safely put several packets into the outgoing buffer with one wakeup."""
+        self._buffer.put_many_threadsafe(packets, loop)
+
     async def send_buffered_packets(self):
+        if self.batch_flush:
+            await self._send_batched_packets()
+            return
+
         while True:
             packet = await self._buffer.get()
             self.send_packet_sync(packet)
 
+    async def _send_batched_packets(self):
+        batch = self._batch
+        addr = (self._address, self._port)
+        while True:
+            packet = await self._buffer.get()
+            batch_size = 0
+            while packet is not None:
+                batch.add(self._next_datagram(packet))
+                batch_size += 1
+                if batch.full():
+                    self._flush_batch(batch, addr)
+                try:
+                    packet = self._buffer.get_nowait()
+                except asyncio.QueueEmpty:
+                    packet = None
+            self._flush_batch(batch, addr)
+            self.batch_stats.record(batch_size)
+
+    def _flush_batch(self, batch: DatagramBatch, addr):
+        if self._protocol:
+            self._protocol.flush_batch(batch, addr)
+        else:
+            batch.flush(None)
+
 
 @dataclass
 class VBANTextStream(VBANOutgoingStream):
     baud_rate: VBANBaudRate = VBANBaudRate.RATE_256000
 
     async def send_text(self, text: str):
-        header = VBANTextHeader(baud=self.baud_rate, streamname=self.name)
-        await self.send_packet(VBANPacket(header, Utf8StringBody(text)))
+        if self._header_template is None:
+            self.set_header_template(
+                VBANTextHeader(baud=self.baud_rate, streamname=self.name)
+            )
+        await self.send_packet(
+            VBANPacket(self.header_template(), Utf8StringBody(text))
+        )
 
 
 @dataclass
@@ -163,7 +645,9 @@ class VBANRTStream(VBANOutgoingStream, VBANIncomingStream):
         self._framecounter += 1
         packet = VBANPacket(rt_header)
         packet.header.framecount = self._framecounter
-        self._client.send_datagram(packet.pack(), (self._address, self._port))
+        self._client.send_datagram(
+            packet, (self._address, self._port), send_buffer=self._send_buffer
+        )
         timer_task = asyncio.create_task(start_expiry_timer())
         self.pending_timers.add(timer_task)
         timer_task.add_done_callback(self.pending_timers.discard)
@@ -214,17 +698,21 @@ class VBANRTStream(VBANOutgoingStream, VBANIncomingStream):
 class VBANChatStream(VBANOutgoingStream, VBANIncomingStream):
     def send_packet_sync(self, packet: VBANPacket):
         """Send via the client's listener socket so our source port is the listening port."""
-        self._framecounter += 1
-        packet.header.framecount = self._framecounter
-        self._client.send_datagram(packet.pack(), (self._address, self._port))
+        self._client.send_datagram(
+            self._next_datagram(packet),
+            (self._address, self._port),
+            send_buffer=self._send_buffer,
+        )
 
     async def send_chat(self, text: str):
         """Send a chat message using the Chat_UTF8 service."""
-        header = VBANServiceHeader(
-            service=ServiceType.Chat_UTF8,
-            streamname=self.name,
+        if self._header_template is None:
+            self.set_header_template(
+                VBANServiceHeader(service=ServiceType.Chat_UTF8, streamname=self.name)
+            )
+        await self.send_packet(
+            VBANPacket(self.header_template(), Utf8StringBody(text + "\0"))
         )
-        await self.send_packet(VBANPacket(header, Utf8StringBody(text + "\0")))
 
     async def get_chat(self) -> str:
         """Wait for and return the next chat message text."""
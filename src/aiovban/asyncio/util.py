@@ -1,8 +1,13 @@
 import asyncio
 import logging
+import struct
+import threading
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Any
+from itertools import islice
+from typing import Any, Optional, Sequence, Union
+
 
 logger = logging.getLogger(__package__ + "." + __name__)
 
@@ -14,92 +19,536 @@ class BackPressureStrategy(Enum):
     BLOCK = auto()  # Block until there is space in the queue
     RAISE = auto()  # Raise an exception when queue is full
     POP = auto()  # Pop the oldest item from the queue
+    DEADLINE = auto()  # Drop packets older than the queue's latency budget
 
 
 @dataclass
 class BackPressureQueue:
+    """
+    Bounded FIFO for packets with a fixed back pressure strategy.
+
+    Items live in a deque, so dropping the oldest is O(1) and no lock is needed. The
+    strategy is bound once at construction: ``put_nowait`` and ``put`` are the
+    handlers for it, not a per call dispatch. Only a consumer waiting on an empty
+    queue (or, with BLOCK, a producer waiting on a full one) allocates a future.
+
+    ``put_nowait`` returns False only when BLOCK would have to wait. DROP discards
+    the new item, POP discards the oldest, DRAIN_OLDEST discards the oldest half and
+    RAISE raises ``asyncio.QueueFull``; all of them return True otherwise.
+
+    DEADLINE bounds the queue by age instead: packets whose ``timestamp`` (on the
+    packet's ``clock``) is more than ``max_age_ms`` old are dropped from the head on
+    every put and get, and ``queue_size`` only caps it by dropping the oldest.
+    Packets without a timestamp are stamped when they are put. Every discarded item
+    is counted in ``dropped``.
+    """
+
     queue_size: int
     queue_name: str = "Queue"
     back_pressure_strategy: BackPressureStrategy = field(
         default=BackPressureStrategy.DROP
     )
-    _mutex: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
-    _queue: asyncio.Queue = field(default_factory=asyncio.Queue, init=False)
+    max_age_ms: Optional[float] = None
+    dropped: int = field(default=0, init=False)
+    _items: deque = field(default_factory=deque, init=False, repr=False)
+    _getters: deque = field(default_factory=deque, init=False, repr=False)
+    _putters: deque = field(default_factory=deque, init=False, repr=False)
+    _submitter: "ThreadsafeSubmitter" = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
-        self._queue = asyncio.Queue(self.queue_size)
+        strategy = self.back_pressure_strategy
+        self.put_nowait = {
+            BackPressureStrategy.DROP: self._put_drop,
+            BackPressureStrategy.DRAIN_OLDEST: self._put_drain_oldest,
+            BackPressureStrategy.BLOCK: self._put_block_nowait,
+            BackPressureStrategy.RAISE: self._put_raise,
+            BackPressureStrategy.POP: self._put_pop,
+            BackPressureStrategy.DEADLINE: self._put_deadline,
+        }[strategy]
+        if strategy == BackPressureStrategy.BLOCK:
+            self.put = self._put_blocking
+            self.put_many = self._put_many_blocking
+        elif strategy == BackPressureStrategy.DEADLINE:
+            if self.max_age_ms is None:
+                raise ValueError("DEADLINE back pressure needs max_age_ms")
+            self.get = self._get_deadline
+            self.get_nowait = self._get_deadline_nowait
+            self.get_many_nowait = self._get_many_deadline_nowait
+
+    def __len__(self):
+        return len(self._items)
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.queue_size
+
+    @staticmethod
+    def _wakeup(waiters: deque, count: int = 1):
+        while waiters and count > 0:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
+    # Strategy handlers, one of these is bound as put_nowait
+
+    def _put_drop(self, packet: Any) -> bool:
+        items = self._items
+        if len(items) >= self.queue_size:
+            self.dropped += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{self.queue_name} full. Dropping item")
+            return True
+        items.append(packet)
+        if self._getters:
+            self._wakeup(self._getters)
+        return True
+
+    def _put_raise(self, packet: Any) -> bool:
+        items = self._items
+        if len(items) >= self.queue_size:
+            raise asyncio.QueueFull
+        items.append(packet)
+        if self._getters:
+            self._wakeup(self._getters)
+        return True
+
+    def _put_pop(self, packet: Any) -> bool:
+        items = self._items
+        if len(items) >= self.queue_size:
+            items.popleft()
+            self.dropped += 1
+        items.append(packet)
+        if self._getters:
+            self._wakeup(self._getters)
+        return True
+
+    def _put_drain_oldest(self, packet: Any) -> bool:
+        items = self._items
+        if len(items) >= self.queue_size:
+            self._drain_queue()
+        items.append(packet)
+        if self._getters:
+            self._wakeup(self._getters)
+        return True
+
+    def _put_block_nowait(self, packet: Any) -> bool:
+        items = self._items
+        if len(items) >= self.queue_size:
+            return False
+        items.append(packet)
+        if self._getters:
+            self._wakeup(self._getters)
+        return True
+
+    def _put_deadline(self, packet: Any) -> bool:
+        now = packet.clock.now_ns()
+        if not packet.timestamp:
+            packet.timestamp = now
+        items = self._items
+        if items:
+            self._expire(now)
+            if len(items) >= self.queue_size:
+                items.popleft()
+                self.dropped += 1
+        items.append(packet)
+        if self._getters:
+            self._wakeup(self._getters)
+        return True
+
+    def _expire(self, now: int = None):
+        items = self._items
+        if not items:
+            return
+        cutoff = (now or items[0].clock.now_ns()) - int(self.max_age_ms * 1_000_000)
+        while items and items[0].timestamp < cutoff:
+            items.popleft()
+            self.dropped += 1
+
+    def _drain_queue(self):
+        items = self._items
+        count = min(int(self.queue_size / 2), len(items))
+        for i in range(count):
+            items.popleft()
+        self.dropped += count
 
     async def put(self, packet: Any):
-        if self.back_pressure_strategy in [
-            BackPressureStrategy.DROP,
-            BackPressureStrategy.RAISE,
-        ]:
-            if self.put_nowait(packet):
-                return
+        self.put_nowait(packet)
 
-        if self._queue.full():
-            if self.back_pressure_strategy == BackPressureStrategy.DRAIN_OLDEST:
-                await self._drain_queue()
-            elif self.back_pressure_strategy == BackPressureStrategy.POP:
-                # logger.debug(f"{self.queue_name} full. Dropping item")
-                self._queue.get_nowait()
+    async def _put_blocking(self, packet: Any):
+        while len(self._items) >= self.queue_size:
+            await self._wait(self._putters)
+        self._put_block_nowait(packet)
 
-        await self._queue.put(packet)
+    def put_many_nowait(self, packets: Sequence) -> int:
+        """
+        Put a batch of items, applying the strategy as if they were put one by one.
+        Returns how many were taken, which is less than ``len(packets)`` only when
+        BLOCK runs out of space. RAISE takes what fits, then raises QueueFull.
+        """
+        items = self._items
+        count = len(packets)
+        # size_for_latency may have shrunk the queue below what it holds
+        space = max(0, self.queue_size - len(items))
+        strategy = self.back_pressure_strategy
+
+        if strategy == BackPressureStrategy.DEADLINE:
+            for packet in packets:
+                self._put_deadline(packet)
+        elif count <= space:
+            items.extend(packets)
+        elif strategy == BackPressureStrategy.DROP:
+            items.extend(islice(packets, space))
+            self.dropped += count - space
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{self.queue_name} full. Dropping {count - space} items")
+        elif strategy == BackPressureStrategy.POP:
+            items.extend(packets)
+            overflow = len(items) - self.queue_size
+            for i in range(overflow):
+                items.popleft()
+            self.dropped += overflow
+        elif strategy in (BackPressureStrategy.BLOCK, BackPressureStrategy.RAISE):
+            count = space
+            items.extend(islice(packets, count))
+        else:
+            for packet in packets:
+                self.put_nowait(packet)
+
+        if self._getters and items:
+            self._wakeup(self._getters, len(items))
+        if count < len(packets) and strategy == BackPressureStrategy.RAISE:
+            # The items that fit are in, like put_nowait raising on the first that didn't
+            raise asyncio.QueueFull
+        return count
+
+    async def put_many(self, packets: Sequence):
+        self.put_many_nowait(packets)
+
+    async def _put_many_blocking(self, packets: Sequence):
+        while packets:
+            while len(self._items) >= self.queue_size:
+                await self._wait(self._putters)
+            packets = packets[self.put_many_nowait(packets) :]
+
+    def submitter(self, loop: asyncio.AbstractEventLoop) -> "ThreadsafeSubmitter":
+        """The channel other threads use to put into this queue, owned by ``loop``."""
+        submitter = self._submitter
+        if submitter is None or submitter.loop is not loop:
+            submitter = self._submitter = ThreadsafeSubmitter(self, loop)
+        return submitter
 
     def put_threadsafe(self, packet: Any, loop: asyncio.AbstractEventLoop) -> None:
         """
         Thread-safe method to put an item in the queue from a background thread.
-        This correctly utilizes asyncio.run_coroutine_threadsafe.
+        Items submitted while the loop is busy are put as one batch, see
+        ThreadsafeSubmitter.
         """
-        asyncio.run_coroutine_threadsafe(self.put(packet), loop)
+        self.submitter(loop).submit(packet)
 
-    def put_nowait(self, packet: Any) -> bool:
-        """
-        Attempt to put an item in the queue without blocking.
-        Returns True if successful, False if the queue is full or strategy requires blocking/draining.
-        This method is strictly for same-thread operations.
-        """
-        if self.back_pressure_strategy in [
-            BackPressureStrategy.DROP,
-            BackPressureStrategy.RAISE,
-        ]:
+    def put_many_threadsafe(self, packets: Sequence, loop: asyncio.AbstractEventLoop) -> None:
+        self.submitter(loop).submit_many(packets)
+
+    async def _wait(self, waiters: deque):
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            waiter.cancel()
             try:
-                self._queue.put_nowait(packet)
-                return True
-            except asyncio.QueueFull:
-                if self.back_pressure_strategy == BackPressureStrategy.RAISE:
-                    raise asyncio.QueueFull
-                else:
-                    if logger.isEnabledFor(logging.DEBUG):
-                        logger.debug(f"{self.queue_name} full. Dropping item")
-                    return True
+                waiters.remove(waiter)
+            except ValueError:
+                # Already woken, pass the wakeup on so it isn't lost
+                self._wakeup(waiters)
+            raise
 
-        if not self._queue.full():
-            self._queue.put_nowait(packet)
-            return True
+    async def get(self):
+        items = self._items
+        while not items:
+            await self._wait(self._getters)
+        item = items.popleft()
+        if self._putters:
+            self._wakeup(self._putters)
+        return item
 
-        if self.back_pressure_strategy == BackPressureStrategy.POP:
-            try:
-                self._queue.get_nowait()
-            except asyncio.QueueEmpty:
-                pass
-            self._queue.put_nowait(packet)
-            return True
+    def get_nowait(self):
+        items = self._items
+        if not items:
+            raise asyncio.QueueEmpty
+        item = items.popleft()
+        if self._putters:
+            self._wakeup(self._putters)
+        return item
 
-        return False
+    def get_many_nowait(self, max_count: int) -> list:
+        """Take up to ``max_count`` items without waiting, possibly none."""
+        items = self._items
+        count = min(max_count, len(items))
+        if count == len(items):
+            batch = list(items)
+            items.clear()
+        else:
+            popleft = items.popleft
+            batch = [popleft() for i in range(count)]
+        if batch and self._putters:
+            self._wakeup(self._putters, len(batch))
+        return batch
 
-    async def _drain_queue(self):
-        # Leveraging the mutex to ensure that we don't have multiple drain operations happening at the same time
-        async with self._mutex:
-            for i in range(int(self.queue_size / 2)):
-                try:
-                    self._queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    logger.debug(f"{self.queue_name} empty")
-        # logger.debug(f"Drained {int(self.queue_size / 2)} items from {self.queue_name}")
+    async def _get_deadline(self):
+        while True:
+            self._expire()
+            if self._items:
+                return BackPressureQueue.get_nowait(self)
+            await self._wait(self._getters)
 
-    async def get(self):
-        return await self._queue.get()
+    def _get_deadline_nowait(self):
+        self._expire()
+        return BackPressureQueue.get_nowait(self)
 
-    def get_nowait(self):
-        return self._queue.get_nowait()
+    def _get_many_deadline_nowait(self, max_count: int) -> list:
+        self._expire()
+        return BackPressureQueue.get_many_nowait(self, max_count)
+
+    async def get_many(self, max_count: int) -> list:
+        """Wait for at least one item, then take up to ``max_count``."""
+        while True:
+            while not self._items:
+                await self._wait(self._getters)
+            # DEADLINE may expire everything that woke us
+            batch = self.get_many_nowait(max_count)
+            if batch:
+                return batch
+
+
+class ThreadsafeSubmitter:
+    """
+    Cross-thread channel into a BackPressureQueue that wakes the loop once per batch.
+
+    Producer threads append to a pending deque and only schedule a flush with
+    ``call_soon_threadsafe`` when none is already scheduled; the flush moves
+    everything pending into the queue with ``put_many_nowait``. A producer that
+    outpaces a busy loop therefore costs one wakeup per loop iteration, not one
+    coroutine, future and wakeup per packet. With BLOCK, whatever does not fit waits
+    in a backlog (in order) instead of blocking the producer.
+    """
+
+    def __init__(self, queue: BackPressureQueue, loop: asyncio.AbstractEventLoop):
+        self.queue = queue
+        self.loop = loop
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._backlog = None
+
+        self.submitted = 0
+        self.wakeups = 0
+
+    def submit(self, item: Any) -> None:
+        self._pending.append(item)
+        self.submitted += 1
+        self._schedule()
+
+    def submit_many(self, items: Sequence) -> None:
+        self._pending.extend(items)
+        self.submitted += len(items)
+        self._schedule()
+
+    def _schedule(self):
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.wakeups += 1
+        self.loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self):
+        # Clear first, anything submitted from here on schedules another flush
+        with self._lock:
+            self._scheduled = False
+        pending = self._pending
+        batch = [pending.popleft() for i in range(len(pending))]
+        if not batch:
+            return
+        if self._backlog is not None:
+            self._backlog.extend(batch)
+            return
+
+        try:
+            taken = self.queue.put_many_nowait(batch)
+        except asyncio.QueueFull:
+            # RAISE queued what fit, the rest is dropped
+            taken = len(batch)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{self.queue.queue_name} full. Dropping items")
+        if taken < len(batch):
+            self._backlog = batch[taken:]
+            self.loop.create_task(self._drain_backlog())
+
+    async def _drain_backlog(self):
+        try:
+            while self._backlog:
+                batch, self._backlog = self._backlog, []
+                await self.queue.put_many(batch)
+        finally:
+            self._backlog = None
+
+
+class SendBuffer:
+    """
+    Reusable datagram buffer that outgoing packets are packed into in place.
+
+    asyncio transports copy data they cannot send immediately, but other loops
+    (uvloop) may keep a reference to it instead. ``recycle`` therefore only keeps
+    the buffer when the transport has nothing queued, otherwise it starts a new one.
+    """
+
+    def __init__(self, size: int = None):
+        from ..packet import VBAN_PROTOCOL_MAX_SIZE
+
+        self.size = size or VBAN_PROTOCOL_MAX_SIZE
+        self._view = memoryview(bytearray(self.size))
+
+    def pack(self, packet) -> Union[memoryview, bytes]:
+        """Pack ``packet`` into the buffer and return a view of the packed bytes."""
+        try:
+            return self._view[: packet.pack_into(self._view)]
+        except (ValueError, struct.error):
+            # Oversized packet, fall back to a one-off allocation
+            return packet.pack()
+
+    def recycle(self, transport) -> None:
+        if transport is not None and transport.get_write_buffer_size() > 0:
+            self._view = memoryview(bytearray(self.size))
+
+
+@dataclass
+class BatchStatistics:
+    """Running batch-size counters for batched senders and receivers."""
+
+    batches: int = 0
+    packets: int = 0
+    max_batch_size: int = 0
+
+    def record(self, batch_size: int):
+        self.batches += 1
+        self.packets += batch_size
+        if batch_size > self.max_batch_size:
+            self.max_batch_size = batch_size
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.packets / self.batches if self.batches else 0.0
+
+
+FRAMECOUNT_MODULO = 1 << 32
+
+
+@dataclass
+class StreamStatistics:
+    """
+    Sequence and timing counters for one incoming stream, fed from the framecount
+    and arrival timestamp of every packet in O(1).
+
+    ``lost`` is the net number of missing framecounts: a gap counts every skipped
+    frame, a reordered packet that fills it later takes one back. Packets within
+    ``reorder_window`` frames behind the newest are told apart as ``reordered`` or
+    ``duplicates``; older ones are ``late``. A jump of more than ``max_dropout``
+    frames either way is taken as a sender restart and resynchronises.
+
+    ``jitter_ns`` is the RFC 3550 interarrival jitter, with the send time of each
+    packet derived from its framecount and ``frame_period_ns``. It stays 0 for
+    streams without a fixed frame period.
+    """
+
+    reorder_window: int = 64
+    max_dropout: int = 3000
+    frame_period_ns: Optional[int] = None
+    received: int = 0
+    lost: int = 0
+    reordered: int = 0
+    duplicates: int = 0
+    late: int = 0
+    resyncs: int = 0
+    jitter_ns: float = 0.0
+    _highest: Optional[int] = field(default=None, repr=False)
+    # Bit k set: framecount _highest - k has been seen
+    _seen: int = field(default=0, repr=False)
+    _last_framecount: int = field(default=0, repr=False)
+    _last_arrival: int = field(default=0, repr=False)
+
+    def record(self, framecount: int, arrival_ns: int) -> int:
+        """
+        Count one packet. Returns how many frames it advanced the newest framecount
+        by, skipped ones included: 0 for anything behind it, 1 after a restart.
+        """
+        self.received += 1
+        highest = self._highest
+        restarted = highest is None
+        advance = 0
+        if restarted:
+            advance = 1
+            self._restart(framecount)
+        else:
+            ahead = (framecount - highest) % FRAMECOUNT_MODULO
+            if ahead == 0:
+                self.duplicates += 1
+            elif ahead < FRAMECOUNT_MODULO // 2:
+                if ahead > self.max_dropout:
+                    restarted = True
+                    advance = 1
+                    self._restart(framecount)
+                else:
+                    advance = ahead
+                    self.lost += ahead - 1
+                    self._highest = framecount
+                    if ahead < self.reorder_window:
+                        self._seen = (self._seen << ahead | 1) & ((1 << self.reorder_window) - 1)
+                    else:
+                        self._seen = 1
+            else:
+                behind = FRAMECOUNT_MODULO - ahead
+                if behind > self.max_dropout:
+                    restarted = True
+                    advance = 1
+                    self._restart(framecount)
+                elif behind >= self.reorder_window:
+                    self.late += 1
+                elif self._seen >> behind & 1:
+                    self.duplicates += 1
+                else:
+                    self._seen |= 1 << behind
+                    self.reordered += 1
+                    self.lost -= 1
+
+        if self.frame_period_ns and not restarted:
+            frames = (framecount - self._last_framecount) % FRAMECOUNT_MODULO
+            if frames >= FRAMECOUNT_MODULO // 2:
+                frames -= FRAMECOUNT_MODULO
+            deviation = abs(arrival_ns - self._last_arrival - frames * self.frame_period_ns)
+            self.jitter_ns += (deviation - self.jitter_ns) / 16
+        self._last_framecount = framecount
+        self._last_arrival = arrival_ns
+        return advance
+
+    def _restart(self, framecount: int):
+        if self._highest is not None:
+            self.resyncs += 1
+        self._highest = framecount
+        self._seen = 1
+
+    def snapshot(self) -> dict:
+        return {
+            "received": self.received,
+            "lost": self.lost,
+            "reordered": self.reordered,
+            "duplicates": self.duplicates,
+            "late": self.late,
+            "resyncs": self.resyncs,
+            "jitter_ms": self.jitter_ns / 1e6,
+        }
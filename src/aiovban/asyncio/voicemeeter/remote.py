@@ -1,5 +1,6 @@
 import logging
 import asyncio
+import struct
 import time
 from typing import Callable, List, Optional, Any, Dict
 from enum import Enum
@@ -32,6 +33,9 @@ class VoicemeeterRemote:
     and the state updating in this object.
     """
 
+    # RT packets are applied from the receive path, slower callbacks get deferred
+    rt_handler_budget_ms: float = 5.0
+
     def __init__(self, device: VBANDevice, command_stream: str = "Command1", offline_timeout: float = 5.0):
         self.device = device
         self.command_stream_name = command_stream
@@ -51,8 +55,16 @@ class VoicemeeterRemote:
         self.recorder_paused = False
 
         self._cmd_framecount = 0
+        # Commands differ only in framecount, encode the header once
+        self._command_header = bytearray(
+            VBANTextHeader(
+                baud=VBANBaudRate.RATE_256000,
+                streamname=self.command_stream_name,
+                stream_type=VBANTextStreamType.UTF_8,
+            ).pack()
+        )
         self._callbacks: List[Callable[['VoicemeeterRemote', RTPacketBodyType0], None]] = []
-        self._worker_task: Optional[asyncio.Task] = None
+        self._rt_stream = None
         self._type1_renewal_task: Optional[asyncio.Task] = None
 
     @property
@@ -81,44 +93,40 @@ class VoicemeeterRemote:
         return self._all_buses[:phys + virt]
 
     async def start(self):
-        """Start the background worker to drain RT packets."""
-        if self._worker_task:
+        """Start applying RT packets as they arrive."""
+        if self._rt_stream:
             return
 
         rt_stream = self.device._streams.get("Voicemeeter-RTP")
         if not rt_stream:
             rt_stream = await self.device.rt_stream(update_interval=0xFF)
 
-        self._worker_task = asyncio.create_task(self._worker(rt_stream))
+        # RT packets only update in-memory state, apply them straight from the receiver.
+        # The stream still queues them, so get_packet() on it keeps working
+        rt_stream.add_handler(self._handle_rt_packet, budget_ms=self.rt_handler_budget_ms)
+        self._rt_stream = rt_stream
         self._type1_renewal_task = asyncio.create_task(self._renew_type1(rt_stream))
-        logger.info(f"VoicemeeterRemote worker started for {self.device.address}")
+        logger.info(f"VoicemeeterRemote started for {self.device.address}")
 
     async def stop(self):
-        """Stop the background worker."""
-        for task in (self._worker_task, self._type1_renewal_task):
-            if task:
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-        self._worker_task = None
-        self._type1_renewal_task = None
-
-    async def _worker(self, stream):
-        """Background loop to consume RT packets."""
-        while True:
+        """Stop applying RT packets."""
+        if self._rt_stream:
+            self._rt_stream.remove_handler(self._handle_rt_packet)
+            self._rt_stream = None
+        task = self._type1_renewal_task
+        if task:
+            task.cancel()
             try:
-                packet = await stream.get_packet()
-                if isinstance(packet.body, RTPacketBodyType0):
-                    self.apply_rt_packet(packet.body)
-                elif isinstance(packet.body, RTPacketBodyType1):
-                    self.apply_rt_packet_type1(packet.body)
+                await task
             except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in VoicemeeterRemote worker: {e}")
-                await asyncio.sleep(1)
+                pass
+        self._type1_renewal_task = None
+
+    def _handle_rt_packet(self, packet: VBANPacket):
+        if isinstance(packet.body, RTPacketBodyType0):
+            self.apply_rt_packet(packet.body)
+        elif isinstance(packet.body, RTPacketBodyType1):
+            self.apply_rt_packet_type1(packet.body)
 
     async def _renew_type1(self, rt_stream):
         """Periodically re-register for Type 1 RT packets."""
@@ -188,15 +196,10 @@ class VoicemeeterRemote:
 
     async def send_command(self, cmd: str):
         """Send a raw text command string to VoiceMeeter."""
-        header = VBANTextHeader(
-            baud=VBANBaudRate.RATE_256000,
-            streamname=self.command_stream_name,
-            stream_type=VBANTextStreamType.UTF_8
-        )
         self._cmd_framecount += 1
-        header.framecount = self._cmd_framecount
-        packet = VBANPacket(header, Utf8StringBody(cmd + "\0"))
-        self.device._client.send_datagram(packet.pack(), (self.device.address, self.device.default_port))
+        struct.pack_into("<I", self._command_header, 24, self._cmd_framecount)
+        datagram = bytes(self._command_header) + Utf8StringBody(cmd + "\0").pack()
+        self.device._client.send_datagram(datagram, (self.device.address, self.device.default_port))
         logger.debug(f"Voicemeeter command sent: {cmd}")
 
     def apply_rt_packet(self, body: RTPacketBodyType0):
@@ -0,0 +1,236 @@
+"""
+PCM sample conversion for VBAN audio bodies.
+
+Samples are little-endian and interleaved. Integer formats convert through a
+left-aligned ``int32`` representation (the sample in the top bits), which is exact
+and needs only shifts; floats are normalized to [-1.0, 1.0). BYTE8 is unsigned with
+silence at 0x80. BITS10 and BITS12 are taken as signed values in the low bits of
+their 16 and 32 bit containers.
+
+Everything except ``sample_view`` needs NumPy (``pip install aiovban[audio]``).
+Wherever the format allows, results are views over the caller's buffer rather
+than copies, so a received packet body can be used as a sample array directly::
+
+    frames = packet_samples(packet)  # (samples_per_frame, channels) view
+"""
+
+import sys
+from typing import List
+
+from .packet.headers.audio import BitResolution, VBANAudioHeader
+
+try:
+    import numpy
+except ImportError:  # Optional, see _require_numpy
+    numpy = None
+
+_DTYPES = {
+    BitResolution.BYTE8: "u1",
+    BitResolution.INT16: "<i2",
+    BitResolution.INT32: "<i4",
+    BitResolution.FLOAT32: "<f4",
+    BitResolution.FLOAT64: "<f8",
+    BitResolution.BITS12: "<i4",
+    BitResolution.BITS10: "<i2",
+}
+
+# How far each integer format is shifted up to fill an int32
+_SHIFTS = {
+    BitResolution.BYTE8: 24,
+    BitResolution.INT16: 16,
+    BitResolution.INT24: 8,
+    BitResolution.INT32: 0,
+    BitResolution.BITS12: 20,
+    BitResolution.BITS10: 22,
+}
+
+_FLOATS = (BitResolution.FLOAT32, BitResolution.FLOAT64)
+
+_CASTS = {
+    BitResolution.BYTE8: "B",
+    BitResolution.INT16: "h",
+    BitResolution.INT32: "i",
+    BitResolution.FLOAT32: "f",
+    BitResolution.FLOAT64: "d",
+    BitResolution.BITS12: "i",
+    BitResolution.BITS10: "h",
+}
+
+_INT32_SCALE = 2.0**31
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("aiovban.audio conversions need NumPy, install aiovban[audio]")
+
+
+def sample_view(data, bit_resolution: BitResolution) -> memoryview:
+    """
+    ``data`` as a flat memoryview of samples, without NumPy. Not available for
+    packed INT24, nor on big-endian hosts.
+    """
+    code = _CASTS.get(bit_resolution)
+    if code is None:
+        raise ValueError(f"{bit_resolution.name} samples can't be viewed directly")
+    if sys.byteorder != "little":
+        raise ValueError("Sample views need a little-endian host")
+    view = memoryview(data).cast("B")
+    usable = len(view) - len(view) % bit_resolution.byte_width
+    return view[:usable].cast(code)
+
+
+def dtype(bit_resolution: BitResolution):
+    """The NumPy dtype of one sample, ValueError for packed INT24."""
+    _require_numpy()
+    if bit_resolution not in _DTYPES:
+        raise ValueError(f"{bit_resolution.name} has no NumPy dtype")
+    return numpy.dtype(_DTYPES[bit_resolution])
+
+
+def samples(data, bit_resolution: BitResolution, channels: int = 1):
+    """
+    ``data`` as a ``(frames, channels)`` array of stored sample values. A view over
+    ``data`` except for INT24, which is unpacked to left-aligned int32.
+    """
+    _require_numpy()
+    if bit_resolution == BitResolution.INT24:
+        flat = _unpack_int24(data)
+    else:
+        width = bit_resolution.byte_width
+        count = len(memoryview(data).cast("B")) // width
+        flat = numpy.frombuffer(data, _DTYPES[bit_resolution], count)
+    return flat[: len(flat) - len(flat) % channels].reshape(-1, channels)
+
+
+def packet_samples(packet):
+    """The samples of an audio packet as a ``(samples_per_frame, channels)`` view of its body."""
+    header = packet.header
+    if not isinstance(header, VBANAudioHeader):
+        raise ValueError("Not an audio packet")
+    frames = samples(packet.body.pack(), header.bit_resolution, header.channels)
+    return frames[: header.samples_per_frame]
+
+
+def _unpack_int24(data):
+    raw = numpy.frombuffer(data, numpy.uint8)
+    raw = raw[: len(raw) - len(raw) % 3].reshape(-1, 3)
+    # Zero low byte + the three sample bytes reads as the left-aligned int32
+    padded = numpy.zeros((len(raw), 4), numpy.uint8)
+    padded[:, 1:] = raw
+    return padded.view("<i4").reshape(-1)
+
+
+def _pack_int24(left_aligned):
+    raw = numpy.ascontiguousarray(left_aligned, "<i4").view(numpy.uint8).reshape(-1, 4)
+    return numpy.ascontiguousarray(raw[:, 1:]).reshape(-1)
+
+
+def to_int32(data, bit_resolution: BitResolution):
+    """Flat left-aligned int32 samples of an integer format (exact) or a float one (scaled)."""
+    _require_numpy()
+    if bit_resolution == BitResolution.INT24:
+        return _unpack_int24(data)
+    flat = samples(data, bit_resolution).reshape(-1)
+    if bit_resolution in _FLOATS:
+        return from_float(flat, BitResolution.INT32)
+    if bit_resolution == BitResolution.BYTE8:
+        return (flat.astype(numpy.int32) - 128) << 24
+    shift = _SHIFTS[bit_resolution]
+    if shift == 0:
+        return flat
+    return flat.astype(numpy.int32) << shift
+
+
+def from_int32(left_aligned, bit_resolution: BitResolution):
+    """Narrow left-aligned int32 samples to ``bit_resolution``, truncating extra bits."""
+    _require_numpy()
+    left_aligned = numpy.asarray(left_aligned, numpy.int32).reshape(-1)
+    if bit_resolution in _FLOATS:
+        return (left_aligned / _INT32_SCALE).astype(_DTYPES[bit_resolution])
+    if bit_resolution == BitResolution.INT24:
+        return _pack_int24(left_aligned)
+    shifted = left_aligned >> _SHIFTS[bit_resolution]
+    if bit_resolution == BitResolution.BYTE8:
+        return (shifted + 128).astype(numpy.uint8)
+    return shifted.astype(_DTYPES[bit_resolution])
+
+
+def to_float(data, bit_resolution: BitResolution, float_dtype="float32"):
+    """Flat samples normalized to [-1.0, 1.0)."""
+    _require_numpy()
+    if bit_resolution in _FLOATS:
+        return samples(data, bit_resolution).reshape(-1).astype(float_dtype, copy=False)
+    return (to_int32(data, bit_resolution) / _INT32_SCALE).astype(float_dtype, copy=False)
+
+
+def from_float(values, bit_resolution: BitResolution):
+    """Normalized samples in ``bit_resolution``, clipping integers to their range."""
+    _require_numpy()
+    if bit_resolution in _FLOATS:
+        return numpy.asarray(values).reshape(-1).astype(_DTYPES[bit_resolution], copy=False)
+    # float32 can't hold 2**31 - 1, scale and clip in float64 so full scale doesn't wrap
+    values = numpy.asarray(values, numpy.float64).reshape(-1)
+    scaled = numpy.clip(values * _INT32_SCALE, -_INT32_SCALE, _INT32_SCALE - 1)
+    return from_int32(scaled.astype(numpy.int32), bit_resolution)
+
+
+def convert(data, source: BitResolution, target: BitResolution):
+    """
+    Convert flat samples from ``source`` to ``target``, returning an array that
+    exposes the packed bytes through the buffer protocol (``.tobytes()``, or pass it
+    on as is). Same format returns a view of ``data``.
+    """
+    _require_numpy()
+    if source == target:
+        if source == BitResolution.INT24:
+            return numpy.frombuffer(data, numpy.uint8)
+        return samples(data, source).reshape(-1)
+    if source in _FLOATS:
+        return from_float(samples(data, source).reshape(-1), target)
+    return from_int32(to_int32(data, source), target)
+
+
+def deinterleave(frames):
+    """``(frames, channels)`` samples as ``(channels, frames)`` planes, a strided view."""
+    _require_numpy()
+    return numpy.asarray(frames).T
+
+
+def interleave(planes):
+    """``(channels, frames)`` planes as flat interleaved samples."""
+    _require_numpy()
+    return numpy.ascontiguousarray(numpy.asarray(planes).T).reshape(-1)
+
+
+def remix(frames, channels: int):
+    """
+    ``(frames, channels)`` samples remixed to ``channels``. Mono is copied to every
+    output channel, downmixing to mono averages, otherwise channels are dropped or
+    silent ones added.
+    """
+    _require_numpy()
+    frames = numpy.asarray(frames)
+    source = frames.shape[1]
+    if source == channels:
+        return frames
+    if source == 1:
+        return numpy.repeat(frames, channels, axis=1)
+    if channels == 1:
+        return frames.mean(axis=1, keepdims=True, dtype=numpy.float64).astype(frames.dtype)
+    if channels < source:
+        return frames[:, :channels]
+    padded = numpy.zeros((len(frames), channels), frames.dtype)
+    padded[:, :source] = frames
+    return padded
+
+
+def peak_levels(data, bit_resolution: BitResolution, channels: int) -> List[float]:
+    """Peak absolute level of each channel, 0.0 to 1.0."""
+    _require_numpy()
+    if channels <= 0:
+        return []
+    values = to_float(data, bit_resolution)
+    values = values[: len(values) - len(values) % channels].reshape(-1, channels)
+    if not len(values):
+        return [0.0] * channels
+    return numpy.abs(values).max(axis=0).tolist()
@@ -1,19 +1,34 @@
-import time
+import logging
+import struct
 from dataclasses import dataclass, field
-from email.policy import default
+from typing import Optional
 
-from .body import PacketBody, BytesBody
-from .headers import VBANHeader
+from .body import PacketBody, BytesBody, _write_into
+from .headers import VBANHeader, VBANHeaderException, encode_streamname
+from .headers.audio import VBANAudioHeader
+from .headers.serial import VBANSerialHeader
 from .headers.subprotocol import VBANSubProtocolTypes
 from .headers.service import VBANServiceHeader, ServiceType
 from .headers.text import VBANTextHeader
+from ..util.clock import WALL_CLOCK, PacketClock
 
+logger = logging.getLogger(__package__)
 
-@dataclass
+# 28 byte header + 1436 bytes of data, the largest datagram the protocol allows
+VBAN_PROTOCOL_MAX_SIZE = 1464
+
+_FRAMECOUNT = struct.Struct("<I")
+
+
+@dataclass(slots=True)
 class VBANPacket:
     header: VBANHeader
     body: PacketBody = field(default_factory=BytesBody)
     timestamp: int = 0
+    # The clock ``timestamp`` was taken on
+    clock: PacketClock = field(default=WALL_CLOCK, kw_only=True, repr=False, compare=False)
+    # Set by routers that resolved the stream name from the raw header bytes
+    streamname_hint: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if isinstance(self.body, bytes):
@@ -22,56 +37,159 @@ class VBANPacket:
     def pack(self):
         return self.header.pack() + self.body.pack()
 
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        """
+        Write the packet into a caller-owned ``bytearray``/``memoryview`` at ``offset``
+        without building intermediate bytes. Returns the number of bytes written.
+        """
+        size = self.header.pack_into(buffer, offset)
+        return size + self.body.pack_into(buffer, offset + size)
+
+    @property
+    def raw_streamname(self) -> bytes:
+        """The 16 byte, NUL padded stream name as it appears on the wire."""
+        return encode_streamname(self.header.streamname)
+
+    @property
+    def framecount(self) -> int:
+        return self.header.framecount
+
+    @property
+    def subprotocol(self) -> VBANSubProtocolTypes:
+        return VBANSubProtocolTypes(self.header.subprotocol)
+
     @property
     def latency(self):
-        return time.time_ns() - self.timestamp
+        return self.clock.now_ns() - self.timestamp
 
     @classmethod
-    def unpack(cls, data):
-        from .body import Utf8StringBody
-
+    def unpack(
+        cls, data, timestamp: int = None, clock: PacketClock = WALL_CLOCK
+    ) -> "VBANPacket":
+        """
+        Wrap a received datagram in a lazy VBANPacketView. Only the size and magic
+        are checked here, the header and body are decoded on first access.
+        ``timestamp`` (on ``clock``) defaults to now, receivers that know the
+        arrival time pass it in.
+        """
         # Validate minimum packet size
         if len(data) < 28:
             raise ValueError(
                 f"Packet too small: expected at least 28 bytes, got {len(data)}"
             )
 
-        header = VBANHeader.unpack(data)
-        
-        # Use memoryview to avoid copying the body data
-        body_data = memoryview(data)[28:]
-
-        if isinstance(header, VBANServiceHeader):
-            if header.service == ServiceType.Identification:
-                from .body.service import Ping
-
-                return VBANPacket(
-                    header, Ping.unpack(body_data), timestamp=time.time_ns()
-                )
-            elif header.service == ServiceType.RTPacket:
-                from .body.service import RTPacketBodyType0, RTPacketBodyType1
-
-                if header.function == 0x00:
-                    return VBANPacket(
-                        header,
-                        RTPacketBodyType0.unpack(body_data),
-                        timestamp=time.time_ns(),
-                    )
-                elif header.function == 0x01:
-                    return VBANPacket(
-                        header,
-                        RTPacketBodyType1.unpack(body_data),
-                        timestamp=time.time_ns(),
-                    )
-            elif header.service == ServiceType.Chat_UTF8:
-                return VBANPacket(
-                    header, Utf8StringBody.unpack(body_data), timestamp=time.time_ns()
-                )
-
-        elif isinstance(header, VBANTextHeader):
-            return VBANPacket(
-                header, Utf8StringBody.unpack(body_data), timestamp=time.time_ns()
+        view = memoryview(data)
+        if view[0:4] != b"VBAN":
+            raise VBANHeaderException("Invalid VBAN Header")
+
+        return VBANPacketView(view, timestamp or clock.now_ns(), clock)
+
+
+class VBANPacketView(VBANPacket):
+    """
+    A VBANPacket over a received datagram that decodes its header and body on first
+    access and caches them. Packets that are dropped or never routed cost one small
+    object. ``data`` must not be mutated while the view is alive.
+    """
+
+    # The base slots for header and body go unused, the properties below replace them
+    __slots__ = ("_data", "_header", "_body")
+
+    def __init__(self, data: memoryview, timestamp: int = 0, clock: PacketClock = WALL_CLOCK):
+        self._data = data
+        self._header = None
+        self._body = None
+        self.timestamp = timestamp
+        self.clock = clock
+        self.streamname_hint = None
+
+    @property
+    def header(self) -> VBANHeader:
+        header = self._header
+        if header is None:
+            header = self._header = VBANHeader.unpack(
+                self._data, streamname=self.streamname_hint
             )
+        return header
+
+    @header.setter
+    def header(self, value: VBANHeader):
+        self._header = value
+
+    @property
+    def body(self) -> PacketBody:
+        body = self._body
+        if body is None:
+            # Use memoryview to avoid copying the body data
+            body_data = self._data[28:]
+            try:
+                body = _unpack_body(self.header, body_data)
+            except (struct.error, ValueError) as e:
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Error unpacking packet body, keeping raw bytes: {e}")
+                body = BytesBody.unpack(body_data)
+            self._body = body
+        return body
+
+    @body.setter
+    def body(self, value: PacketBody):
+        self._body = value
+
+    @property
+    def raw_streamname(self) -> bytes:
+        if self._header is None:
+            return self._data[8:24].tobytes()
+        return super().raw_streamname
+
+    @property
+    def framecount(self) -> int:
+        if self._header is None:
+            return _FRAMECOUNT.unpack_from(self._data, 24)[0]
+        return self._header.framecount
+
+    @property
+    def subprotocol(self) -> VBANSubProtocolTypes:
+        if self._header is None:
+            return VBANSubProtocolTypes(self._data[4])
+        return super().subprotocol
+
+    @property
+    def data(self) -> memoryview:
+        """The raw datagram this view wraps."""
+        return self._data
+
+    def pack(self):
+        # Untouched views re-send the original datagram as is
+        if self._header is None and self._body is None:
+            return self._data.tobytes()
+        return super().pack()
+
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        if self._header is None and self._body is None:
+            return _write_into(buffer, offset, self._data)
+        return super().pack_into(buffer, offset)
+
+
+def _unpack_body(header: VBANHeader, body_data) -> PacketBody:
+    from .body import Utf8StringBody
+
+    if isinstance(header, VBANServiceHeader):
+        if header.service == ServiceType.Identification:
+            from .body.service import Ping
+
+            return Ping.unpack(body_data)
+        elif header.service == ServiceType.RTPacket:
+            from .body.service import RTPacketBodyType0, RTPacketBodyType1
+
+            if header.function == 0x00:
+                return RTPacketBodyType0.unpack(body_data)
+            elif header.function == 0x01:
+                return RTPacketBodyType1.unpack(body_data)
+        elif header.service == ServiceType.Chat_UTF8:
+            return Utf8StringBody.unpack(body_data)
+
+    elif isinstance(header, VBANTextHeader):
+        return Utf8StringBody.unpack(body_data)
 
-        # Default/fallback to BytesBody
-        return VBANPacket(header, BytesBody.unpack(body_data), timestamp=time.time_ns())
+    # Default/fallback to BytesBody
+    return BytesBody.unpack(body_data)
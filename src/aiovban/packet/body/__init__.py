@@ -1,11 +1,30 @@
 from dataclasses import dataclass
 
 
+def _write_into(buffer, offset: int, data) -> int:
+    """Copy ``data`` into ``buffer`` at ``offset``, raising ValueError if it does not fit."""
+    size = len(data)
+    target = memoryview(buffer)[offset : offset + size]
+    if len(target) != size:
+        raise ValueError(
+            f"Buffer too small: need {size} bytes at offset {offset}, got {len(target)}"
+        )
+    target[:] = data
+    return size
+
+
 @dataclass
 class PacketBody:
     def pack(self):
         pass
 
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        """
+        Write the packed body into ``buffer`` starting at ``offset``.
+        Returns the number of bytes written.
+        """
+        return _write_into(buffer, offset, self.pack())
+
     @classmethod
     def unpack(cls, data):
         pass
@@ -21,6 +40,10 @@ class BytesBody(PacketBody):
     def pack(self):
         return self.data
 
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        # Copy straight from the (possibly memoryview) payload, no intermediate bytes
+        return _write_into(buffer, offset, self.data)
+
     @classmethod
     def unpack(cls, data):
         return cls(data)
@@ -24,6 +24,7 @@ from ....enums import VBANSampleRate, DeviceType, Features
 # 128s: user_name (Total 548)
 # 128s: user_comment (Total 676)
 PING_STRUCT_FORMAT = "<LLLLLLLBBBB8s8s8s8s64s32sHH64s64s64s64s128s128s"
+_PING_STRUCT = struct.Struct(PING_STRUCT_FORMAT)
 
 @dataclass
 class Ping(PacketBody, VBANApplicationData):
@@ -40,9 +41,15 @@ class Ping(PacketBody, VBANApplicationData):
     host_name: str = ""
 
     def pack(self):
+        return _PING_STRUCT.pack(*self._pack_fields())
+
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        _PING_STRUCT.pack_into(buffer, offset, *self._pack_fields())
+        return _PING_STRUCT.size
+
+    def _pack_fields(self):
         version_codes = self.version.split(".")
-        return struct.pack(
-            PING_STRUCT_FORMAT,
+        return (
             self.device_type.value,
             self.features.value,
             self.feature_extra,
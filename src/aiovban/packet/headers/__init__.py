@@ -11,6 +11,10 @@ _STREAMNAME_CACHE = {}
 _STREAMNAME_PACK_CACHE = {}
 
 
+# magic, subprotocol byte, byte_a, byte_b, byte_c, streamname, framecount
+_HEADER_STRUCT = struct.Struct("<4sBBBB16sL")
+
+
 @dataclass(kw_only=True)
 class VBANHeader(SyntheticMixin):
     framecount: int = 0
@@ -18,71 +22,98 @@ class VBANHeader(SyntheticMixin):
     streamname: str = field(default="Command1")
 
     _SUBCLASSES = {}
+    _SYNTHETIC_LAYOUT = (
+        (("subprotocol", 0xE0), ("subprotocol_data", 0x1F)),
+        (("byte_a", 0xFF),),
+        (("byte_b", 0xFF),),
+        (("byte_c", 0xFF),),
+    )
 
     @classmethod
     def register_subclass(cls, subprotocol: VBANSubProtocolTypes):
         def wrapper(subclass):
+            # Build the header codec once, up front, instead of on the first packet
+            subclass.compile_synthetics()
             cls._SUBCLASSES[subprotocol] = subclass
             return subclass
         return wrapper
 
     def pack(self) -> bytes:
-        # Cache encoded and padded stream name
-        stream_bytes = _STREAMNAME_PACK_CACHE.get(self.streamname)
-        if stream_bytes is None:
-            stream = self.streamname[:16].encode("utf-8")
-            stream_bytes = stream.ljust(16, b"\x00")
-            if len(_STREAMNAME_PACK_CACHE) < 128:
-                _STREAMNAME_PACK_CACHE[self.streamname] = stream_bytes
-
-        return struct.pack(
-            "<4sBBBB16sL",
+        codec = self._synthetic_codec or self.compile_synthetics()
+        return _HEADER_STRUCT.pack(
             b"VBAN",
-            (self.subprotocol or 0) | getattr(self, "subprotocol_data", 0),
-            getattr(self, "byte_a", 0),
-            getattr(self, "byte_b", 0),
-            getattr(self, "byte_c", 0),
-            stream_bytes,
+            *codec.encode(self),
+            _pack_streamname(self.streamname),
             self.framecount,
         )
 
+    def pack_into(self, buffer, offset: int = 0) -> int:
+        """Write the 28 byte header into ``buffer`` at ``offset`` and return its size."""
+        codec = self._synthetic_codec or self.compile_synthetics()
+        _HEADER_STRUCT.pack_into(
+            buffer,
+            offset,
+            b"VBAN",
+            *codec.encode(self),
+            _pack_streamname(self.streamname),
+            self.framecount,
+        )
+        return _HEADER_STRUCT.size
+
     @classmethod
-    def unpack(cls, data: bytes):
+    def unpack(cls, data: bytes, streamname: str = None):
         # Validate minimum header size
         if len(data) < 28:
             raise VBANHeaderException(
                 f"Insufficient data for VBAN header: expected at least 28 bytes, got {len(data)}"
             )
 
-        if data[0:4] != b"VBAN":
+        try:
+            magic, sub, a, b, c, streamname_bytes, framecount = (
+                _HEADER_STRUCT.unpack_from(data)
+            )
+        except struct.error as e:
+            raise VBANHeaderException(f"Failed to unpack header: {e}")
+
+        if magic != b"VBAN":
             raise VBANHeaderException("Invalid VBAN Header")
 
-        sub, sub_data = data[4] & 0xE0, data[4] & 0x1F
-
-        subclass = cls._SUBCLASSES.get(sub, cls)
-        obj = cls.__new__(subclass)  # Create bare type
-        obj.__post_init__()  # Initialize synthetic properties
-        obj.subprotocol = sub
-        obj.subprotocol_data = sub_data
-        obj.byte_a = data[5]
-        obj.byte_b = data[6]
-        obj.byte_c = data[7]
-
-        # Safely decode streamname with error handling, using a cache to avoid redundant decoding
-        streamname_bytes = data[8:24]
-        if streamname_bytes in _STREAMNAME_CACHE:
-            obj.streamname = _STREAMNAME_CACHE[streamname_bytes]
-        else:
-            obj.streamname = streamname_bytes.split(b"\x00", 1)[0].decode("utf-8")
-            if len(_STREAMNAME_CACHE) < 128:
-                _STREAMNAME_CACHE[streamname_bytes] = obj.streamname
+        subclass = cls._SUBCLASSES.get(sub & 0xE0, cls)
+        codec = subclass._synthetic_codec or subclass.compile_synthetics()
 
-        try:
-            obj.framecount = struct.unpack("<L", data[24:28])[0]
-        except struct.error as e:
-            raise VBANHeaderException(f"Failed to unpack framecount: {e}")
+        obj = object.__new__(subclass)  # Create bare type
+        namespace = obj.__dict__
+        codec.decode(namespace, sub, a, b, c)
+        # Callers that already routed the packet on its raw name can skip decoding it
+        namespace["streamname"] = streamname or _unpack_streamname(streamname_bytes)
+        namespace["framecount"] = framecount
         return obj
 
 
+def _pack_streamname(streamname: str) -> bytes:
+    # Cache encoded stream name, struct pads/truncates it to 16 bytes
+    stream_bytes = _STREAMNAME_PACK_CACHE.get(streamname)
+    if stream_bytes is None:
+        stream_bytes = streamname[:16].encode("utf-8")
+        if len(_STREAMNAME_PACK_CACHE) < 128:
+            _STREAMNAME_PACK_CACHE[streamname] = stream_bytes
+    return stream_bytes
+
+
+def encode_streamname(streamname: str) -> bytes:
+    """The exact 16 bytes ``streamname`` occupies in a packed header."""
+    return _pack_streamname(streamname)[:16].ljust(16, b"\x00")
+
+
+def _unpack_streamname(streamname_bytes: bytes) -> str:
+    # Safely decode streamname, using a cache to avoid redundant decoding
+    streamname = _STREAMNAME_CACHE.get(streamname_bytes)
+    if streamname is None:
+        streamname = streamname_bytes.split(b"\x00", 1)[0].decode("utf-8")
+        if len(_STREAMNAME_CACHE) < 128:
+            _STREAMNAME_CACHE[streamname_bytes] = streamname
+    return streamname
+
+
 class VBANHeaderException(Exception):
     pass
@@ -56,3 +56,8 @@ class VBANAudioHeader(VBANHeader):
 
     sample_rate: VBANSampleRate = subprotocol_data()
     _: VBANSubProtocolTypes = subprotocol(VBANSubProtocolTypes.AUDIO)
+
+    @property
+    def frame_duration_ms(self) -> float:
+        """Milliseconds of audio carried by one packet with this header."""
+        return self.samples_per_frame / self.sample_rate.rate * 1000
@@ -1,6 +1,7 @@
 from enum import EnumMeta, Enum
 
 from .audio import VBANAudioHeader
+from .serial import VBANSerialHeader
 from .service import VBANServiceHeader
 from .subprotocol import VBANSubProtocolTypes
 from .text import VBANTextHeader
@@ -14,7 +15,7 @@ class VBANSubProtocolMappingMeta(EnumMeta):
 
 class VBANSubProtocolMapping(Enum, metaclass=VBANSubProtocolMappingMeta):
     AUDIO = VBANSubProtocolTypes.AUDIO, VBANAudioHeader
-    SERIAL = VBANSubProtocolTypes.SERIAL
+    SERIAL = VBANSubProtocolTypes.SERIAL, VBANSerialHeader
     TEXT = VBANSubProtocolTypes.TEXT, VBANTextHeader
     SERVICE = VBANSubProtocolTypes.SERVICE, VBANServiceHeader
     UNDEFINED_1 = VBANSubProtocolTypes.UNDEFINED_1
@@ -47,6 +47,7 @@ class SerialType:
     User = 0xF0
 
 
+@VBANHeader.register_subclass(VBANSubProtocolTypes.SERIAL)
 @dataclass
 class VBANSerialHeader(VBANHeader):
     baud: VBANBaudRate = subprotocol_data()
@@ -58,5 +59,5 @@ class VBANSerialHeader(VBANHeader):
     parity_checking: bool = byte_a(0x08, default=False)
     multipart_data: bool = byte_a(0x80, default=False)
     format: DataFormat = byte_c(0x07, default=DataFormat.Data_8Bit)
-    serial_type: SerialType = byte_c(0x07, default=SerialType.Generic)
+    serial_type: SerialType = byte_c(0xF0, default=SerialType.Generic)
     _: VBANSubProtocolTypes = subprotocol(VBANSubProtocolTypes.SERIAL)
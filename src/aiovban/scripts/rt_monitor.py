@@ -6,7 +6,7 @@ import time
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List
 
-from aiovban import VBANApplicationData, DeviceType
+from aiovban import VBANApplicationData, DeviceType, audio
 from aiovban.asyncio import AsyncVBANClient
 from aiovban.enums import Features, State
 from aiovban.packet import VBANPacket
@@ -43,6 +43,12 @@ class Monitor:
         if not data:
             return [0.0] * channels
 
+        if audio.numpy is not None:
+            try:
+                return audio.peak_levels(data, bit_res, channels)
+            except ValueError:
+                return [0.0] * channels
+
         try:
             if bit_res == BitResolution.INT16:
                 fmt = f"<{len(data)//2}h"
@@ -0,0 +1,41 @@
+"""
+Clocks packet timestamps are taken on.
+
+A client stamps the packets it receives with its ``PacketClock`` and every packet
+carries the clock it was stamped on, so everything that ages it
+(``VBANPacket.latency``, DEADLINE queues, the jitter buffer) compares against the
+same clock. ``WALL_CLOCK`` (``time.time_ns()``) is the default. A monotonic
+``PacketClock`` counts on ``time.monotonic_ns()`` instead, anchored to the wall
+clock when it is created, which keeps timestamps steady when the system clock is
+stepped.
+"""
+
+import time
+
+
+class PacketClock:
+    __slots__ = ("monotonic", "now_ns", "_epoch_offset")
+
+    def __init__(self, monotonic: bool = False):
+        self.monotonic = monotonic
+        if monotonic:
+            self._epoch_offset = time.time_ns() - time.monotonic_ns()
+            self.now_ns = self._monotonic_now_ns
+        else:
+            self._epoch_offset = 0
+            self.now_ns = time.time_ns
+
+    def _monotonic_now_ns(self) -> int:
+        return self._epoch_offset + time.monotonic_ns()
+
+    def wall_clock_shift(self) -> int:
+        """Added to a wall clock time (e.g. a kernel receive timestamp) to put it on this clock."""
+        if self.monotonic:
+            return self._epoch_offset + time.monotonic_ns() - time.time_ns()
+        return 0
+
+    def __repr__(self):
+        return f"PacketClock(monotonic={self.monotonic})"
+
+
+WALL_CLOCK = PacketClock()
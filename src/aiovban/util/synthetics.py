@@ -1,6 +1,8 @@
 import functools
 import logging
 from dataclasses import Field, field
+from enum import Enum
+from typing import Callable, NamedTuple
 
 SYNTHETIC_NAME = "synthetic_name"
 
@@ -35,83 +37,179 @@ def byte_c(mask=0xFF, **kwargs) -> Field:
     return named_synthetic("byte_c", mask, **kwargs)
 
 
+class SyntheticCodec(NamedTuple):
+    """
+    Class-level encoder/decoder generated from a SyntheticMixin layout.
+
+    ``encode(obj)`` returns one int per layout slot, ``decode(namespace, *values)``
+    writes the decoded field values into ``namespace`` (usually an instance ``__dict__``).
+    """
+
+    encode: Callable
+    decode: Callable
+
+
+def _synthetic_groups(cls) -> dict:
+    from itertools import groupby
+
+    masks_by_name = {
+        k: list(v)
+        for k, v in groupby(
+            cls.__dataclass_fields__.values(),
+            key=lambda x: x.metadata.get(SYNTHETIC_NAME),
+        )
+    }
+    if None in masks_by_name:
+        masks_by_name.__delitem__(None)
+    return masks_by_name
+
+
+def _install_properties(cls, masks_by_name: dict):
+    for synthetic, fields in masks_by_name.items():
+        assert sum(f.metadata[MASK] for f in fields) <= 0xFF
+
+        if len(fields) == 1:
+            f = fields[0]
+            mask = f.metadata[MASK]
+            offset = f.metadata.get("offset", 0)
+            name = f.name
+
+            def getter(s, name=name, offset=offset, mask=mask):
+                try:
+                    val = getattr(s, name)
+                    if val is None:
+                        return 0
+                    return (int(val) - offset) & mask
+                except (AttributeError, TypeError):
+                    return 0
+        else:
+
+            def getter(s, fields=fields):
+                return functools.reduce(
+                    lambda x, y: x
+                    | (
+                        (int(getattr(s, y.name) or 0) - y.metadata.get("offset", 0))
+                        & y.metadata[MASK]
+                    ),
+                    fields,
+                    0,
+                )
+
+        def setter(s, value, fields=fields):
+            if value is None:
+                return
+            for f in fields:
+                try:
+                    setattr(
+                        s,
+                        f.name,
+                        f.type(
+                            (int(value) & f.metadata[MASK])
+                            + f.metadata.get("offset", 0)
+                        ),
+                    )
+                except (TypeError, ValueError) as e:
+                    logger.error(f"Error with field {f.name} for value {value}", e)
+
+        def deleter(s, fields=fields):
+            for f in fields:
+                delattr(s, f.name)
+
+        setattr(
+            cls,
+            synthetic,
+            property(fget=getter, fset=setter, fdel=deleter),
+        )
+
+
+def _decode_table(field_type):
+    """Precomputed value -> member lookup so decoding never calls the enum constructor."""
+    if isinstance(field_type, type) and issubclass(field_type, Enum):
+        return {member._value_: member for member in field_type}
+    return None
+
+
+def _compile_codec(cls, masks_by_name: dict) -> SyntheticCodec:
+    """
+    Generate straight-line encode/decode functions for ``cls._SYNTHETIC_LAYOUT``.
+
+    Each layout slot is a tuple of ``(synthetic_name, mask)`` pairs that share one
+    output byte. Synthetic names declared by the dataclass are expanded into their
+    fields, anything else falls back to a raw attribute of the same name.
+    """
+    namespace = {}
+    encode_slots = []
+    decode_lines = []
+
+    for index, slot in enumerate(cls._SYNTHETIC_LAYOUT):
+        terms = []
+        for synthetic, raw_mask in slot:
+            fields = masks_by_name.get(synthetic)
+            if not fields:
+                terms.append(f"(int(getattr(obj, {synthetic!r}, 0) or 0) & {raw_mask})")
+                decode_lines.append(f"ns[{synthetic!r}] = v{index} & {raw_mask}")
+                continue
+
+            for f in fields:
+                mask = f.metadata[MASK]
+                offset = f.metadata.get("offset", 0)
+                if f.type is bool:
+                    terms.append(f"({mask} if obj.{f.name} else 0)")
+                    decode_lines.append(f"ns[{f.name!r}] = bool(v{index} & {mask})")
+                    continue
+
+                terms.append(f"((int(obj.{f.name} or 0) - {offset}) & {mask})")
+                value = f"(v{index} & {mask})" + (f" + {offset}" if offset else "")
+                table = _decode_table(f.type)
+                if table is None:
+                    decode_lines.append(f"ns[{f.name!r}] = {value}")
+                else:
+                    namespace[f"_t_{f.name}"] = table
+                    decode_lines.append(
+                        f"_v = {value}; ns[{f.name!r}] = _t_{f.name}.get(_v, _v)"
+                    )
+        encode_slots.append(" | ".join(terms) or "0")
+
+    args = ", ".join(f"v{i}" for i in range(len(cls._SYNTHETIC_LAYOUT)))
+    source = (
+        "def encode(obj):\n"
+        f"    return ({', '.join(encode_slots)},)\n"
+        f"def decode(ns, {args}):\n"
+        + "".join(f"    {line}\n" for line in decode_lines or ["pass"])
+    )
+    exec(source, namespace)
+    return SyntheticCodec(namespace["encode"], namespace["decode"])
+
+
 class SyntheticMixin:
     """
     This class is a mixin that will create synthetic properties
     for each field that has the same synthetic_name metadata.
+
+    Subclasses may declare ``_SYNTHETIC_LAYOUT`` to additionally get a compiled
+    ``SyntheticCodec`` that packs every synthetic byte in a single call.
     """
 
+    _SYNTHETIC_LAYOUT = ()
+    _synthetic_codec: SyntheticCodec = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Never reuse a parent's codec, the field layout may differ
+        cls._synthetic_codec = None
+
     def __post_init__(self):
         # Only initialize synthetic properties once per class
-        if hasattr(self.__class__, "_synthetic_initialized"):
-            return
-
-        from itertools import groupby
-
-        masks_by_name = {
-            k: list(v)
-            for k, v in groupby(
-                self.__dataclass_fields__.values(),
-                key=lambda x: x.metadata.get(SYNTHETIC_NAME),
-            )
-        }
-        if None in masks_by_name:
-            masks_by_name.__delitem__(None)
-
-        for synthetic, fields in masks_by_name.items():
-            assert sum(f.metadata[MASK] for f in fields) <= 0xFF
-
-            if len(fields) == 1:
-                f = fields[0]
-                mask = f.metadata[MASK]
-                offset = f.metadata.get("offset", 0)
-                name = f.name
-
-                def getter(s, name=name, offset=offset, mask=mask):
-                    try:
-                        val = getattr(s, name)
-                        if val is None:
-                            return 0
-                        return (int(val) - offset) & mask
-                    except (AttributeError, TypeError):
-                        return 0
-            else:
-
-                def getter(s, fields=fields):
-                    return functools.reduce(
-                        lambda x, y: x
-                        | (
-                            (int(getattr(s, y.name) or 0) - y.metadata.get("offset", 0))
-                            & y.metadata[MASK]
-                        ),
-                        fields,
-                        0,
-                    )
-
-            def setter(s, value, fields=fields):
-                if value is None:
-                    return
-                for f in fields:
-                    try:
-                        setattr(
-                            s,
-                            f.name,
-                            f.type(
-                                (int(value) & f.metadata[MASK])
-                                + f.metadata.get("offset", 0)
-                            ),
-                        )
-                    except (TypeError, ValueError) as e:
-                        logger.error(f"Error with field {f.name} for value {value}", e)
-
-            def deleter(s, fields=fields):
-                for f in fields:
-                    delattr(s, f.name)
-
-            setattr(
-                self.__class__,
-                synthetic,
-                property(fget=getter, fset=setter, fdel=deleter),
-            )
-
-        self.__class__._synthetic_initialized = True
+        if self.__class__._synthetic_codec is None:
+            self.__class__.compile_synthetics()
+
+    @classmethod
+    def compile_synthetics(cls) -> SyntheticCodec:
+        """Install the synthetic properties and build the class codec. Idempotent."""
+        if cls.__dict__.get("_synthetic_codec") is not None:
+            return cls._synthetic_codec
+
+        masks_by_name = _synthetic_groups(cls)
+        _install_properties(cls, masks_by_name)
+        cls._synthetic_codec = _compile_codec(cls, masks_by_name)
+        return cls._synthetic_codec
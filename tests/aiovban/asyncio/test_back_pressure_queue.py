@@ -0,0 +1,259 @@
+import asyncio
+import threading
+import time
+import unittest
+from dataclasses import dataclass
+
+from aiovban.asyncio.streams import VBANIncomingStream
+from aiovban.asyncio.util import BackPressureQueue, BackPressureStrategy
+from aiovban.enums import VBANSampleRate
+from aiovban.packet import VBANPacket
+from aiovban.packet.headers.audio import BitResolution, Codec, VBANAudioHeader
+from aiovban.packet.headers.text import VBANTextHeader
+from aiovban.util.clock import WALL_CLOCK, PacketClock
+
+
+def _queue(strategy, size=4):
+    return BackPressureQueue(queue_size=size, back_pressure_strategy=strategy)
+
+
+def _contents(queue):
+    return queue.get_many_nowait(queue.queue_size)
+
+
+class TestBackPressureStrategies(unittest.IsolatedAsyncioTestCase):
+    async def test_drop_discards_new_items(self):
+        queue = _queue(BackPressureStrategy.DROP)
+        for i in range(6):
+            self.assertTrue(queue.put_nowait(i))
+        self.assertEqual(_contents(queue), [0, 1, 2, 3])
+
+    async def test_pop_discards_oldest(self):
+        queue = _queue(BackPressureStrategy.POP)
+        for i in range(6):
+            await queue.put(i)
+        self.assertEqual(_contents(queue), [2, 3, 4, 5])
+
+    async def test_drain_oldest_discards_half(self):
+        queue = _queue(BackPressureStrategy.DRAIN_OLDEST)
+        for i in range(5):
+            self.assertTrue(queue.put_nowait(i))
+        self.assertEqual(_contents(queue), [2, 3, 4])
+
+    async def test_raise(self):
+        queue = _queue(BackPressureStrategy.RAISE, size=1)
+        queue.put_nowait(0)
+        with self.assertRaises(asyncio.QueueFull):
+            queue.put_nowait(1)
+        with self.assertRaises(asyncio.QueueFull):
+            await queue.put(1)
+
+    async def test_block_waits_for_space(self):
+        queue = _queue(BackPressureStrategy.BLOCK, size=1)
+        await queue.put(0)
+        self.assertFalse(queue.put_nowait(1))
+
+        putter = asyncio.create_task(queue.put(1))
+        await asyncio.sleep(0)
+        self.assertFalse(putter.done())
+        self.assertEqual(await queue.get(), 0)
+        await putter
+        self.assertEqual(queue.get_nowait(), 1)
+
+    async def test_get_waits_for_put(self):
+        queue = _queue(BackPressureStrategy.DROP)
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        queue.put_nowait("packet")
+        self.assertEqual(await getter, "packet")
+        with self.assertRaises(asyncio.QueueEmpty):
+            queue.get_nowait()
+
+    async def test_cancelled_getter_passes_wakeup_on(self):
+        queue = _queue(BackPressureStrategy.DROP)
+        first = asyncio.create_task(queue.get())
+        second = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        queue.put_nowait("packet")
+        first.cancel()
+        self.assertEqual(await second, "packet")
+
+
+class TestBackPressureBatches(unittest.IsolatedAsyncioTestCase):
+    async def test_put_many_matches_single_puts(self):
+        for strategy in BackPressureStrategy:
+            if strategy in (
+                BackPressureStrategy.BLOCK,
+                BackPressureStrategy.RAISE,
+                BackPressureStrategy.DEADLINE,
+            ):
+                continue
+            single, batched = _queue(strategy), _queue(strategy)
+            for i in range(7):
+                single.put_nowait(i)
+            batched.put_many_nowait(list(range(7)))
+            self.assertEqual(_contents(batched), _contents(single), strategy)
+
+    async def test_put_many_block_takes_what_fits(self):
+        queue = _queue(BackPressureStrategy.BLOCK, size=3)
+        self.assertEqual(queue.put_many_nowait([0, 1, 2, 3, 4]), 3)
+
+        putter = asyncio.create_task(queue.put_many([3, 4]))
+        await asyncio.sleep(0)
+        self.assertEqual(await queue.get_many(2), [0, 1])
+        await putter
+        self.assertEqual(_contents(queue), [2, 3, 4])
+
+    async def test_put_many_raise_takes_what_fits(self):
+        queue = _queue(BackPressureStrategy.RAISE, size=3)
+        queue.put_nowait(0)
+        with self.assertRaises(asyncio.QueueFull):
+            queue.put_many_nowait([1, 2, 3])
+        with self.assertRaises(asyncio.QueueFull):
+            queue.put_many_nowait([3])
+        self.assertEqual(_contents(queue), [0, 1, 2])
+
+    async def test_put_many_into_shrunk_queue(self):
+        for strategy in (BackPressureStrategy.DROP, BackPressureStrategy.BLOCK):
+            queue = _queue(strategy, size=4)
+            queue.put_many_nowait([0, 1, 2, 3])
+            queue.queue_size = 2
+            taken = queue.put_many_nowait([4, 5])
+            if strategy == BackPressureStrategy.DROP:
+                # Two items offered, two dropped
+                self.assertEqual(queue.dropped, 2)
+            else:
+                self.assertEqual(taken, 0)
+            self.assertEqual(queue.qsize(), 4)
+
+    async def test_get_many(self):
+        queue = _queue(BackPressureStrategy.DROP)
+        getter = asyncio.create_task(queue.get_many(3))
+        await asyncio.sleep(0)
+        queue.put_many_nowait([0, 1, 2, 3])
+        self.assertEqual(await getter, [0, 1, 2])
+        self.assertEqual(queue.get_many_nowait(3), [3])
+        self.assertEqual(queue.get_many_nowait(3), [])
+
+
+@dataclass
+class _Stamped:
+    value: int
+    timestamp: int = 0
+    clock: PacketClock = WALL_CLOCK
+
+
+def _aged(value, age_ms):
+    return _Stamped(value, time.time_ns() - int(age_ms * 1_000_000))
+
+
+class TestDeadline(unittest.IsolatedAsyncioTestCase):
+    def _queue(self, size=10):
+        return BackPressureQueue(
+            queue_size=size,
+            back_pressure_strategy=BackPressureStrategy.DEADLINE,
+            max_age_ms=20,
+        )
+
+    async def test_requires_budget(self):
+        with self.assertRaises(ValueError):
+            BackPressureQueue(4, back_pressure_strategy=BackPressureStrategy.DEADLINE)
+
+    async def test_drops_only_expired_packets(self):
+        queue = self._queue()
+        for value, age in ((0, 50), (1, 30), (2, 5), (3, 1)):
+            queue.put_nowait(_aged(value, age))
+        self.assertEqual([p.value for p in queue.get_many_nowait(10)], [2, 3])
+        self.assertEqual(queue.dropped, 2)
+
+    async def test_expires_while_queued(self):
+        queue = self._queue()
+        queue.put_nowait(_aged(0, 15))
+        await asyncio.sleep(0.01)
+        self.assertIsNone(queue.get_many_nowait(10) or None)
+        with self.assertRaises(asyncio.QueueEmpty):
+            queue.get_nowait()
+
+    async def test_capacity_drops_oldest(self):
+        queue = self._queue(size=2)
+        for value in range(3):
+            queue.put_nowait(_Stamped(value))
+        self.assertEqual([p.value for p in queue.get_many_nowait(10)], [1, 2])
+        self.assertEqual(queue.dropped, 1)
+
+    async def test_stamps_unstamped_packets(self):
+        queue = self._queue()
+        packet = _Stamped(0)
+        queue.put_nowait(packet)
+        self.assertGreater(packet.timestamp, 0)
+        self.assertIs(await queue.get(), packet)
+
+
+class TestLatencySizedStream(unittest.TestCase):
+    def _audio_packet(self):
+        header = VBANAudioHeader(
+            sample_rate=VBANSampleRate.RATE_48000,
+            samples_per_frame=256,
+            channels=1,
+            bit_resolution=BitResolution.INT16,
+            codec=Codec.PCM,
+            streamname="A",
+        )
+        return VBANPacket(header, b"\x00" * 512)
+
+    def test_queue_sized_from_first_audio_packet(self):
+        stream = VBANIncomingStream(
+            "A", latency_ms=20, back_pressure_strategy=BackPressureStrategy.DEADLINE
+        )
+        self.assertEqual(stream._queue.max_age_ms, 20)
+        stream.handle_packet_nowait(self._audio_packet())
+        # 256 samples at 48kHz is 5.33ms per packet
+        self.assertEqual(stream.queue_size, 4)
+        self.assertEqual(stream._queue.queue_size, 4)
+
+    def test_non_audio_keeps_packet_count(self):
+        stream = VBANIncomingStream("T", queue_size=7, latency_ms=20)
+        stream.handle_packet_nowait(VBANPacket(VBANTextHeader(streamname="T"), b"x"))
+        self.assertEqual(stream._queue.queue_size, 7)
+
+
+class TestThreadsafeSubmitter(unittest.IsolatedAsyncioTestCase):
+    async def _submit_from_thread(self, queue, items, batched=False):
+        loop = asyncio.get_running_loop()
+
+        def produce():
+            if batched:
+                queue.put_many_threadsafe(items, loop)
+            else:
+                for item in items:
+                    queue.put_threadsafe(item, loop)
+
+        thread = threading.Thread(target=produce)
+        thread.start()
+        # Keep the loop busy so submissions pile up
+        thread.join()
+
+    async def test_coalesces_wakeups(self):
+        queue = _queue(BackPressureStrategy.DROP, size=1000)
+        await self._submit_from_thread(queue, list(range(500)))
+        await asyncio.sleep(0)
+
+        self.assertEqual(queue.get_many_nowait(1000), list(range(500)))
+        submitter = queue.submitter(asyncio.get_running_loop())
+        self.assertEqual(submitter.submitted, 500)
+        self.assertLess(submitter.wakeups, 500)
+
+    async def test_block_backlog_keeps_order(self):
+        queue = _queue(BackPressureStrategy.BLOCK, size=10)
+        await self._submit_from_thread(queue, list(range(50)), batched=True)
+
+        received = []
+        while len(received) < 50:
+            received.extend(await asyncio.wait_for(queue.get_many(7), 1))
+        self.assertEqual(received, list(range(50)))
+
+    async def test_raise_keeps_what_fits(self):
+        queue = _queue(BackPressureStrategy.RAISE, size=3)
+        await self._submit_from_thread(queue, list(range(5)), batched=True)
+        await asyncio.sleep(0)
+        self.assertEqual(queue.get_many_nowait(5), [0, 1, 2])
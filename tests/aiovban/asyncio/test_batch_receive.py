@@ -0,0 +1,70 @@
+import asyncio
+import socket
+import unittest
+
+from aiovban.asyncio import AsyncVBANClient
+from aiovban.asyncio.receiver import VBANBatchDatagramTransport
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+class TestBatchReceive(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncVBANClient()
+        self.done = await self.client.listen("127.0.0.1", 0, batch_receive=True)
+        self.port = self.client._transport.get_extra_info("sockname")[1]
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    async def asyncTearDown(self):
+        self.sender.close()
+        self.client.close()
+        await self.done
+
+    def _send(self, streamname, count):
+        for i in range(count):
+            packet = VBANPacket(
+                VBANTextHeader(streamname=streamname, framecount=i), BytesBody(b"x")
+            )
+            self.sender.sendto(packet.pack(), ("127.0.0.1", self.port))
+
+    async def _wait_for(self, predicate):
+        for _ in range(100):
+            if predicate():
+                return
+            await asyncio.sleep(0.01)
+
+    async def test_drains_in_batches(self):
+        self.assertIsInstance(self.client._transport, VBANBatchDatagramTransport)
+        device = await self.client.register_device("127.0.0.1")
+        stream = device.receive_stream("Batch1")
+
+        self._send("Batch1", 50)
+        await self._wait_for(lambda: self.client.raw_packets_received >= 50)
+
+        framecounts = []
+        while (packet := stream.get_packet_nowait()) is not None:
+            framecounts.append(packet.header.framecount)
+        self.assertEqual(framecounts, list(range(50)))
+        self.assertLess(self.client._transport.batches_received, 50)
+
+    async def test_rejects_unregistered_addresses(self):
+        self._send("Batch1", 5)
+        await self._wait_for(lambda: self.client.raw_packets_received >= 5)
+
+        self.assertEqual(self.client.raw_packets_received, 5)
+        self.assertEqual(self.client._transport.batches_received, 0)
+
+    async def test_send_datagram(self):
+        self.sender.bind(("127.0.0.1", 0))
+        self.sender.settimeout(1)
+        packet = VBANPacket(VBANTextHeader(streamname="Out"), BytesBody(b"y"))
+
+        self.client.send_datagram(packet, self.sender.getsockname())
+
+        data, _ = self.sender.recvfrom(2048)
+        self.assertEqual(data, packet.pack())
+
+
+if __name__ == "__main__":
+    unittest.main()
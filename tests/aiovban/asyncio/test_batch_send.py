@@ -0,0 +1,151 @@
+import asyncio
+import socket
+import unittest
+
+from aiovban.asyncio.batch import DatagramBatch
+from aiovban.asyncio.streams import BufferedVBANOutgoingStream
+from aiovban.asyncio.util import BatchStatistics
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.enums import VBANSampleRate
+from aiovban.packet.headers import VBANHeader
+from aiovban.packet.headers.audio import BitResolution, Codec, VBANAudioHeader
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+class TestBatchedSend(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(("127.0.0.1", 0))
+        self.receiver.setblocking(False)
+        self.port = self.receiver.getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.receiver.close()
+
+    async def _receive(self, count):
+        received = []
+        for _ in range(100):
+            try:
+                while len(received) < count:
+                    received.append(VBANPacket.unpack(self.receiver.recv(2048)))
+            except BlockingIOError:
+                pass
+            if len(received) >= count:
+                break
+            await asyncio.sleep(0.01)
+        return received
+
+    async def test_batch_flush_preserves_order_and_framecount(self):
+        stream = BufferedVBANOutgoingStream("Batch1", batch_flush=True, max_batch_size=8)
+        stream.set_header_template(VBANTextHeader(streamname="Batch1"))
+        await stream.connect("127.0.0.1", self.port)
+        try:
+            for i in range(20):
+                stream.send_packet_nowait(
+                    VBANPacket(stream.header_template(), BytesBody(bytes([i])))
+                )
+            received = await self._receive(20)
+        finally:
+            stream.send_task.cancel()
+
+        self.assertEqual([p.header.framecount for p in received], list(range(1, 21)))
+        self.assertEqual([p.body.pack() for p in received], [bytes([i]) for i in range(20)])
+        self.assertEqual(stream.batch_stats.packets, 20)
+        self.assertLess(stream.batch_stats.batches, 20)
+
+    async def test_queued_template_packets_keep_their_header(self):
+        stream = BufferedVBANOutgoingStream("Batch1")
+        template = stream.set_header_template(VBANTextHeader(streamname="Batch1"))
+        await stream.connect("127.0.0.1", self.port)
+        try:
+            packets = [VBANPacket(stream.header_template(), BytesBody(b"x")) for _ in range(3)]
+            for packet in packets:
+                stream.send_packet_nowait(packet)
+            received = await self._receive(3)
+        finally:
+            stream.send_task.cancel()
+
+        self.assertEqual([p.header.framecount for p in received], [1, 2, 3])
+        self.assertTrue(all(packet.header is template for packet in packets))
+        self.assertEqual(template.framecount, 0)
+
+    async def test_oversized_packet_falls_back_to_copy(self):
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=("127.0.0.1", self.port)
+        )
+        try:
+            batch = DatagramBatch(capacity=2, slot_size=64)
+            batch.add(VBANPacket(VBANTextHeader(streamname="Small"), BytesBody(b"a")))
+            batch.add(VBANPacket(VBANTextHeader(streamname="Big"), BytesBody(b"b" * 100)))
+            self.assertTrue(batch.full())
+            self.assertEqual(batch.flush(transport), 2)
+            self.assertEqual(len(batch), 0)
+            received = await self._receive(2)
+        finally:
+            transport.close()
+
+        self.assertEqual([p.header.streamname for p in received], ["Small", "Big"])
+        self.assertEqual(received[1].body.pack(), b"b" * 100)
+
+
+class TestBatchStatistics(unittest.TestCase):
+    def test_record(self):
+        stats = BatchStatistics()
+        self.assertEqual(stats.mean_batch_size, 0.0)
+        stats.record(4)
+        stats.record(2)
+        self.assertEqual(stats.batches, 2)
+        self.assertEqual(stats.packets, 6)
+        self.assertEqual(stats.max_batch_size, 4)
+        self.assertEqual(stats.mean_batch_size, 3.0)
+
+
+class TestHeaderTemplate(unittest.TestCase):
+    def setUp(self):
+        self.header = VBANAudioHeader(
+            samples_per_frame=128,
+            channels=2,
+            bit_resolution=BitResolution.INT16,
+            codec=Codec.PCM,
+            sample_rate=VBANSampleRate.RATE_48000,
+            streamname="Stream1",
+        )
+        self.stream = BufferedVBANOutgoingStream("Stream1")
+
+    def test_template_is_a_copy(self):
+        template = self.stream.set_header_template(self.header)
+        self.assertIsInstance(template, VBANAudioHeader)
+        self.assertIsNot(template, self.header)
+        self.assertEqual(template, self.header)
+        self.assertIs(self.stream.header_template(), template)
+
+    def test_framecount_written_into_cached_bytes(self):
+        template = self.stream.set_header_template(self.header)
+        self.stream._framecounter = 1233
+        datagram = self.stream._next_datagram(VBANPacket(template, BytesBody(b"ab")))
+
+        self.header.framecount = 1234
+        buffer = bytearray(34)
+        self.assertEqual(datagram.pack_into(buffer, 4), 30)
+        self.assertEqual(bytes(buffer[4:]), self.header.pack() + b"ab")
+        self.assertEqual(datagram.pack(), self.header.pack() + b"ab")
+        self.assertEqual(template.framecount, 0)
+
+    def test_changed_fields_make_a_new_header(self):
+        template = self.stream.set_header_template(self.header)
+        short = self.stream.header_template(samples_per_frame=64)
+        self.assertIsNot(short, template)
+        self.assertEqual(template.samples_per_frame, 128)
+
+        packet = VBANPacket(short, BytesBody(b""))
+        datagram = self.stream._next_datagram(packet)
+        self.assertIs(datagram, packet)
+        header = VBANHeader.unpack(datagram.pack())
+        self.assertEqual(header.samples_per_frame, 64)
+        self.assertEqual(header.framecount, 1)
+
+    def test_no_template(self):
+        with self.assertRaises(ValueError):
+            self.stream.header_template()
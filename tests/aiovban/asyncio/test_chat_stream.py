@@ -3,7 +3,7 @@ import asyncio
 from unittest.mock import MagicMock, patch
 from aiovban.asyncio.device import VBANDevice
 from aiovban.asyncio.streams import VBANChatStream
-from aiovban.packet import VBANPacket
+from aiovban.packet import VBANPacket, VBANHeader
 from aiovban.packet.headers.service import VBANServiceHeader, ServiceType
 from aiovban.packet.body import Utf8StringBody
 
@@ -30,6 +30,23 @@ class TestChatStream(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(packet.header.streamname, "TestChat")
             self.assertEqual(packet.body.text, "Hello World\0")
 
+    async def test_send_chat_reuses_header_template(self):
+        stream = await self.device.chat_stream("TestChat")
+        sent = []
+        self.mock_client.send_datagram.side_effect = lambda data, *args, **kwargs: sent.append(
+            data.pack()
+        )
+        await stream.send_chat("one")
+        await stream.send_chat("two")
+
+        headers = [VBANHeader.unpack(data) for data in sent]
+        self.assertEqual([header.framecount for header in headers], [1, 2])
+        self.assertEqual(headers[1].service, ServiceType.Chat_UTF8)
+        self.assertEqual(headers[1].streamname, "TestChat")
+        self.assertEqual(sent[1][28:], b"two\0")
+        # Sending leaves the template header alone
+        self.assertEqual(stream.header_template().framecount, 0)
+
     async def test_receive_chat(self):
         stream = await self.device.chat_stream("TestChat")
         header = VBANServiceHeader(service=ServiceType.Chat_UTF8, streamname="TestChat")
@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import MagicMock
+
+from aiovban.asyncio.device import VBANDevice
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers import _STREAMNAME_CACHE
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+def _datagram(streamname: str) -> bytes:
+    return VBANPacket(VBANTextHeader(streamname=streamname), BytesBody(b"hi")).pack()
+
+
+class TestDeviceRouting(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.device = VBANDevice(address="127.0.0.1", _client=MagicMock())
+
+    def test_routes_on_raw_name_without_decoding(self):
+        stream = self.device.receive_stream("RawRouted1")
+        packet = VBANPacket.unpack(_datagram("RawRouted1"))
+
+        self.assertTrue(self.device.handle_packet_nowait("127.0.0.1", packet))
+
+        self.assertIsNone(packet._header)
+        self.assertNotIn(packet.raw_streamname, _STREAMNAME_CACHE)
+        received = stream.get_packet_nowait()
+        self.assertIs(received, packet)
+        self.assertEqual(received.header.streamname, "RawRouted1")
+        self.assertNotIn(packet.raw_streamname, _STREAMNAME_CACHE)
+
+    def test_falls_back_to_decoded_name(self):
+        stream = self.device.receive_stream("Fallback1")
+        # Junk after the NUL terminator defeats the raw lookup but not the decoded one
+        data = bytearray(_datagram("Fallback1"))
+        data[22] = 0x7F
+        packet = VBANPacket.unpack(bytes(data))
+
+        self.assertTrue(self.device.handle_packet_nowait("127.0.0.1", packet))
+        self.assertIs(stream.get_packet_nowait(), packet)
+
+    def test_unrouted_packet(self):
+        self.device.receive_stream("Stream1")
+        packet = VBANPacket.unpack(_datagram("Other"))
+        # Nobody subscribed, dropped right away
+        self.assertTrue(self.device.handle_packet_nowait("127.0.0.1", packet))
+        self.assertFalse(self.device.wants_packet(packet))
+
+    async def test_rt_stream_alias(self):
+        stream = await self.device.rt_stream(update_interval=1, automatic_renewal=False)
+        self.assertIs(self.device._route(VBANPacket.unpack(_datagram("Voicemeeter-RTP"))), stream)
+        self.assertIs(self.device._route(VBANPacket.unpack(_datagram("VBAN-RTP"))), stream)
+
+    async def test_outgoing_streams_are_not_routed(self):
+        await self.device.text_stream("Command1")
+        packet = VBANPacket.unpack(_datagram("Command1"))
+        self.assertIsNone(self.device._route(packet))
+
+
+if __name__ == "__main__":
+    unittest.main()
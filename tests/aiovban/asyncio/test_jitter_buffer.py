@@ -0,0 +1,99 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from aiovban.asyncio.device import VBANDevice
+from aiovban.asyncio.streams import VBANFrameGap, VBANJitterBufferStream
+from aiovban.enums import VBANSampleRate
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.audio import VBANAudioHeader
+
+
+def _audio(framecount, timestamp=None):
+    header = VBANAudioHeader(
+        sample_rate=VBANSampleRate.RATE_48000,
+        samples_per_frame=48,
+        channels=1,
+        bit_resolution=1,
+        codec=0,
+        streamname="Jitter1",
+        framecount=framecount,
+    )
+    data = VBANPacket(header, BytesBody(b"\x00" * 96)).pack()
+    return VBANPacket.unpack(data, timestamp or time.time_ns())
+
+
+def _framecounts(items):
+    return [
+        ("gap", item.framecount, item.count) if isinstance(item, VBANFrameGap) else item.framecount
+        for item in items
+    ]
+
+
+class TestJitterBuffer(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stream = VBANJitterBufferStream("Jitter1", window_ms=20, min_window_ms=20)
+
+    def _feed(self, *framecounts):
+        for framecount in framecounts:
+            self.stream.handle_packet_nowait(_audio(framecount))
+
+    async def test_in_order_passes_through(self):
+        self._feed(1, 2, 3)
+        self.assertEqual(_framecounts(self.stream.get_packets_nowait()), [1, 2, 3])
+
+    async def test_reorders_within_window(self):
+        self._feed(1, 3, 4)
+        self.assertEqual(_framecounts(self.stream.get_packets_nowait()), [1])
+        self._feed(2)
+        self.assertEqual(_framecounts(self.stream.get_packets_nowait()), [2, 3, 4])
+        self.assertEqual(self.stream.stats.reordered, 1)
+
+    async def test_gap_released_on_deadline(self):
+        self._feed(1, 4, 5)
+        self.assertEqual(_framecounts(self.stream.get_packets_nowait()), [1])
+
+        packets = await self.stream.get_packets(timeout=1)
+        self.assertEqual(_framecounts(packets), [("gap", 2, 2), 4, 5])
+        self.assertEqual(packets[0].samples, 96)
+
+        # Too late now
+        self._feed(2)
+        self.assertEqual(self.stream.get_packets_nowait(), [])
+        stats = self.stream.statistics()
+        self.assertEqual(stats["gap_frames"], 2)
+        self.assertEqual(stats["late_dropped"], 1)
+
+    async def test_wraparound(self):
+        self._feed(0xFFFFFFFE, 0, 0xFFFFFFFF, 1)
+        self.assertEqual(
+            _framecounts(self.stream.get_packets_nowait()), [0xFFFFFFFE, 0xFFFFFFFF, 0, 1]
+        )
+
+    async def test_duplicates_dropped(self):
+        self._feed(1, 3, 3)
+        self.stream.flush()
+        self.assertEqual(_framecounts(self.stream.get_packets_nowait()), [1, ("gap", 2, 1), 3])
+
+    async def test_window_adapts_to_jitter(self):
+        stream = VBANJitterBufferStream("Jitter1", window_ms=40, min_window_ms=2)
+        self.assertEqual(stream.current_window_ms, 2)
+        # Packets every 1ms arriving 0 or 5ms late
+        start = time.time_ns()
+        for framecount in range(100):
+            late = (framecount % 2) * 5_000_000
+            stream.handle_packet_nowait(_audio(framecount, start + framecount * 1_000_000 + late))
+        self.assertGreater(stream.current_window_ms, 10)
+        self.assertLessEqual(stream.current_window_ms, 40)
+
+    async def test_device_option(self):
+        device = VBANDevice(address="127.0.0.1", _client=MagicMock())
+        stream = device.receive_stream("Jitter1", jitter_buffer_ms=30)
+        self.assertIsInstance(stream, VBANJitterBufferStream)
+        self.assertEqual(stream.window_ms, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
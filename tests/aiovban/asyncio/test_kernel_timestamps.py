@@ -0,0 +1,73 @@
+import asyncio
+import socket
+import sys
+import time
+import unittest
+
+from aiovban.asyncio import AsyncVBANClient
+from aiovban.asyncio.receiver import VBANBatchDatagramTransport
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.text import VBANTextHeader
+from aiovban.util.clock import WALL_CLOCK
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "SO_TIMESTAMPNS is Linux only")
+class TestKernelTimestamps(unittest.IsolatedAsyncioTestCase):
+    async def _listen(self, **kwargs):
+        self.client = AsyncVBANClient()
+        self.done = await self.client.listen("127.0.0.1", 0, kernel_timestamps=True, **kwargs)
+        self.port = self.client._transport.get_extra_info("sockname")[1]
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        device = await self.client.register_device("127.0.0.1")
+        self.stream = device.receive_stream("Stamped1")
+
+    async def asyncTearDown(self):
+        self.sender.close()
+        self.client.close()
+        await self.done
+
+    async def _send_while_busy(self) -> tuple:
+        """Send a packet while the loop is blocked, returning the send and unblock times."""
+        packet = VBANPacket(VBANTextHeader(streamname="Stamped1"), BytesBody(b"x"))
+        sent = time.time_ns()
+        self.sender.sendto(packet.pack(), ("127.0.0.1", self.port))
+        time.sleep(0.05)
+        unblocked = time.time_ns()
+        received = await asyncio.wait_for(self.stream.get_packet(), 1)
+        return sent, unblocked, received
+
+    async def test_stamped_on_kernel_arrival(self):
+        await self._listen()
+        transport = self.client._transport
+        self.assertIsInstance(transport, VBANBatchDatagramTransport)
+        self.assertTrue(transport.kernel_timestamps)
+
+        sent, unblocked, packet = await self._send_while_busy()
+        self.assertGreaterEqual(packet.timestamp, sent)
+        self.assertLess(packet.timestamp, unblocked)
+
+    async def test_receive_thread(self):
+        await self._listen(receive_thread=True)
+        self.assertTrue(self.client._transport.kernel_timestamps)
+
+        sent, unblocked, packet = await self._send_while_busy()
+        self.assertGreaterEqual(packet.timestamp, sent)
+        self.assertLess(packet.timestamp, unblocked)
+
+    async def test_monotonic(self):
+        await self._listen(monotonic_timestamps=True)
+        self.assertTrue(self.client.clock.monotonic)
+        # Only this client's clock, not the default every other client uses
+        self.assertFalse(WALL_CLOCK.monotonic)
+        self.assertFalse(AsyncVBANClient().clock.monotonic)
+
+        sent, unblocked, packet = await self._send_while_busy()
+        self.assertIs(packet.clock, self.client.clock)
+        # Anchored to the wall clock at listen, so close to it without a clock step
+        self.assertLess(abs(packet.timestamp - sent), 20_000_000)
+        self.assertLess(packet.timestamp, unblocked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import socket
+import time
+import unittest
+
+from aiovban.asyncio import AsyncVBANClient
+from aiovban.asyncio.receiver import VBANThreadedDatagramTransport
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+class _RefusingSocket:
+    """Fails the first receive like a socket with a pending ICMP port unreachable."""
+
+    def __init__(self, sock):
+        self._sock = sock
+        self.failed = False
+
+    def recvfrom_into(self, buffer):
+        if not self.failed:
+            self.failed = True
+            raise ConnectionRefusedError(111, "Connection refused")
+        return self._sock.recvfrom_into(buffer)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+class TestReceiveThread(unittest.IsolatedAsyncioTestCase):
+    async def _listen(self, **kwargs):
+        self.client = AsyncVBANClient()
+        self.done = await self.client.listen("127.0.0.1", 0, receive_thread=True, **kwargs)
+        self.port = self.client._transport.get_extra_info("sockname")[1]
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    async def asyncTearDown(self):
+        self.sender.close()
+        self.client.close()
+        await self.done
+
+    def _send(self, streamname, count):
+        for i in range(count):
+            packet = VBANPacket(
+                VBANTextHeader(streamname=streamname, framecount=i), BytesBody(b"x")
+            )
+            self.sender.sendto(packet.pack(), ("127.0.0.1", self.port))
+
+    async def _wait_for(self, predicate):
+        for _ in range(100):
+            if predicate():
+                return
+            await asyncio.sleep(0.01)
+
+    def _drain(self, stream):
+        packets = []
+        while (packet := stream.get_packet_nowait()) is not None:
+            packets.append(packet)
+        return packets
+
+    async def test_delivers_in_order_with_arrival_timestamps(self):
+        await self._listen()
+        self.assertIsInstance(self.client._transport, VBANThreadedDatagramTransport)
+        device = await self.client.register_device("127.0.0.1")
+        stream = device.receive_stream("Thread1")
+
+        before = time.time_ns()
+        self._send("Thread1", 50)
+        await self._wait_for(lambda: self.client.raw_packets_received >= 50)
+
+        packets = self._drain(stream)
+        self.assertEqual([p.header.framecount for p in packets], list(range(50)))
+        timestamps = [p.timestamp for p in packets]
+        self.assertEqual(timestamps, sorted(timestamps))
+        self.assertGreaterEqual(timestamps[0], before)
+
+    async def test_rejected_sources_are_counted(self):
+        await self._listen()
+        self._send("Thread1", 5)
+        await self._wait_for(lambda: self.client.raw_packets_received >= 5)
+        self.assertEqual(self.client.raw_packets_received, 5)
+        self.assertEqual(self.client._transport.batches_received, 0)
+
+    async def test_full_ring_drops_while_loop_is_blocked(self):
+        await self._listen(ring_size=8)
+        device = await self.client.register_device("127.0.0.1")
+        stream = device.receive_stream("Thread1")
+
+        # Keep the loop busy while the receive thread fills the ring
+        self._send("Thread1", 50)
+        time.sleep(0.2)
+        transport = self.client._transport
+        await self._wait_for(lambda: transport.packets_dropped + stream._queue.qsize() >= 50)
+
+        delivered = self._drain(stream)
+        self.assertEqual(len(delivered), 8)
+        self.assertEqual(transport.packets_dropped, 42)
+        self.assertEqual([p.header.framecount for p in delivered], list(range(8)))
+
+    async def test_receive_error_does_not_stop_the_thread(self):
+        await self._listen()
+        device = await self.client.register_device("127.0.0.1")
+        stream = device.receive_stream("Thread1")
+        transport = self.client._transport
+        refusing = transport._sock = _RefusingSocket(transport._sock)
+
+        self._send("Thread1", 1)
+        await self._wait_for(lambda: self.done.done())
+        self.assertTrue(refusing.failed)
+        with self.assertRaises(ConnectionRefusedError):
+            await self.done
+        self.done = asyncio.get_running_loop().create_future()
+        self.done.set_result(None)
+
+        self._send("Thread1", 5)
+        await self._wait_for(lambda: stream._queue.qsize() >= 6)
+        self.assertTrue(transport._thread.is_alive())
+        self.assertEqual([p.header.framecount for p in self._drain(stream)], [0, 0, 1, 2, 3, 4])
@@ -0,0 +1,104 @@
+import socket
+import sys
+import time
+import unittest
+
+from aiovban.asyncio.sharding import VBANShard, VBANShardedListener, merge_statistics
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+async def _register_owned(client, shard):
+    if shard.owns("127.0.0.1"):
+        device = await client.register_device("127.0.0.1")
+        device.receive_stream("Shard1")
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestShardHelpers(unittest.TestCase):
+    def test_merge_statistics(self):
+        merged = merge_statistics(
+            [
+                {"raw_packets_received": 3, "devices": {"10.0.0.1": {"A": 1}}},
+                {"raw_packets_received": 4, "devices": {"10.0.0.1": {"A": 2}, "10.0.0.2": {"B": 5}}},
+            ]
+        )
+        self.assertEqual(merged["raw_packets_received"], 7)
+        self.assertEqual(merged["devices"], {"10.0.0.1": {"A": 3}, "10.0.0.2": {"B": 5}})
+
+    def test_owner(self):
+        shard = VBANShard(index=1, workers=4, assignments={"10.0.0.1": 3})
+        self.assertEqual(shard.owner("10.0.0.1"), 3)
+        self.assertEqual(shard.owner("10.0.0.6"), 2)
+        self.assertFalse(shard.owns("10.0.0.1"))
+        self.assertTrue(shard.owns("10.0.0.5"))
+        self.assertIsNone(shard.owner("::1"))
+        self.assertTrue(VBANShard(index=0, workers=4, steered=False).owns("10.0.0.6"))
+
+    def test_assign_validates_worker(self):
+        listener = VBANShardedListener(_register_owned, workers=2)
+        with self.assertRaises(ValueError):
+            listener.assign("10.0.0.1", 2)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "BPF steering is Linux only")
+class TestShardedListener(unittest.TestCase):
+    def _listen_and_send(self, address, destination):
+        port = _free_port()
+        listener = VBANShardedListener(
+            _register_owned,
+            workers=2,
+            address=address,
+            port=port,
+            stats_interval=0.05,
+            start_method="fork",
+        )
+        listener.assign("127.0.0.1", 1)
+
+        with listener:
+            # setup() registers the device asynchronously after the worker binds
+            for _ in range(100):
+                if "127.0.0.1" in listener.statistics().get("devices", {}):
+                    break
+                time.sleep(0.05)
+
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+                sender.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                for i in range(20):
+                    packet = VBANPacket(
+                        VBANTextHeader(streamname="Shard1", framecount=i), BytesBody(b"x")
+                    )
+                    sender.sendto(packet.pack(), (destination, port))
+
+            for _ in range(100):
+                stats = listener.statistics()
+                if stats.get("raw_packets_received", 0) >= 20:
+                    break
+                time.sleep(0.05)
+            # Give duplicates a chance to show up
+            time.sleep(0.2)
+            return listener.statistics()
+
+    def test_assigned_device_lands_on_its_worker(self):
+        stats = self._listen_and_send("127.0.0.1", "127.0.0.1")
+
+        self.assertEqual(stats["raw_packets_received"], 20)
+        self.assertEqual(stats["workers"][1]["raw_packets_received"], 20)
+        self.assertEqual(stats["workers"][0]["raw_packets_received"], 0)
+        self.assertEqual(stats["devices"], {"127.0.0.1": {"Shard1": 20}})
+
+    def test_broadcast_is_counted_once(self):
+        # Every socket of the group gets its own copy of a broadcast
+        stats = self._listen_and_send("0.0.0.0", "127.255.255.255")
+
+        self.assertEqual(stats["raw_packets_received"], 20)
+        self.assertEqual(stats["workers"][1]["raw_packets_received"], 20)
+        self.assertEqual(stats["workers"][0]["raw_packets_received"], 0)
+        self.assertEqual(stats["workers"][0]["foreign_packets_dropped"], 20)
+        self.assertEqual(stats["devices"], {"127.0.0.1": {"Shard1": 20}})
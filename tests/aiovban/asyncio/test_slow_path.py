@@ -0,0 +1,94 @@
+import asyncio
+import unittest
+
+from aiovban.asyncio import AsyncVBANClient
+from aiovban.asyncio.protocol import VBANListenerProtocol
+from aiovban.asyncio.util import BackPressureStrategy
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.service import PingFunctions, ServiceType, VBANServiceHeader
+from aiovban.packet.headers.text import VBANTextHeader
+
+ADDR = ("127.0.0.1", 6980)
+
+
+def _datagram(index: int, streamname: str = "Slow1") -> bytes:
+    return VBANPacket(VBANTextHeader(streamname=streamname), BytesBody(bytes([index]))).pack()
+
+
+class TestSlowPath(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncVBANClient()
+        device = await self.client.register_device(ADDR[0])
+        device.default_stream_size = 2
+        self.stream = device.receive_stream(
+            "Slow1", back_pressure_strategy=BackPressureStrategy.BLOCK
+        )
+        self.protocol = VBANListenerProtocol(self.client, slow_path_queue_size=8)
+
+    async def _receive(self, count: int) -> list:
+        return [(await self.stream.get_packet()).body.pack()[0] for _ in range(count)]
+
+    async def test_preserves_order_with_one_task(self):
+        tasks_before = len(asyncio.all_tasks())
+        for i in range(6):
+            self.protocol.datagram_received(_datagram(i), ADDR)
+
+        # Two fit the stream, the rest wait behind a single worker
+        self.assertEqual(self.client.slow_path_packets, 4)
+        self.assertEqual(len(asyncio.all_tasks()) - tasks_before, 1)
+
+        self.assertEqual(await self._receive(6), list(range(6)))
+        self.protocol.connection_lost(None)
+
+    async def test_fast_path_waits_for_pending_packets(self):
+        for i in range(3):
+            self.protocol.datagram_received(_datagram(i), ADDR)
+        self.assertEqual(await self._receive(1), [0])
+
+        # The stream has room again but packet 2 is still queued on the slow path
+        self.protocol.datagram_received(_datagram(3), ADDR)
+        self.assertEqual(self.client.slow_path_packets, 2)
+        self.assertEqual(await self._receive(3), [1, 2, 3])
+        self.protocol.connection_lost(None)
+
+    async def test_unsubscribed_streams_skip_slow_path(self):
+        for i in range(3):
+            self.protocol.datagram_received(_datagram(i), ADDR)
+        for i in range(20):
+            self.protocol.datagram_received(_datagram(i, "Unsubscribed"), ADDR)
+
+        # Dropped right away, never queued ahead of (or instead of) routed packets
+        self.assertEqual(self.client.slow_path_packets, 1)
+        self.assertEqual(await self._receive(3), [0, 1, 2])
+        self.protocol.connection_lost(None)
+
+    async def test_ping_takes_slow_path(self):
+        ping = VBANPacket(
+            VBANServiceHeader(
+                streamname="VBAN Service",
+                service=ServiceType.Identification,
+                function=PingFunctions.Request,
+            ),
+            BytesBody(b""),
+        ).pack()
+        chat = VBANPacket(
+            VBANServiceHeader(streamname="Nobody", service=ServiceType.Chat_UTF8),
+            BytesBody(b"hi"),
+        ).pack()
+        self.protocol.datagram_received(chat, ADDR)
+        self.assertEqual(self.client.slow_path_packets, 0)
+        self.assertFalse(self.client.process_packet_nowait(ADDR[0], ADDR[1], VBANPacket.unpack(ping)))
+
+    async def test_drops_when_full(self):
+        for i in range(12):
+            self.protocol.datagram_received(_datagram(i), ADDR)
+
+        stats = self.client.statistics()
+        self.assertEqual(stats["slow_path_packets"], 8)
+        self.assertEqual(stats["slow_path_dropped"], 2)
+        self.protocol.connection_lost(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import asyncio
+import socket
+import sys
+import unittest
+
+from aiovban.asyncio import AsyncVBANClient
+from aiovban.asyncio.bpf import BPF_RET_K, source_filter_program
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+class TestSourceFilterProgram(unittest.TestCase):
+    def test_program_layout(self):
+        program = source_filter_program(["10.0.0.1", "10.0.0.2"])
+        self.assertEqual(len(program), 6)
+        self.assertEqual(program[1][3], 0x0A000001)
+        self.assertEqual(program[-1], (BPF_RET_K, 0, 0, 0))
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "BPF socket filters are Linux only")
+class TestSourceFilter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncVBANClient()
+        self.done = await self.client.listen("127.0.0.1", 0, source_filter=True)
+        self.port = self.client._transport.get_extra_info("sockname")[1]
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    async def asyncTearDown(self):
+        self.sender.close()
+        self.client.close()
+        await self.done
+
+    async def _send(self, count):
+        packet = VBANPacket(VBANTextHeader(streamname="Filter1"), BytesBody(b"x"))
+        for _ in range(count):
+            self.sender.sendto(packet.pack(), ("127.0.0.1", self.port))
+        await asyncio.sleep(0.05)
+
+    async def test_unregistered_sources_never_reach_python(self):
+        await self._send(5)
+        self.assertEqual(self.client.raw_packets_received, 0)
+
+        device = await self.client.register_device("127.0.0.1")
+        stream = device.receive_stream("Filter1")
+        await self._send(5)
+        self.assertEqual(self.client.raw_packets_received, 5)
+        self.assertIsNotNone(stream.get_packet_nowait())
+
+        self.assertIs(self.client.unregister_device("127.0.0.1"), device)
+        await self._send(5)
+        self.assertEqual(self.client.raw_packets_received, 5)
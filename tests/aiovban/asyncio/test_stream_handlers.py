@@ -0,0 +1,144 @@
+import asyncio
+import time
+import unittest
+
+from aiovban.asyncio.device import VBANDevice
+from aiovban.asyncio.streams import VBANIncomingStream
+from aiovban.asyncio.util import BackPressureStrategy
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+def _packet(framecount=0, streamname="Meter1"):
+    return VBANPacket.unpack(
+        VBANPacket(
+            VBANTextHeader(streamname=streamname, framecount=framecount), BytesBody(b"x")
+        ).pack()
+    )
+
+
+class TestStreamHandlers(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.device = VBANDevice(address="127.0.0.1")
+        self.stream = self.device.receive_stream("Meter1")
+
+    async def test_consuming_handler_runs_inline_and_bypasses_queue(self):
+        seen = []
+        self.stream.add_handler(lambda p: seen.append(p.header.framecount), consume=True)
+
+        self.assertTrue(self.device.handle_packet_nowait("127.0.0.1", _packet(1)))
+        self.assertEqual(seen, [1])
+        self.assertIsNone(self.stream.get_packet_nowait())
+
+    async def test_handler_and_queue_consumer_share_a_stream(self):
+        seen = []
+        self.stream.add_handler(lambda p: seen.append(p.header.framecount))
+
+        for i in range(3):
+            self.assertTrue(self.device.handle_packet_nowait("127.0.0.1", _packet(i)))
+        self.assertEqual(seen, [0, 1, 2])
+        packets = await asyncio.wait_for(self.stream.get_packets(), 1)
+        self.assertEqual([p.header.framecount for p in packets], [0, 1, 2])
+
+    async def test_refused_packet_is_dispatched_once(self):
+        stream = VBANIncomingStream(
+            "Blocking", queue_size=1, back_pressure_strategy=BackPressureStrategy.BLOCK
+        )
+        seen = []
+        stream.add_handler(lambda p: seen.append(p.header.framecount))
+
+        self.assertTrue(stream.handle_packet_nowait(_packet(0, "Blocking")))
+        # The queue is full, the packet is left for handle_packet
+        self.assertFalse(stream.handle_packet_nowait(_packet(1, "Blocking")))
+        self.assertEqual(seen, [0])
+
+        waiter = asyncio.create_task(stream.handle_packet(_packet(1, "Blocking")))
+        await asyncio.sleep(0)
+        self.assertEqual(seen, [0, 1])
+        self.assertEqual((await stream.get_packet()).header.framecount, 0)
+        await asyncio.wait_for(waiter, 1)
+        self.assertEqual((await stream.get_packet()).header.framecount, 1)
+        self.assertEqual(seen, [0, 1])
+
+    async def test_batch_handler_gets_each_burst(self):
+        batches = []
+        self.stream.add_handler(lambda ps: batches.append([p.header.framecount for p in ps]), batch=True)
+
+        for i in range(5):
+            self.device.handle_packet_nowait("127.0.0.1", _packet(i))
+        self.assertEqual(batches, [])
+        await asyncio.sleep(0)
+        self.assertEqual(batches, [[0, 1, 2, 3, 4]])
+
+    async def test_over_budget_handler_is_deferred(self):
+        seen = []
+
+        def slow(packet):
+            time.sleep(0.002)
+            seen.append(packet.header.framecount)
+
+        handler = self.stream.add_handler(slow, budget_ms=0.5)
+        self.device.handle_packet_nowait("127.0.0.1", _packet(0))
+        self.assertTrue(handler.deferred)
+        self.assertEqual(handler.overruns, 1)
+
+        self.device.handle_packet_nowait("127.0.0.1", _packet(1))
+        self.assertEqual(seen, [0])
+        await asyncio.sleep(0)
+        self.assertEqual(seen, [0, 1])
+
+    async def test_errors_are_contained(self):
+        def broken(packet):
+            raise RuntimeError("boom")
+
+        handler = self.stream.add_handler(broken)
+        with self.assertLogs("aiovban.asyncio", level="ERROR"):
+            self.assertTrue(self.device.handle_packet_nowait("127.0.0.1", _packet()))
+        self.assertEqual(handler.errors, 1)
+
+    async def test_remove_handler_restores_queue(self):
+        class Consumer:
+            def on_packet(self, packet):
+                pass
+
+        consumer = Consumer()
+        self.stream.add_handler(consumer.on_packet, consume=True)
+        self.stream.remove_handler(consumer.on_packet)
+        self.device.handle_packet_nowait("127.0.0.1", _packet(3))
+        self.assertEqual(self.stream.get_packet_nowait().header.framecount, 3)
+
+
+class TestBatchConsumption(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.device = VBANDevice(address="127.0.0.1")
+        self.stream = self.device.receive_stream("Meter1")
+
+    def _receive(self, *framecounts):
+        for i in framecounts:
+            self.device.handle_packet_nowait("127.0.0.1", _packet(i))
+
+    async def test_get_packets(self):
+        self._receive(0, 1, 2)
+        packets = await self.stream.get_packets(max_count=2)
+        self.assertEqual([p.header.framecount for p in packets], [0, 1])
+        self.assertEqual([p.header.framecount for p in self.stream.get_packets_nowait()], [2])
+
+    async def test_get_packets_waits_and_times_out(self):
+        self.assertEqual(await self.stream.get_packets(timeout=0.01), [])
+
+        waiter = asyncio.create_task(self.stream.get_packets(timeout=1))
+        await asyncio.sleep(0)
+        self._receive(4, 5)
+        self.assertEqual([p.header.framecount for p in await waiter], [4, 5])
+
+    async def test_batches(self):
+        self._receive(0, 1, 2)
+        batches = self.stream.batches()
+        first = await batches.__anext__()
+        self.assertEqual([p.header.framecount for p in first], [0, 1, 2])
+
+        self._receive(3)
+        second = await asyncio.wait_for(batches.__anext__(), 1)
+        self.assertEqual([p.header.framecount for p in second], [3])
+        await batches.aclose()
@@ -0,0 +1,133 @@
+import unittest
+
+from aiovban.asyncio.streams import VBANIncomingStream
+from aiovban.asyncio.util import BackPressureStrategy, StreamStatistics
+from aiovban.enums import VBANSampleRate
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.audio import VBANAudioHeader
+from aiovban.packet.headers.text import VBANTextHeader
+
+PERIOD_NS = 1_000_000
+
+
+def _record(stats, framecounts, period_ns=PERIOD_NS):
+    for framecount in framecounts:
+        stats.record(framecount, framecount * period_ns)
+
+
+class TestStreamStatistics(unittest.TestCase):
+    def test_in_order(self):
+        stats = StreamStatistics()
+        _record(stats, range(10))
+        self.assertEqual(stats.snapshot()["received"], 10)
+        self.assertEqual((stats.lost, stats.reordered, stats.duplicates), (0, 0, 0))
+
+    def test_gap_counts_lost(self):
+        stats = StreamStatistics()
+        _record(stats, [1, 2, 5, 6])
+        self.assertEqual(stats.lost, 2)
+
+    def test_reordered_fills_gap(self):
+        stats = StreamStatistics()
+        _record(stats, [1, 3, 2, 4])
+        self.assertEqual(stats.lost, 0)
+        self.assertEqual(stats.reordered, 1)
+
+    def test_advance(self):
+        stats = StreamStatistics()
+        advances = [stats.record(framecount, 0) for framecount in [7, 8, 11, 9, 11, 12, 90000]]
+        # Gaps count in full, anything behind adds nothing, a restart counts itself
+        self.assertEqual(advances, [1, 1, 3, 0, 0, 1, 1])
+
+    def test_duplicates(self):
+        stats = StreamStatistics()
+        _record(stats, [1, 2, 2, 3, 1])
+        self.assertEqual(stats.duplicates, 2)
+        self.assertEqual(stats.reordered, 0)
+
+    def test_late_beyond_window(self):
+        stats = StreamStatistics(reorder_window=4)
+        _record(stats, [1, 10, 2])
+        self.assertEqual(stats.late, 1)
+        self.assertEqual(stats.lost, 8)
+
+    def test_wraparound(self):
+        stats = StreamStatistics()
+        _record(stats, [0xFFFFFFFE, 0xFFFFFFFF, 1, 0])
+        self.assertEqual(stats.lost, 0)
+        self.assertEqual(stats.reordered, 1)
+        self.assertEqual(stats.resyncs, 0)
+
+    def test_restart_resyncs(self):
+        stats = StreamStatistics()
+        _record(stats, [100000, 100001, 0, 1])
+        self.assertEqual(stats.resyncs, 1)
+        self.assertEqual((stats.lost, stats.late), (0, 0))
+
+    def test_jitter(self):
+        stats = StreamStatistics(frame_period_ns=PERIOD_NS)
+        _record(stats, range(100))
+        self.assertEqual(stats.jitter_ns, 0)
+
+        stats = StreamStatistics(frame_period_ns=PERIOD_NS)
+        for framecount in range(200):
+            # Every other packet arrives half a period late
+            stats.record(framecount, framecount * PERIOD_NS + (framecount % 2) * PERIOD_NS // 2)
+        self.assertAlmostEqual(stats.snapshot()["jitter_ms"], 0.5, places=3)
+
+
+class TestIncomingStreamStatistics(unittest.IsolatedAsyncioTestCase):
+    def _audio(self, framecount):
+        header = VBANAudioHeader(
+            sample_rate=VBANSampleRate.RATE_48000,
+            samples_per_frame=48,
+            channels=1,
+            bit_resolution=1,
+            codec=0,
+            streamname="Stats1",
+            framecount=framecount,
+        )
+        data = VBANPacket(header, BytesBody(b"\x00" * 96)).pack()
+        return VBANPacket.unpack(data, 1 + framecount * PERIOD_NS)
+
+    def test_reads_framecount_without_decoding(self):
+        packet = self._audio(7)
+        self.assertEqual(packet.framecount, 7)
+        self.assertIsNone(packet._header)
+
+    def test_stream_tracks_packets(self):
+        stream = VBANIncomingStream("Stats1", queue_size=2)
+        for framecount in (1, 2, 4, 3):
+            stream.handle_packet_nowait(self._audio(framecount))
+
+        stats = stream.statistics()
+        self.assertEqual(stream.stats.frame_period_ns, PERIOD_NS)
+        self.assertEqual(stats["received"], 4)
+        self.assertEqual(stats["reordered"], 1)
+        self.assertEqual(stats["lost"], 0)
+        self.assertEqual(stats["queued"], 2)
+        self.assertEqual(stats["queue_dropped"], 2)
+        self.assertEqual(stats["jitter_ms"], 0)
+
+    async def test_refused_packets_counted_once(self):
+        stream = VBANIncomingStream(
+            "Stats1", queue_size=1, back_pressure_strategy=BackPressureStrategy.BLOCK
+        )
+        self.assertTrue(stream.handle_packet_nowait(self._audio(1)))
+        packet = self._audio(2)
+        self.assertFalse(stream.handle_packet_nowait(packet))
+        stream.get_packet_nowait()
+        await stream.handle_packet(packet)
+        self.assertEqual(stream.stats.received, 2)
+        self.assertEqual(stream.stats.duplicates, 0)
+
+    def test_non_audio_has_no_jitter(self):
+        stream = VBANIncomingStream("Text1")
+        packet = VBANPacket(VBANTextHeader(streamname="Text1", framecount=1), BytesBody(b"x"))
+        stream.handle_packet_nowait(packet)
+        self.assertEqual(stream.stats.frame_period_ns, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import socket
+import unittest
+
+from aiovban.asyncio import AsyncVBANClient
+from aiovban.asyncio.streams import VBANTextStream
+from aiovban.packet import VBANPacket
+from aiovban.packet.headers.service import PingFunctions
+
+
+class TestTransportPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncVBANClient()
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(("127.0.0.1", 0))
+        self.receiver.setblocking(False)
+        self.port = self.receiver.getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.client.close()
+        self.receiver.close()
+
+    async def _receive(self, count):
+        received = []
+        for _ in range(100):
+            try:
+                while len(received) < count:
+                    received.append(self.receiver.recvfrom(2048))
+            except BlockingIOError:
+                pass
+            if len(received) >= count:
+                break
+            await asyncio.sleep(0.01)
+        return received
+
+    async def test_streams_share_one_socket(self):
+        device = await self.client.register_device("127.0.0.1", self.port)
+        first = await device.text_stream("Text1")
+        second = await device.text_stream("Text2")
+
+        self.assertIs(first._protocol, second._protocol)
+        self.assertEqual(len(self.client.transport_pool), 1)
+
+        await first.send_text("one")
+        await second.send_text("two")
+        received = await self._receive(2)
+        self.assertEqual(len(received), 2)
+        self.assertEqual(received[0][1], received[1][1])
+
+    async def test_concurrent_acquire_opens_once(self):
+        protocols = await asyncio.gather(
+            *(self.client.transport_pool.acquire("127.0.0.1") for _ in range(10))
+        )
+        self.assertEqual(len({id(p) for p in protocols}), 1)
+        self.assertEqual(len(self.client.transport_pool), 1)
+
+    async def test_dedicated_socket(self):
+        shared = VBANTextStream("Shared", _client=self.client)
+        dedicated = VBANTextStream("Own", _client=self.client, dedicated_socket=True)
+        await shared.connect("127.0.0.1", self.port)
+        await dedicated.connect("127.0.0.1", self.port)
+        try:
+            self.assertIsNot(shared._protocol, dedicated._protocol)
+            self.assertTrue(dedicated._protocol._is_connected)
+            self.assertFalse(shared._protocol._is_connected)
+        finally:
+            dedicated._protocol._transport.close()
+
+    async def test_pings_reuse_pooled_socket(self):
+        for _ in range(5):
+            await self.client.send_ping("127.0.0.1", self.port, PingFunctions.Response)
+
+        received = await self._receive(5)
+        self.assertEqual(len(received), 5)
+        self.assertEqual(len({addr for _, addr in received}), 1)
+        self.assertEqual(len(self.client.transport_pool), 1)
+        packet = VBANPacket.unpack(received[0][0])
+        self.assertEqual(packet.header.function, PingFunctions.Response)
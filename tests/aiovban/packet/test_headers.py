@@ -1,10 +1,12 @@
 from unittest import TestCase
 
-from aiovban.packet.headers import VBANHeader
-from aiovban.packet.headers.audio import VBANAudioHeader
-from aiovban.packet.headers.service import VBANServiceHeader
+from aiovban.packet.headers import VBANHeader, VBANHeaderException
+from aiovban.packet.headers.audio import VBANAudioHeader, BitResolution, Codec
+from aiovban.packet.headers.serial import VBANSerialHeader, StopBit, SerialType
+from aiovban.packet.headers.service import VBANServiceHeader, ServiceType
 from aiovban.packet.headers.subprotocol import VBANSubProtocolTypes
-from aiovban.enums import VBANSampleRate
+from aiovban.packet.headers.text import VBANTextHeader, VBANTextStreamType
+from aiovban.enums import VBANSampleRate, VBANBaudRate
 
 
 class TestVBANSubProtocol(TestCase):
@@ -31,3 +33,86 @@ class TestVBANSubProtocol(TestCase):
         print(VBANHeader.pack(vs))
         output = VBANHeader.unpack(VBANHeader.pack(vs))
         print(output)
+
+
+class TestCompiledHeaderCodec(TestCase):
+
+    def test_codec_built_at_registration(self):
+        for subclass in (VBANAudioHeader, VBANServiceHeader, VBANTextHeader, VBANSerialHeader):
+            self.assertIsNotNone(subclass.__dict__.get("_synthetic_codec"))
+
+    def test_audio_header_bytes(self):
+        header = VBANAudioHeader(
+            samples_per_frame=256,
+            channels=2,
+            bit_resolution=BitResolution.INT16,
+            codec=Codec.PCM,
+            sample_rate=VBANSampleRate.RATE_48000,
+            streamname="Stream1",
+            framecount=77,
+        )
+        packed = header.pack()
+        self.assertEqual(
+            packed.hex(), "5642414e03ff010153747265616d310000000000000000004d000000"
+        )
+
+        output = VBANHeader.unpack(packed)
+        self.assertIsInstance(output, VBANAudioHeader)
+        self.assertEqual(output, header)
+        self.assertIs(output.sample_rate, VBANSampleRate.RATE_48000)
+        self.assertIs(output.bit_resolution, BitResolution.INT16)
+        self.assertEqual(output.samples_per_frame, 256)
+
+    def test_service_header_round_trip(self):
+        header = VBANServiceHeader(
+            function=0x01,
+            service=ServiceType.RTPacketRegister,
+            additional_info=0xFF,
+            streamname="TestStream",
+            framecount=2**32 - 1,
+        )
+        packed = header.pack()
+        self.assertEqual(packed[4:8], bytes([0x60, 0x01, 0x20, 0xFF]))
+
+        output = VBANHeader.unpack(memoryview(packed))
+        self.assertEqual(output, header)
+        self.assertEqual(output.subprotocol, VBANSubProtocolTypes.SERVICE)
+
+    def test_text_header_round_trip(self):
+        header = VBANTextHeader(baud=VBANBaudRate.RATE_256000, streamname="Command1")
+        output = VBANHeader.unpack(header.pack())
+        self.assertEqual(output, header)
+        self.assertIs(output.stream_type, VBANTextStreamType.UTF_8)
+
+    def test_serial_header_flags(self):
+        header = VBANSerialHeader(
+            baud=VBANBaudRate.RATE_115200,
+            channel=3,
+            stop_bit=StopBit.TWO,
+            start_bit=True,
+            multipart_data=True,
+            serial_type=SerialType.Midi,
+            streamname="MIDI1",
+        )
+        packed = header.pack()
+        self.assertEqual(packed[4:8], bytes([0x20 | 14, 0x86, 0x03, 0x10]))
+
+        output = VBANHeader.unpack(packed)
+        self.assertIsInstance(output, VBANSerialHeader)
+        self.assertEqual(output, header)
+
+    def test_unknown_values_are_kept_raw(self):
+        header = VBANServiceHeader(service=0x42, streamname="Odd")
+        output = VBANHeader.unpack(header.pack())
+        self.assertEqual(output.service, 0x42)
+
+    def test_unregistered_subprotocol_round_trip(self):
+        packed = b"VBAN" + bytes([0xE5, 1, 2, 3]) + b"User".ljust(16, b"\x00") + b"\x01\x00\x00\x00"
+        output = VBANHeader.unpack(packed)
+        self.assertIs(type(output), VBANHeader)
+        self.assertEqual(output.subprotocol, 0xE0)
+        self.assertEqual(output.pack(), packed)
+
+    def test_invalid_magic(self):
+        with self.assertRaises(VBANHeaderException):
+            VBANHeader.unpack(b"NABV" + bytes(24))
@@ -0,0 +1,72 @@
+import unittest
+
+from aiovban.packet import VBANPacket, VBANPacketView
+from aiovban.packet.body import BytesBody, Utf8StringBody
+from aiovban.packet.headers import VBANHeaderException
+from aiovban.packet.headers.service import VBANServiceHeader, ServiceType
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+class TestVBANPacketView(unittest.TestCase):
+    def setUp(self):
+        self.packet = VBANPacket(
+            VBANTextHeader(streamname="Command1", framecount=5),
+            Utf8StringBody("Strip[0].Mute=1;"),
+        )
+        self.data = self.packet.pack()
+
+    def test_decodes_lazily(self):
+        view = VBANPacket.unpack(self.data)
+
+        self.assertIsInstance(view, VBANPacketView)
+        self.assertIsNone(view._header)
+        self.assertIsNone(view._body)
+        self.assertGreater(view.timestamp, 0)
+
+        self.assertEqual(view.header.streamname, "Command1")
+        self.assertIsNone(view._body)
+        self.assertEqual(view.body.text, "Strip[0].Mute=1;")
+
+    def test_slotted(self):
+        view = VBANPacket.unpack(self.data)
+        self.assertFalse(hasattr(view, "__dict__"))
+        self.assertFalse(hasattr(self.packet, "__dict__"))
+        view.streamname_hint = "Command1"
+        self.assertEqual(view.header.streamname, "Command1")
+
+    def test_decoded_values_are_cached(self):
+        view = VBANPacket.unpack(self.data)
+        self.assertIs(view.header, view.header)
+        self.assertIs(view.body, view.body)
+
+    def test_untouched_view_packs_original_bytes(self):
+        view = VBANPacket.unpack(self.data)
+        self.assertEqual(view.pack(), self.data)
+
+        buffer = bytearray(len(self.data))
+        self.assertEqual(view.pack_into(buffer), len(self.data))
+        self.assertEqual(bytes(buffer), self.data)
+        self.assertIsNone(view._header)
+
+    def test_modified_view_repacks(self):
+        view = VBANPacket.unpack(self.data)
+        view.header.framecount = 9
+        self.assertEqual(VBANPacket.unpack(view.pack()).header.framecount, 9)
+
+    def test_bad_body_falls_back_to_bytes(self):
+        # An RT packet far too short to hold an RTPacketBodyType0
+        header = VBANServiceHeader(service=ServiceType.RTPacket, streamname="Voicemeeter-RTP")
+        view = VBANPacket.unpack(header.pack() + b"\x01" * 10)
+
+        self.assertIsInstance(view.body, BytesBody)
+        self.assertEqual(bytes(view.body.data), b"\x01" * 10)
+
+    def test_invalid_packets(self):
+        with self.assertRaises(ValueError):
+            VBANPacket.unpack(self.data[:20])
+        with self.assertRaises(VBANHeaderException):
+            VBANPacket.unpack(b"NABV" + self.data[4:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import struct
+import unittest
+
+from aiovban import audio
+from aiovban.enums import VBANSampleRate
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.audio import BitResolution, VBANAudioHeader
+
+numpy = audio.numpy
+
+
+class TestSampleView(unittest.TestCase):
+    def test_typed_view_without_copy(self):
+        data = bytearray(struct.pack("<4h", 1, -2, 300, -32768))
+        view = audio.sample_view(data, BitResolution.INT16)
+        self.assertEqual(list(view), [1, -2, 300, -32768])
+        data[0] = 5
+        self.assertEqual(view[0], 5)
+
+    def test_packed_24_bit_not_viewable(self):
+        with self.assertRaises(ValueError):
+            audio.sample_view(b"\x00" * 6, BitResolution.INT24)
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestConversion(unittest.TestCase):
+    def test_round_trip_every_format(self):
+        values = numpy.array([-1.0, -0.5, 0.0, 0.25, 0.75])
+        for bit_resolution in BitResolution:
+            with self.subTest(bit_resolution.name):
+                encoded = audio.from_float(values, bit_resolution).tobytes()
+                self.assertEqual(len(encoded), len(values) * bit_resolution.byte_width)
+                decoded = audio.to_float(encoded, bit_resolution, "float64")
+                numpy.testing.assert_allclose(decoded, values, atol=2**-7)
+
+    def test_int24_packing(self):
+        data = numpy.array([1, -2, 32767, -32768], "<i2").tobytes()
+        packed = audio.convert(data, BitResolution.INT16, BitResolution.INT24).tobytes()
+        self.assertEqual(packed.hex(), "00010000feff00ff7f000080")
+        back = audio.convert(packed, BitResolution.INT24, BitResolution.INT16)
+        self.assertEqual(back.tolist(), [1, -2, 32767, -32768])
+
+    def test_integer_widening_is_exact(self):
+        data = numpy.arange(-32768, 32768, 7, dtype="<i2").tobytes()
+        wide = audio.convert(data, BitResolution.INT16, BitResolution.INT32)
+        self.assertEqual((wide >> 16).tolist(), list(range(-32768, 32768, 7)))
+
+    def test_byte8_is_unsigned(self):
+        converted = audio.convert(b"\x80\x00\xff", BitResolution.BYTE8, BitResolution.INT16)
+        self.assertEqual(converted.tolist(), [0, -32768, 127 << 8])
+
+    def test_float_clipping(self):
+        converted = audio.from_float(numpy.array([2.0, -2.0]), BitResolution.INT16)
+        self.assertEqual(converted.tolist(), [32767, -32768])
+        single = numpy.array([1.0, 1.5, -1.0, -1.5], numpy.float32)
+        for bit_resolution in (BitResolution.INT16, BitResolution.INT32, BitResolution.INT24):
+            with self.subTest(bit_resolution.name):
+                converted = audio.from_float(single, bit_resolution).tobytes()
+                back = audio.to_float(converted, bit_resolution, "float64")
+                self.assertTrue(numpy.all(back[:2] > 0.99))
+                self.assertEqual(back[2:].tolist(), [-1.0, -1.0])
+        converted = audio.convert(single.tobytes(), BitResolution.FLOAT32, BitResolution.INT16)
+        self.assertEqual(converted.tolist(), [32767, 32767, -32768, -32768])
+
+    def test_same_format_is_a_view(self):
+        data = bytearray(numpy.array([1, 2, 3, 4], "<i2").tobytes())
+        converted = audio.convert(data, BitResolution.INT16, BitResolution.INT16)
+        data[0] = 9
+        self.assertEqual(converted[0], 9)
+
+    def test_interleave(self):
+        frames = audio.samples(numpy.arange(6, dtype="<i2").tobytes(), BitResolution.INT16, 2)
+        planes = audio.deinterleave(frames)
+        self.assertEqual(planes.tolist(), [[0, 2, 4], [1, 3, 5]])
+        self.assertEqual(audio.interleave(planes).tolist(), list(range(6)))
+
+    def test_remix(self):
+        stereo = numpy.array([[0.5, -0.5], [0.25, 0.75]], numpy.float32)
+        self.assertEqual(audio.remix(stereo, 1).tolist(), [[0.0], [0.5]])
+        self.assertEqual(audio.remix(stereo[:, :1], 2).tolist(), [[0.5, 0.5], [0.25, 0.25]])
+        self.assertEqual(audio.remix(stereo, 3)[:, 2].tolist(), [0.0, 0.0])
+        self.assertIs(audio.remix(stereo, 2), stereo)
+
+    def test_packet_samples_views_body(self):
+        header = VBANAudioHeader(
+            sample_rate=VBANSampleRate.RATE_48000,
+            samples_per_frame=3,
+            channels=2,
+            bit_resolution=BitResolution.INT16,
+            codec=0,
+        )
+        body = numpy.arange(6, dtype="<i2").tobytes()
+        packet = VBANPacket.unpack(VBANPacket(header, BytesBody(body)).pack())
+        frames = audio.packet_samples(packet)
+        self.assertEqual(frames.shape, (3, 2))
+        self.assertEqual(frames[:, 1].tolist(), [1, 3, 5])
+        self.assertFalse(frames.flags.owndata)
+
+    def test_peak_levels(self):
+        data = numpy.array([0, -16384, 8192, 32767], "<i2").tobytes()
+        levels = audio.peak_levels(data, BitResolution.INT16, 2)
+        self.assertAlmostEqual(levels[0], 0.25)
+        self.assertAlmostEqual(levels[1], 1.0, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from aiovban.asyncio.util import BackPressureQueue, BackPressureStrategy
+from aiovban.packet import VBANPacket
+from aiovban.packet.body import BytesBody
+from aiovban.packet.headers.text import VBANTextHeader
+from aiovban.util.clock import WALL_CLOCK, PacketClock
+
+STEP_NS = 3600 * 1_000_000_000
+
+
+def _stepped_wall_clock():
+    # The system clock jumped an hour ahead
+    wall = time.time_ns
+    return patch("time.time_ns", lambda: wall() + STEP_NS)
+
+
+class TestPacketClock(unittest.TestCase):
+    def setUp(self):
+        self.data = VBANPacket(VBANTextHeader(streamname="Clock1"), BytesBody(b"x")).pack()
+
+    def test_wall_clock_by_default(self):
+        self.assertFalse(WALL_CLOCK.monotonic)
+        self.assertEqual(WALL_CLOCK.wall_clock_shift(), 0)
+        packet = VBANPacket.unpack(self.data)
+        self.assertIs(packet.clock, WALL_CLOCK)
+        self.assertLess(abs(packet.timestamp - time.time_ns()), 1_000_000_000)
+
+    def test_monotonic_ignores_wall_clock_steps(self):
+        clock = PacketClock(monotonic=True)
+        packet = VBANPacket.unpack(self.data, clock=clock)
+        self.assertIs(packet.clock, clock)
+        queue = BackPressureQueue(
+            8, back_pressure_strategy=BackPressureStrategy.DEADLINE, max_age_ms=100
+        )
+        with _stepped_wall_clock():
+            self.assertLess(packet.latency, 1_000_000_000)
+            self.assertTrue(queue.put_nowait(packet))
+            self.assertTrue(queue.put_nowait(VBANPacket.unpack(self.data, clock=clock)))
+            self.assertEqual(queue.dropped, 0)
+            # Kernel timestamps are wall clock, shifted back onto the packet clock
+            self.assertLess(abs(time.time_ns() + clock.wall_clock_shift() - clock.now_ns()), 1_000_000_000)
+        # The default clock is untouched
+        self.assertFalse(WALL_CLOCK.monotonic)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -36,6 +36,74 @@ class TestFrameBuffer(unittest.TestCase):
         size, count = fb.size()
         self.assertEqual(count, 1) # only 03 03 left
 
+    def test_framebuffer_wraparound(self):
+        fb = FrameBuffer(max_frame_count=3, bytes_per_frame=1)
+        for i in range(0, 30, 2):
+            fb.write(bytes([i, i + 1]), 2)
+            data, read_count, dropped = fb.read(2)
+            self.assertEqual(bytes(data), bytes([i, i + 1]))
+            self.assertEqual(dropped, 0)
+
+    def test_framebuffer_oversized_write(self):
+        fb = FrameBuffer(max_frame_count=2, bytes_per_frame=1)
+        fb.write(bytes(range(10)), 10)
+        data, read_count, dropped = fb.read(4)
+        self.assertEqual(bytes(data), b"\x08\x09")
+        self.assertEqual(dropped, 8)
+
+    def test_framebuffer_synchronize(self):
+        fb = FrameBuffer(max_frame_count=4, bytes_per_frame=1)
+        fb.write(b"\x01\x02", 2)
+        fb.synchronize(2)
+        # Only the reader moves the read position
+        self.assertEqual(fb._read, 0)
+        self.assertEqual(fb.size(), (0, 0))
+        fb.write(b"\x03\x03", 1)
+        self.assertEqual(fb.read(4)[:2], (b"\x03\x03", 1))
+
+    def test_framebuffer_synchronize_during_read(self):
+        fb = FrameBuffer(max_frame_count=4, bytes_per_frame=1)
+        fb.write(b"\x01\x02\x03", 3)
+
+        class SynchronizeOnCopy:
+            # Stands in for the ring, the producer reformats while the read copies
+            def __init__(self, layout):
+                self.layout = layout
+
+            def __getattr__(self, name):
+                if name == "out":
+                    fb.synchronize(2)
+                    fb.write(b"\x09\x09\x08\x08", 2)
+                return getattr(self.layout, name)
+
+        fb._layout = SynchronizeOnCopy(fb._layout)
+        self.assertEqual(fb.read(2)[:2], (b"\x01\x02", 2))
+        # The old frame left behind is skipped, the new ring is read from its start
+        self.assertEqual(fb.size(), (4, 2))
+        self.assertEqual(fb.read(4)[:2], (b"\x09\x09\x08\x08", 2))
+
+    def test_framebuffer_oversized_write_during_read(self):
+        fb = FrameBuffer(max_frame_count=2, bytes_per_frame=1)
+        fb.write(b"\x01\x02\x03\x04", 4)
+
+        class WriteOnCopy:
+            # Stands in for the ring, the producer writes more than max_frame_count
+            # frames while the read copies, going around into the frames being read
+            def __init__(self, layout):
+                self.layout = layout
+
+            def __getattr__(self, name):
+                if name == "out":
+                    fb.write(b"\x09\x09\x09", 3)
+                return getattr(self.layout, name)
+
+        fb._layout = WriteOnCopy(fb._layout)
+        data, count, dropped = fb.read(4, drop_frames=False)
+        # The three overwritten frames are dropped, not returned torn
+        self.assertEqual((bytes(data), count, dropped), (b"\x04", 1, 3))
+        fb._layout = fb._layout.layout
+        self.assertEqual(bytes(fb.read(4, drop_frames=False)[0]), b"\x09\x09\x09")
+
     def test_framebuffer_threading(self):
         fb = FrameBuffer(max_frame_count=1000, bytes_per_frame=1)
         stop_event = threading.Event()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import MagicMock
+
+from aiovban.asyncio.protocol import VBANSenderProtocol
+from aiovban.asyncio.util import SendBuffer
+from aiovban.enums import DeviceType, Features, VBANSampleRate
+from aiovban.packet import VBANPacket, VBAN_PROTOCOL_MAX_SIZE
+from aiovban.packet.body import BytesBody, Utf8StringBody
+from aiovban.packet.body.service import Ping
+from aiovban.packet.headers.audio import VBANAudioHeader, BitResolution, Codec
+from aiovban.packet.headers.service import VBANServiceHeader, ServiceType
+from aiovban.packet.headers.text import VBANTextHeader
+
+
+def _audio_packet(payload: bytes) -> VBANPacket:
+    header = VBANAudioHeader(
+        samples_per_frame=len(payload) // 4,
+        channels=2,
+        bit_resolution=BitResolution.INT16,
+        codec=Codec.PCM,
+        sample_rate=VBANSampleRate.RATE_48000,
+        streamname="Stream1",
+        framecount=12,
+    )
+    return VBANPacket(header, BytesBody(memoryview(payload)))
+
+
+class TestPackInto(unittest.TestCase):
+    def test_audio_packet_matches_pack(self):
+        packet = _audio_packet(bytes(range(256)) * 4)
+        buffer = bytearray(VBAN_PROTOCOL_MAX_SIZE)
+
+        size = packet.pack_into(buffer)
+
+        self.assertEqual(size, 28 + 1024)
+        self.assertEqual(bytes(buffer[:size]), packet.pack())
+
+    def test_offset(self):
+        packet = VBANPacket(VBANTextHeader(streamname="Command1"), Utf8StringBody("Strip[0].Mute=1;"))
+        buffer = bytearray(b"\xff" * 64)
+
+        size = packet.pack_into(memoryview(buffer), 4)
+
+        self.assertEqual(buffer[:4], b"\xff" * 4)
+        self.assertEqual(bytes(buffer[4 : 4 + size]), packet.pack())
+
+    def test_ping_body(self):
+        ping = Ping(
+            device_type=DeviceType.Receptor,
+            features=Features.Audio,
+            version="1.2.3.4",
+            application_name="aiovban",
+        )
+        packet = VBANPacket(VBANServiceHeader(service=ServiceType.Identification, streamname="VBAN Service"), ping)
+        buffer = bytearray(VBAN_PROTOCOL_MAX_SIZE)
+
+        size = packet.pack_into(buffer)
+
+        self.assertEqual(bytes(buffer[:size]), packet.pack())
+
+    def test_buffer_too_small(self):
+        packet = _audio_packet(bytes(1024))
+        with self.assertRaises(ValueError):
+            packet.pack_into(bytearray(100))
+
+
+class TestSendBuffer(unittest.TestCase):
+    def test_reuses_buffer(self):
+        send_buffer = SendBuffer()
+        transport = MagicMock()
+        transport.get_write_buffer_size.return_value = 0
+
+        first = send_buffer.pack(_audio_packet(bytes(8)))
+        send_buffer.recycle(transport)
+        second = send_buffer.pack(_audio_packet(bytes(8)))
+
+        self.assertIs(first.obj, second.obj)
+
+    def test_replaces_buffer_when_transport_queued(self):
+        send_buffer = SendBuffer()
+        transport = MagicMock()
+        transport.get_write_buffer_size.return_value = 1
+
+        first = send_buffer.pack(_audio_packet(bytes(8)))
+        expected = bytes(first)
+        send_buffer.recycle(transport)
+        send_buffer.pack(_audio_packet(b"\x01" * 8))
+
+        self.assertEqual(bytes(first), expected)
+
+    def test_oversized_packet_falls_back_to_pack(self):
+        packet = _audio_packet(bytes(2048))
+        self.assertEqual(bytes(SendBuffer().pack(packet)), packet.pack())
+
+    def test_sender_protocol_uses_send_buffer(self):
+        protocol = VBANSenderProtocol(client=MagicMock())
+        transport = MagicMock()
+        transport.get_extra_info.return_value = ("127.0.0.1", 6980)
+        transport.get_write_buffer_size.return_value = 0
+        sent = []
+        transport.sendto.side_effect = lambda data, addr: sent.append((bytes(data), addr))
+        protocol._transport = transport
+        protocol._is_connected = True
+
+        packet = _audio_packet(bytes(16))
+        protocol.send_packet(packet, ("127.0.0.1", 6980))
+
+        self.assertEqual(sent, [(packet.pack(), None)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from aiovban_pyaudio.playout import (
+    DriftEstimator,
+    PlayoutController,
+    RateEstimator,
+    remove_frames,
+    repeat_frames,
+)
+
+
+class TestFrameSlipping(unittest.TestCase):
+    def test_remove_frames(self):
+        data = bytes(range(10))
+        self.assertEqual(remove_frames(data, 10, 1, 1), bytes([0, 1, 2, 3, 4, 6, 7, 8, 9]))
+        self.assertEqual(len(remove_frames(data, 5, 2, 2)), 6)
+
+    def test_repeat_frames(self):
+        data = bytes(range(10))
+        self.assertEqual(
+            repeat_frames(data, 10, 1, 1), bytes([0, 1, 2, 3, 4, 5, 5, 6, 7, 8, 9])
+        )
+        stretched = repeat_frames(data, 5, 2, 2)
+        self.assertEqual(len(stretched), 14)
+        # Whole frames are repeated
+        self.assertEqual(stretched[2:6], b"\x02\x03\x02\x03")
+
+
+class TestPlayoutController(unittest.TestCase):
+    def test_within_tolerance(self):
+        controller = PlayoutController(40, sample_rate=48000)
+        controller.observe(1920 + 100)
+        self.assertEqual(controller.correction(512), 0)
+
+    def test_corrections_are_capped(self):
+        controller = PlayoutController(40, sample_rate=48000, max_correction=0.01)
+        controller.observe(8000)
+        self.assertEqual(controller.correction(512), 5)
+        controller.reset()
+        controller.observe(0)
+        self.assertEqual(controller.correction(512), -5)
+
+    def test_converges_to_target(self):
+        controller = PlayoutController(40, sample_rate=48000, max_correction=0.02)
+        fill = 170 * 48
+        # Producer and consumer run at the same rate, only corrections move the fill
+        for _ in range(2000):
+            controller.observe(fill)
+            correction = controller.correction(512)
+            fill -= correction
+            controller.applied(correction)
+
+        stats = controller.statistics()
+        self.assertLess(abs(stats["current_latency_ms"] - 40), 6)
+        self.assertEqual(stats["target_latency_ms"], 40)
+        self.assertGreater(stats["frames_dropped"], 0)
+
+    def test_reset_follows_sample_rate(self):
+        controller = PlayoutController(40, sample_rate=48000)
+        controller.reset(sample_rate=44100)
+        self.assertEqual(controller.target_frames, 1764)
+
+
+def _feed(add, rate, block, seconds, jitter_ns=0):
+    # Blocks of ``block`` frames at ``rate`` Hz, alternately early and late by jitter_ns
+    period_ns = block * 1e9 / rate
+    for i in range(int(seconds * rate / block)):
+        add(block, int(i * period_ns) + (jitter_ns if i % 2 else -jitter_ns))
+
+
+class TestDriftEstimator(unittest.TestCase):
+    def test_rate(self):
+        estimator = RateEstimator(window_s=10)
+        _feed(estimator.add, 48000, 256, 30, jitter_ns=2_000_000)
+        self.assertAlmostEqual(estimator.rate, 48000, delta=1)
+        self.assertLessEqual(estimator.span_s, 11)
+
+    def test_ratio(self):
+        drift = DriftEstimator(min_span_s=10)
+        _feed(drift.received, 48000 * (1 + 100e-6), 256, 5)
+        _feed(drift.consumed, 48000, 512, 5)
+        # Not enough history yet
+        self.assertEqual(drift.ratio, 1.0)
+
+        drift.reset()
+        _feed(drift.received, 48000 * (1 + 100e-6), 256, 20, jitter_ns=1_000_000)
+        _feed(drift.consumed, 48000, 512, 20)
+        self.assertAlmostEqual(drift.drift_ppm, 100, delta=2)
+
+    def test_clamped(self):
+        drift = DriftEstimator(min_span_s=1, max_drift_ppm=500)
+        _feed(drift.received, 44100, 256, 5)
+        _feed(drift.consumed, 48000, 512, 5)
+        self.assertAlmostEqual(drift.ratio, 1 - 500e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+
+from aiovban import VBANSampleRate
+from aiovban.packet.headers.audio import BitResolution, VBANAudioHeader
+from aiovban_pyaudio import resample
+from aiovban_pyaudio.resample import FormatConverter, FractionalResampler
+
+
+def _process(resampler, data, frames, ratio, block):
+    out = bytearray()
+    total = 0
+    for start in range(0, frames, block):
+        chunk, count = resampler.process(
+            data[start * resampler.bytes_per_frame : (start + block) * resampler.bytes_per_frame],
+            block,
+            ratio,
+        )
+        out += chunk
+        total += count
+    return bytes(out), total
+
+
+@unittest.skipIf(resample.numpy is None, "NumPy is not installed")
+class TestVectorizedResampler(unittest.TestCase):
+    def test_unity_passes_through(self):
+        resampler = FractionalResampler(BitResolution.INT16, 2)
+        data = bytes(range(256)) * 4
+        self.assertEqual(resampler.process(data, 256, 1.0), (data, 256))
+
+    def test_ratio_changes_length(self):
+        numpy = resample.numpy
+        resampler = FractionalResampler(BitResolution.INT16, 1)
+        ramp = numpy.arange(0, 20000, 2, dtype="<i2")
+        out, frames = _process(resampler, ramp.tobytes(), len(ramp), 1.001, 250)
+        self.assertAlmostEqual(frames, len(ramp) / 1.001, delta=2)
+
+        samples = numpy.frombuffer(out, "<i2")
+        self.assertEqual(len(samples), frames)
+        # A ramp stays a ramp across block boundaries, each step ratio * 2
+        steps = numpy.diff(samples.astype(numpy.int64))
+        self.assertTrue(numpy.all((steps >= 1) & (steps <= 3)))
+
+    def test_stretch(self):
+        resampler = FractionalResampler(BitResolution.FLOAT32, 2)
+        data = bytes(8 * 1000)
+        _, frames = _process(resampler, data, 1000, 0.999, 100)
+        self.assertAlmostEqual(frames, 1000 / 0.999, delta=2)
+
+
+def _header(sample_rate, channels, bit_resolution, samples_per_frame=256):
+    return VBANAudioHeader(
+        sample_rate=sample_rate,
+        samples_per_frame=samples_per_frame,
+        channels=channels,
+        bit_resolution=bit_resolution,
+        codec=0,
+    )
+
+
+@unittest.skipIf(resample.numpy is None, "NumPy is not installed")
+class TestFormatConverter(unittest.TestCase):
+    def test_matching_format_passes_through(self):
+        converter = FormatConverter(BitResolution.INT16, 2, 48000)
+        data = bytes(range(256)) * 4
+        header = _header(VBANSampleRate.RATE_48000, 2, BitResolution.INT16)
+        self.assertEqual(converter.process(data, header), (data, 256))
+
+    def test_rate_change(self):
+        numpy = resample.numpy
+        converter = FormatConverter(BitResolution.INT16, 2, 48000)
+        header = _header(VBANSampleRate.RATE_44100, 2, BitResolution.INT16)
+        self.assertTrue(converter.configure(header))
+        self.assertFalse(converter.configure(header))
+
+        ramp = numpy.repeat(numpy.arange(0, 25600, 10, dtype="<i2"), 2)
+        out = bytearray()
+        total = 0
+        for start in range(0, len(ramp), 512):
+            chunk, frames = converter.process(ramp[start : start + 512].tobytes(), header)
+            self.assertEqual(len(chunk), frames * 4)
+            out += chunk
+            total += frames
+        self.assertAlmostEqual(total, 2560 * 48000 / 44100, delta=2)
+
+        samples = numpy.frombuffer(out, "<i2").reshape(-1, 2)
+        steps = numpy.diff(samples[:, 0].astype(numpy.int64))
+        # 10 per input frame, 44100 / 48000 input frames per output frame
+        self.assertTrue(numpy.all(numpy.abs(steps - 9.1875) <= 1))
+        self.assertTrue(numpy.array_equal(samples[:, 0], samples[:, 1]))
+
+    def test_format_and_channels(self):
+        numpy = resample.numpy
+        converter = FormatConverter(BitResolution.INT16, 2, 48000)
+        header = _header(VBANSampleRate.RATE_48000, 1, BitResolution.FLOAT32, 4)
+        data = numpy.array([0.0, 0.5, -0.5, -1.0], "<f4").tobytes()
+        out, frames = converter.process(data, header)
+        self.assertEqual(frames, 4)
+        self.assertEqual(
+            numpy.frombuffer(out, "<i2").tolist(),
+            [0, 0, 16384, 16384, -16384, -16384, -32768, -32768],
+        )
+
+    def test_over_range_float_clips(self):
+        numpy = resample.numpy
+        converter = FormatConverter(BitResolution.INT16, 1, 48000)
+        data = numpy.array([1.0, 1.5, -1.0, -1.5], "<f4").tobytes()
+        header = _header(VBANSampleRate.RATE_48000, 1, BitResolution.FLOAT32, 4)
+        out, _ = converter.process(data, header)
+        self.assertEqual(numpy.frombuffer(out, "<i2").tolist(), [32767, 32767, -32768, -32768])
+
+        # Interpolated between 1.0 and 1.5, all still at or over full scale
+        header = _header(VBANSampleRate.RATE_24000, 1, BitResolution.FLOAT32, 4)
+        out, frames = converter.process(data, header)
+        samples = numpy.frombuffer(out, "<i2")
+        self.assertEqual(len(samples), frames)
+        self.assertEqual(samples[:3].tolist(), [32767, 32767, 32767])
+        self.assertEqual(samples[-1], -32768)
+
+    def test_output_frames(self):
+        converter = FormatConverter(BitResolution.INT16, 2, 48000)
+        converter.configure(_header(VBANSampleRate.RATE_24000, 2, BitResolution.INT16))
+        self.assertEqual(converter.output_frames(256), 512)
+
+
+class TestSlipResampler(unittest.TestCase):
+    def test_packed_24_bit_slips_whole_frames(self):
+        resampler = FractionalResampler(BitResolution.INT24, 2)
+        self.assertFalse(resampler.vectorized)
+        data = bytes(6 * 10000)
+        out, frames = _process(resampler, data, 10000, 1.001, 500)
+        self.assertAlmostEqual(frames, 10000 / 1.001, delta=2)
+        self.assertEqual(len(out), frames * 6)
+
+        out, frames = _process(resampler, data, 10000, 0.999, 500)
+        self.assertAlmostEqual(frames, 10000 / 0.999, delta=2)
+
+
+if __name__ == "__main__":
+    unittest.main()